@@ -0,0 +1,99 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# ======================================================
+# CONFIG
+# ======================================================
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.93"))
+ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", "1800"))          # seconds
+ANSWER_CACHE_PER_USER = int(os.getenv("ANSWER_CACHE_PER_USER", "50"))
+ANSWER_CACHE_MAX_USERS = int(os.getenv("ANSWER_CACHE_MAX_USERS", "1000"))
+
+
+class SemanticAnswerCache:
+    """
+    Per-user cache of chat answers keyed by query embedding.
+
+    A lookup hits when a stored question is at least `threshold`
+    cosine-similar to the new one AND was answered against the same
+    store fingerprint (so new jobs / a new resume invalidate it).
+    Entries expire after `ttl` seconds; both users and entries are LRU.
+    """
+
+    def __init__(self, threshold=ANSWER_CACHE_THRESHOLD, ttl=ANSWER_CACHE_TTL,
+                 max_entries_per_user=ANSWER_CACHE_PER_USER,
+                 max_users=ANSWER_CACHE_MAX_USERS):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries_per_user = max_entries_per_user
+        self.max_users = max_users
+        self._users = OrderedDict()    # user_id -> OrderedDict[key -> entry]
+        self._lock = threading.Lock()
+        self._next_key = 0
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def _unit(q_emb):
+        q = np.asarray(q_emb, dtype=np.float32)
+        n = np.linalg.norm(q)
+        return q / n if n else q
+
+    def get(self, user_id, q_emb, fingerprint):
+        q = self._unit(q_emb)
+        now = time.monotonic()
+
+        with self._lock:
+            entries = self._users.get(user_id)
+            if not entries:
+                self.stats["misses"] += 1
+                return None
+            self._users.move_to_end(user_id)
+
+            best_key, best_sim = None, self.threshold
+            for key, e in list(entries.items()):
+                if e["fingerprint"] != fingerprint or now - e["created"] > self.ttl:
+                    del entries[key]
+                    continue
+                sim = float(e["emb"] @ q)
+                if sim >= best_sim:
+                    best_key, best_sim = key, sim
+
+            if best_key is None:
+                self.stats["misses"] += 1
+                return None
+
+            entries.move_to_end(best_key)
+            self.stats["hits"] += 1
+            return entries[best_key]["answer"]
+
+    def put(self, user_id, q_emb, fingerprint, answer):
+        with self._lock:
+            entries = self._users.get(user_id)
+            if entries is None:
+                entries = self._users[user_id] = OrderedDict()
+                while len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+            self._users.move_to_end(user_id)
+
+            self._next_key += 1
+            entries[self._next_key] = {
+                "emb": self._unit(q_emb),
+                "fingerprint": fingerprint,
+                "answer": answer,
+                "created": time.monotonic(),
+            }
+            while len(entries) > self.max_entries_per_user:
+                entries.popitem(last=False)
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._users.clear()
+            else:
+                self._users.pop(user_id, None)
+
+
+answer_cache = SemanticAnswerCache()
@@ -1,6 +1,10 @@
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import time
 import os
 
 PWDCTX = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -8,6 +12,11 @@ SECRET_KEY = os.getenv("JWT_SECRET", "dev_secret")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
 
+# bcrypt runs on its own small pool so a login burst can't take over the
+# request threadpool; beyond workers + queue we shed load instead of waiting.
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", "2"))
+AUTH_HASH_MAX_QUEUE = int(os.getenv("AUTH_HASH_MAX_QUEUE", "32"))
+
 def hash_password(password: str):
     safe_pass = password[:72]
     return PWDCTX.hash(safe_pass)
@@ -16,6 +25,99 @@ def verify_password(plain: str, hashed: str):
     safe_pass = plain[:72]
     return PWDCTX.verify(safe_pass, hashed)
 
+
+# ---------------- bounded hashing pool ----------------
+class AuthOverloaded(Exception):
+    """Too many password hashes already queued; caller should answer 429."""
+
+
+_hash_executor = None
+_hash_lock = threading.Lock()
+_hash_stats = {
+    "in_flight": 0, "queued": 0,
+    "completed": 0, "rejected": 0,
+    "wait_ms_total": 0.0, "run_ms_total": 0.0,
+}
+
+
+def _get_hash_executor():
+    global _hash_executor
+    if _hash_executor is None:
+        with _hash_lock:
+            if _hash_executor is None:
+                _hash_executor = ThreadPoolExecutor(
+                    max_workers=AUTH_HASH_WORKERS,
+                    thread_name_prefix="bcrypt"
+                )
+    return _hash_executor
+
+
+def _release_queue_slot(ticket):
+    """Gives back a job's queue slot exactly once (caller holds _hash_lock)."""
+    if not ticket["released"]:
+        ticket["released"] = True
+        _hash_stats["queued"] -= 1
+
+
+def _timed_job(fn, args, submitted_at, ticket):
+    started = time.perf_counter()
+    with _hash_lock:
+        _release_queue_slot(ticket)
+        _hash_stats["in_flight"] += 1
+        _hash_stats["wait_ms_total"] += (started - submitted_at) * 1000
+    try:
+        return fn(*args)
+    finally:
+        with _hash_lock:
+            _hash_stats["in_flight"] -= 1
+            _hash_stats["completed"] += 1
+            _hash_stats["run_ms_total"] += (time.perf_counter() - started) * 1000
+
+
+async def _run_on_hash_pool(fn, *args):
+    with _hash_lock:
+        if _hash_stats["in_flight"] + _hash_stats["queued"] >= AUTH_HASH_WORKERS + AUTH_HASH_MAX_QUEUE:
+            _hash_stats["rejected"] += 1
+            raise AuthOverloaded()
+        _hash_stats["queued"] += 1
+
+    ticket = {"released": False}
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_hash_executor(), _timed_job, fn, args, time.perf_counter(), ticket
+        )
+    finally:
+        # cancelled (client gone, timeout, shutdown) or failed to submit before
+        # a pool thread took the job: _timed_job never runs, free the slot here
+        with _hash_lock:
+            _release_queue_slot(ticket)
+
+
+async def hash_password_async(password: str):
+    return await _run_on_hash_pool(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str):
+    return await _run_on_hash_pool(verify_password, plain, hashed)
+
+
+def hash_pool_stats():
+    with _hash_lock:
+        stats = dict(_hash_stats)
+    done = stats["completed"] or 1
+    return {
+        "workers": AUTH_HASH_WORKERS,
+        "max_queue": AUTH_HASH_MAX_QUEUE,
+        "in_flight": stats["in_flight"],
+        "queued": stats["queued"],
+        "completed": stats["completed"],
+        "rejected": stats["rejected"],
+        "avg_wait_ms": stats["wait_ms_total"] / done,
+        "avg_run_ms": stats["run_ms_total"] / done,
+    }
+
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_EXPIRE_MINUTES))
@@ -1,13 +1,203 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne, ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+from motor.motor_asyncio import AsyncIOMotorClient
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import hashlib
 import os
+import re
 from dotenv import load_dotenv
 load_dotenv()
 
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 MONGO_DB = os.getenv("MONGO_DB", "aiproj_db")
 
-client = MongoClient(MONGO_URI)
+# Pool sizing: the async client serves every API request, the sync one
+# only background tasks / threadpool work and the Celery worker.
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+MONGO_SYNC_MAX_POOL_SIZE = int(os.getenv("MONGO_SYNC_MAX_POOL_SIZE", "20"))
+
+# Opt-in: scraped jobs not seen again for this many days are removed by a
+# TTL index (0 = keep them). Expiry only touches Mongo: the vector store and
+# match results keep those jobs until the user's next scrape rewrites them,
+# so only enable it where users re-scrape (e.g. on a schedule).
+JOB_EXPIRE_DAYS = int(os.getenv("JOB_EXPIRE_DAYS", "0"))
+
+_client_opts = dict(
+    serverSelectionTimeoutMS=5000,
+    maxIdleTimeMS=300000,
+)
+
+# ---------------- sync (Celery worker, background tasks) ----------------
+client = MongoClient(MONGO_URI, maxPoolSize=MONGO_SYNC_MAX_POOL_SIZE, **_client_opts)
 db = client[MONGO_DB]
 
 users_col = db["users"]
 jobs_col = db["jobs"]
+
+# ---------------- async (FastAPI routes) ----------------
+async_client = AsyncIOMotorClient(
+    MONGO_URI,
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    **_client_opts
+)
+async_db = async_client[MONGO_DB]
+
+ausers_col = async_db["users"]
+ajobs_col = async_db["jobs"]
+
+
+# ---------------- projections ----------------
+USER_PUBLIC_FIELDS = {"email": 1, "name": 1, "created_at": 1, "resume_url": 1, "resume_status": 1}
+USER_LOGIN_FIELDS = {"email": 1, "password": 1, "resume_url": 1, "resume_hash": 1}
+# what store_jobs needs to rebuild job embeddings
+JOB_EMBED_FIELDS = {"title": 1, "company": 1, "location": 1, "salary": 1, "description": 1, "link": 1}
+
+
+# ---------------- indexes ----------------
+async def ensure_indexes():
+    """
+    Create the indexes the API queries rely on, then migrate old job rows.
+    Called once at startup; create_index is a no-op when the index already
+    exists.
+    """
+    specs = [
+        (ausers_col, [("email", ASCENDING)], {"unique": True, "name": "email_unique"}),
+        (ajobs_col, [("owner", ASCENDING), ("_id", DESCENDING)], {"name": "owner_newest"}),
+        # upsert key; partial so legacy rows without link_key don't collide
+        (ajobs_col, [("owner", ASCENDING), ("link_key", ASCENDING)],
+         {"name": "owner_link_key", "unique": True,
+          "partialFilterExpression": {"link_key": {"$exists": True}}}),
+        # /api/jobs title / company search: word-prefix match on the *_terms fields
+        (ajobs_col, [("owner", ASCENDING), ("title_terms", ASCENDING)], {"name": "owner_title_terms"}),
+        (ajobs_col, [("owner", ASCENDING), ("company_terms", ASCENDING)], {"name": "owner_company_terms"}),
+    ]
+    if JOB_EXPIRE_DAYS > 0:
+        specs.append((ajobs_col, [("last_seen", ASCENDING)],
+                      {"name": "last_seen_ttl", "expireAfterSeconds": JOB_EXPIRE_DAYS * 86400}))
+    else:
+        await _drop_index(ajobs_col, "last_seen_ttl")
+
+    for col, keys, opts in specs:
+        try:
+            await col.create_index(keys, **opts)
+        except PyMongoError as e:
+            # e.g. duplicate emails already stored; keep serving without it
+            print(f"Index {opts['name']} on {col.name} not created:", e)
+
+    try:
+        await _migrate_jobs()
+    except PyMongoError as e:
+        print("Job migration failed:", e)
+
+
+async def _drop_index(col, name):
+    try:
+        if name in await col.index_information():
+            await col.drop_index(name)
+    except PyMongoError as e:
+        print(f"Index {name} on {col.name} not dropped:", e)
+
+
+async def _migrate_jobs():
+    """
+    One-off upgrades of stored jobs, run at startup (each is a no-op once done):
+    drop rows from the old delete_many/insert_many path (no link_key, so
+    upserts can't match them) and add the search terms fields.
+    """
+    await ajobs_col.delete_many({"link_key": {"$exists": False}})
+
+    ops = []
+    async for job in ajobs_col.find({"title_terms": {"$exists": False}}, {"title": 1, "company": 1}):
+        ops.append(UpdateOne({"_id": job["_id"]}, {"$set": {
+            "title_terms": search_terms(job.get("title")),
+            "company_terms": search_terms(job.get("company")),
+        }}))
+        if len(ops) == 1000:
+            await ajobs_col.bulk_write(ops, ordered=False)
+            ops = []
+    if ops:
+        await ajobs_col.bulk_write(ops, ordered=False)
+
+
+# ---------------- job search terms ----------------
+# words of a title / company; "+" and "#" are kept for C++ / C#
+_TERM_RE = re.compile(r"[\w+#]+")
+
+
+def search_terms(text) -> list:
+    """Distinct lowercase words of text, stored per job for the *_terms indexes."""
+    if not text or text == "N/A":
+        return []
+    return sorted(set(_TERM_RE.findall(str(text).lower())))
+
+
+# ---------------- scraped job upserts ----------------
+# query params that only track the click / search session
+TRACKING_PARAMS = {
+    "src", "sid", "xp", "px", "from", "tk", "vjs", "bb", "xkcb", "fccid",
+    "advn", "adid", "searchid", "from_search", "jrtk", "ref", "refid",
+}
+
+
+def canonical_link(link: str):
+    """Stable form of a job URL: lowercase host, no fragment, no tracking params."""
+    if not link or link == "N/A":
+        return None
+    parts = urlsplit(link.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def job_link_key(job: dict) -> str:
+    """Upsert key for a scraped job; falls back to title/company/location without a link."""
+    link = canonical_link(job.get("link"))
+    if link:
+        return link
+    raw = "|".join(str(job.get(f, "")).strip().lower() for f in ("title", "company", "location"))
+    return "nolink:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def upsert_jobs(scraped: list, owner: str):
+    """
+    Idempotent replacement for delete_many + insert_many: one unordered
+    bulk_write of upserts keyed on (owner, link_key). Existing postings keep
+    their _id (so /api/jobs ordering is stable), every posting seen in this
+    scrape gets last_seen bumped (unseen ones age out if JOB_EXPIRE_DAYS is set).
+    """
+    if not scraped:
+        return {"upserted": 0, "modified": 0, "matched": 0}
+
+    now = datetime.utcnow()
+    by_key = {}
+    for job in scraped:
+        fields = {k: v for k, v in job.items() if k != "_id"}
+        fields["owner"] = owner
+        fields["link_key"] = job_link_key(job)
+        fields["title_terms"] = search_terms(job.get("title"))
+        fields["company_terms"] = search_terms(job.get("company"))
+        fields["last_seen"] = now
+        # same posting twice in one scrape -> one op (parallel upserts on one key can collide)
+        by_key[fields["link_key"]] = fields
+
+    ops = [
+        UpdateOne(
+            {"owner": owner, "link_key": key},
+            {"$set": fields, "$setOnInsert": {"first_seen": now}},
+            upsert=True
+        )
+        for key, fields in by_key.items()
+    ]
+
+    res = jobs_col.bulk_write(ops, ordered=False)
+    return {
+        "upserted": res.upserted_count,
+        "modified": res.modified_count,
+        "matched": res.matched_count,
+    }
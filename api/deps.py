@@ -1,11 +1,53 @@
+import time
+import threading
+from collections import OrderedDict
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException
 from api.auth import decode_token
+from api.user_cache import get_user_profile
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+# token -> payload; a dashboard load sends the same token on every call,
+# so skip re-verifying the signature until the token expires.
+TOKEN_CACHE_MAX = 4096
+_token_cache = OrderedDict()
+_token_lock = threading.Lock()
+
+
+def _decode_cached(token: str):
+    now = time.time()
+    with _token_lock:
+        payload = _token_cache.get(token)
+        if payload is not None:
+            if payload.get("exp", 0) > now:
+                _token_cache.move_to_end(token)
+                return payload
+            del _token_cache[token]
+
     payload = decode_token(token)
+    if payload:
+        with _token_lock:
+            _token_cache[token] = payload
+            while len(_token_cache) > TOKEN_CACHE_MAX:
+                _token_cache.popitem(last=False)
+    return payload
+
+
+def get_current_user(token: str = Depends(oauth2_scheme)):
+    payload = _decode_cached(token)
     if not payload:
         raise HTTPException(401, "Invalid or expired token")
     return payload
+
+
+async def get_current_user_profile(current_user: dict = Depends(get_current_user)):
+    """
+    The logged-in user's document (no password), from the per-process
+    profile cache. FastAPI resolves it once per request, however many
+    dependants ask for it.
+    """
+    profile = await get_user_profile(current_user["sub"])
+    if profile is None:
+        raise HTTPException(401, "User not found")
+    return profile
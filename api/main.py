@@ -4,10 +4,53 @@ from api.routes_auth import router as auth_router
 from api.routes_jobs import router as jobs_router
 from api.routes_chat import router as chat_router
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
+from contextlib import asynccontextmanager
+import asyncio
+import sys
 import os
 
-app = FastAPI(title="AIPROJ API")
+from embedding_config import warmup_enabled
+
+# start-up work runs in the background; /ready reports when it is done
+_startup = {
+    "indexes": "pending",
+    "embedding_warmup": "pending" if warmup_enabled() else "disabled",
+}
+_startup_tasks = []
+
+
+async def _create_indexes():
+    from api.db import ensure_indexes
+    try:
+        await ensure_indexes()
+        _startup["indexes"] = "done"
+    except Exception as e:
+        print("Index creation failed:", e)
+        _startup["indexes"] = "failed"
+
+
+async def _warm_embeddings():
+    try:
+        from vector import warm_up
+        await asyncio.to_thread(warm_up)
+        _startup["embedding_warmup"] = "done"
+    except Exception as e:
+        print("Embedding warm-up failed:", e)
+        _startup["embedding_warmup"] = "failed"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _startup_tasks.append(asyncio.create_task(_create_indexes()))
+
+    # Optional: load + run the embedding model before chat traffic arrives
+    if _startup["embedding_warmup"] == "pending":
+        _startup_tasks.append(asyncio.create_task(_warm_embeddings()))
+    yield
+
+
+app = FastAPI(title="AIPROJ API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -27,4 +70,42 @@ app.mount("/static", StaticFiles(directory="api/static"), name="static")
 # Serve index.html on root
 @app.get("/")
 def serve_home():
-    return FileResponse(os.path.join("api", "static", "index.html"))
\ No newline at end of file
+    return FileResponse(os.path.join("api", "static", "index.html"))
+
+
+# Readiness -----------------------------------------------------------
+@app.get("/ready")
+async def ready():
+    """
+    503 until Mongo answers and any enabled warm-up has finished.
+    Also reports which lazily-loaded subsystems are already warm.
+    """
+    from api.db import async_client
+    from api.auth import hash_pool_stats
+
+    try:
+        await asyncio.wait_for(async_client.admin.command("ping"), timeout=2)
+        mongo = "ok"
+    except Exception:
+        mongo = "unreachable"
+
+    vector_mod = sys.modules.get("vector")
+    chat_mod = sys.modules.get("chat")
+    sources_mod = sys.modules.get("scrape_sources")
+    sites_mod = sys.modules.get("scrape_sites")
+
+    report = {
+        "mongo": mongo,
+        **_startup,
+        "embedding_model_loaded": bool(vector_mod and vector_mod.is_model_loaded()),
+        "query_embedding_cache": vector_mod.query_cache_stats() if vector_mod else None,
+        "llm_client_ready": bool(chat_mod and chat_mod._async_client is not None),
+        "scrapers_loaded": "scrape_naukri" in sys.modules,
+        "scrape_sources": sources_mod.source_stats() if sources_mod else None,
+        "scrape_detail_cache": sites_mod.detail_cache.stats() if sites_mod else None,
+        "scheduler_loaded": "worker" in sys.modules,
+        "auth_hash_pool": hash_pool_stats(),
+    }
+
+    is_ready = mongo == "ok" and _startup["embedding_warmup"] in ("disabled", "done")
+    return JSONResponse(report, status_code=200 if is_ready else 503)
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from api.db import users_col, jobs_col
-from api.auth import hash_password, verify_password, create_access_token, decode_token
+from api.db import jobs_col, ausers_col, USER_LOGIN_FIELDS, JOB_EMBED_FIELDS
+from api.auth import (
+    hash_password_async, verify_password_async, create_access_token, AuthOverloaded
+)
 from fastapi.security import OAuth2PasswordRequestForm
 from bson import ObjectId
-from vector import store_jobs, store_resume
+from pymongo.errors import DuplicateKeyError
 
 
 
@@ -19,17 +22,32 @@ class LoginIn(BaseModel):
     email: str
     password: str
 
+async def _hash_or_429(fn, *args):
+    try:
+        return await fn(*args)
+    except AuthOverloaded:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many login attempts in progress, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+
+
 @router.post("/register")
-def register(payload: RegisterIn):
-    if users_col.find_one({"email": payload.email}):
+async def register(payload: RegisterIn):
+    if await ausers_col.find_one({"email": payload.email}, {"_id": 1}):
         raise HTTPException(400, "User already exists")
     user = {
         "email": payload.email,
         "name": payload.name or "",
-        "password": hash_password(payload.password),
+        "password": await _hash_or_429(hash_password_async, payload.password),
         "created_at": __import__("datetime").datetime.utcnow()
     }
-    res = users_col.insert_one(user)
+    try:
+        res = await ausers_col.insert_one(user)
+    except DuplicateKeyError:
+        # lost a race with a concurrent register (unique index on email)
+        raise HTTPException(400, "User already exists")
     user_id = str(res.inserted_id)
     token = create_access_token({"sub": user_id, "email": payload.email})
     return {"access_token": token, "token_type": "bearer", "user_id": user_id}
@@ -37,11 +55,26 @@ def register(payload: RegisterIn):
 
 
 
+def _rehydrate_vectors(user: dict, user_id: str):
+    from vector import store_jobs, store_resume
+
+    # Load user's jobs
+    user_jobs = list(jobs_col.find({"owner": user_id}, JOB_EMBED_FIELDS))
+    if user_jobs:
+        store_jobs(user_jobs, user_id)
+
+    # Load user's resume
+    # cached by content hash: no download / re-embedding if unchanged
+    resume_url = user.get("resume_url")
+    if resume_url:
+        store_resume(resume_url, user_id, content_hash=user.get("resume_hash"))
+
+
 @router.post("/login")
-def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = users_col.find_one({"email": form_data.username})
+async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+    user = await ausers_col.find_one({"email": form_data.username}, USER_LOGIN_FIELDS)
 
-    if not user or not verify_password(form_data.password, user["password"]):
+    if not user or not await _hash_or_429(verify_password_async, form_data.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     user_id = str(user["_id"])
@@ -54,15 +87,7 @@ def login(form_data: OAuth2PasswordRequestForm = Depends()):
 
     # ---------------- VECTOR REHYDRATION ----------------
     try:
-        # Load user's jobs
-        user_jobs = list(jobs_col.find({"owner": user_id}))
-        if user_jobs:
-            store_jobs(user_jobs, user_id)
-
-        # Load user's resume
-        resume_url = user.get("resume_url")
-        if resume_url:
-            store_resume(resume_url, user_id)
+        await run_in_threadpool(_rehydrate_vectors, user, user_id)
 
     except Exception as e:
         
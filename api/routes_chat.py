@@ -1,7 +1,8 @@
+import json
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from api.deps import get_current_user
-from chat import rag_answer
 
 router = APIRouter(prefix="/api", tags=["chat"])
 
@@ -13,7 +14,7 @@ class QueryRequest(BaseModel):
 
 # ------------------ Chat Endpoint --------------------
 @router.post("/query")
-def query_bot(
+async def query_bot(
     req: QueryRequest,
     current_user: dict = Depends(get_current_user)
 ):
@@ -27,7 +28,43 @@ def query_bot(
     if not question:
         raise HTTPException(status_code=400, detail="Query cannot be empty")
 
-    
-    answer = rag_answer(question, current_user["sub"])
+
+    from chat import rag_answer_async   # heavy (Groq SDK, vector store): load on first chat
+    answer = await rag_answer_async(question, current_user["sub"])
 
     return {"answer": answer}
+
+
+# --------------- Streaming Chat Endpoint -----------------
+async def _sse_events(question: str, user_id: str):
+    from chat import rag_answer_stream_async
+
+    try:
+        async for delta in rag_answer_stream_async(question, user_id):
+            yield f"data: {json.dumps({'delta': delta})}\n\n"
+    except Exception as e:
+        print("Streaming chat failed:", e)
+        yield f"event: error\ndata: {json.dumps({'detail': 'Chat failed'})}\n\n"
+    yield "event: done\ndata: {}\n\n"
+
+
+@router.post("/query/stream")
+async def query_bot_stream(
+    req: QueryRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Server-Sent Events version of /api/query.
+    Accepts: { "query": "..." }
+    Emits:   data: {"delta": "..."} per token batch, then `event: done`
+    """
+    question = req.query.strip()
+
+    if not question:
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+
+    return StreamingResponse(
+        _sse_events(question, current_user["sub"]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
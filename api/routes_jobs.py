@@ -1,19 +1,20 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form, BackgroundTasks
+from starlette.concurrency import run_in_threadpool
 from pathlib import Path
 import shutil
 
-from api.db import users_col, jobs_col
-from api.deps import get_current_user
+from api.db import users_col, ausers_col, ajobs_col, USER_PUBLIC_FIELDS, search_terms
+from api.deps import get_current_user, get_current_user_profile
+from api.user_cache import invalidate_user
 
-
-from vector import store_jobs
-from imagekitio.models.UploadFileRequestOptions import UploadFileRequestOptions
-from api.imagekit_client import imagekit
+# vector (numpy/embeddings), the ImageKit SDK, redbeat and the Celery app are
+# imported inside the handlers that need them to keep API start-up fast.
 import os
+import re
+import time
 import bson
+from collections import OrderedDict
 
-from redbeat import RedBeatSchedulerEntry
-from worker import app as celery_app
 from datetime import timedelta
 
 router = APIRouter(prefix="/api", tags=["jobs"])
@@ -24,20 +25,51 @@ RESUME_DIR.mkdir(exist_ok=True)
 
 
 # # ---------------- UPLOAD RESUME ------------------
+# ImageKit object for options
+class UploadOptions:
+    def __init__(self, folder, use_unique_file_name, is_private_file):
+        self.folder = folder
+        self.use_unique_file_name = use_unique_file_name
+        self.is_private_file = is_private_file
+
+
+def process_resume_upload(pdf_bytes: bytes, user_id: str, old_file_id: str = None):
+    """
+    Background part of the upload: extract + embed the resume from
+    the bytes we already have, then drop the previous ImageKit file.
+    Progress is reported through users.resume_status.
+    """
+    from vector import store_resume
+    from api.imagekit_client import imagekit
+
+    try:
+        content_hash = store_resume(pdf_bytes, user_id)
+        status = {"resume_status": "ready" if content_hash else "failed"}
+    except Exception as e:
+        print("Resume processing failed:", e)
+        status = {"resume_status": "failed"}
+
+    users_col.update_one({"_id": bson.ObjectId(user_id)}, {"$set": status})
+    invalidate_user(user_id)
+
+    # Delete previous resume if exists
+    if old_file_id:
+        try:
+            imagekit.delete_file(file_id=old_file_id)
+        except Exception as e:
+            print("Error deleting old resume:", e)
+
+
 @router.post("/upload_resume")
 async def upload_resume(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user)
 ):
-    import bson, base64
+    import base64
+    from pymongo import ReturnDocument
     from api.imagekit_client import imagekit
-
-    # ImageKit object for options
-    class UploadOptions:
-        def __init__(self, folder, use_unique_file_name, is_private_file):
-            self.folder = folder
-            self.use_unique_file_name = use_unique_file_name
-            self.is_private_file = is_private_file
+    from vector import resume_content_hash
 
     user_id = current_user["sub"]
 
@@ -52,17 +84,6 @@ async def upload_resume(
     # Convert PDF to base64
     pdf_base64 = base64.b64encode(pdf_bytes).decode()
 
-    # Fetch existing user
-    user = users_col.find_one({"_id": bson.ObjectId(user_id)})
-    old_file_id = user.get("resume_file_id")
-
-    # Delete previous resume if exists
-    if old_file_id:
-        try:
-            imagekit.delete_file(file_id=old_file_id)
-        except Exception as e:
-            print("Error deleting old resume:", e)
-
     # Upload options
     options = UploadOptions(
         folder="/resumes/",
@@ -70,11 +91,12 @@ async def upload_resume(
         is_private_file=False
     )
 
-    # Upload to ImageKit (base64)
+    # Upload to ImageKit (base64) - the SDK is blocking, keep it off the event loop
     try:
         print("Uploading PDF using base64...")
 
-        upload_response = imagekit.upload_file(
+        upload_response = await run_in_threadpool(
+            imagekit.upload_file,
             file=pdf_base64,
             file_name=f"{user_id}_resume.pdf",
             options=options
@@ -93,27 +115,37 @@ async def upload_resume(
     print (resume_url)
     resume_file_id = upload_response.file_id
 
-    # Save PDF metadata to Mongodb
-    users_col.update_one(
+    # Save PDF metadata to Mongodb; the previous file id comes from the same
+    # write (not the profile cache) since it decides which file gets deleted
+    previous = await ausers_col.find_one_and_update(
         {"_id": bson.ObjectId(user_id)},
         {
             "$set": {
                 "resume_url": resume_url,
-                "resume_file_id": resume_file_id
+                "resume_file_id": resume_file_id,
+                "resume_hash": resume_content_hash(pdf_bytes),
+                "resume_status": "processing"
             }
-        }
+        },
+        projection={"resume_file_id": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    invalidate_user(user_id)
+    old_file_id = previous.get("resume_file_id") if previous else None
+
+    # Extract + embed from the in-memory bytes after the response is sent
+    background_tasks.add_task(
+        process_resume_upload,
+        pdf_bytes,
+        user_id,
+        old_file_id if old_file_id != resume_file_id else None
     )
-
-
-
-    # Store embeddings to vector db
-    from vector import store_resume
-    store_resume(resume_url, current_user["sub"])
 
     return {
         "status": "ok",
         "resume_url": resume_url,
-        "message": "Resume uploaded successfully"
+        "resume_status": "processing",
+        "message": "Resume uploaded successfully, processing in background"
     }
 
 
@@ -124,28 +156,37 @@ def trigger_scrape(
     job_title: str = Form(...),
     location: str = Form(""),
     pages: int = Form(1),
+    sources: str = Form(""),  # comma separated, e.g. "naukri,indeed"; default SCRAPE_SOURCES
     current_user: dict = Depends(get_current_user)
 ):
-    from scrape import scrape_indeed
-    from scrape_naukri import scrape_naukri
+    from scrape_sources import SCRAPE_SOURCES, available_sources, iter_sources, parse_source_names
+    from ingest import ingest_jobs
 
-    scraped_naukri = scrape_naukri(job_title.replace(" ", "+"), location, max_pages=int(pages))
-    scraped_indeed = scrape_indeed(job_title.replace(" ", "+"), location, max_pages=int(pages))
-
-    scraped = scraped_naukri + scraped_indeed
-    
-    for s in scraped:
-        s["owner"] = current_user["sub"]
+    user_id = current_user["sub"]
+    query = job_title.replace(" ", "+")
+
+    names = parse_source_names(sources or SCRAPE_SOURCES)
+    unknown = [n for n in names if n not in available_sources()]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown job source(s): {', '.join(unknown) or '-'}; available: {', '.join(available_sources())}"
+        )
 
-    if scraped:
-        jobs_col.delete_many({"owner": current_user["sub"]})
-        jobs_col.insert_many(scraped)
-        store_jobs(scraped, current_user["sub"])
+    # sources scrape in parallel; jobs are upserted + embedded in micro-batches
+    # while scraping, so /api/jobs already lists them before this request returns
+    scraped, counts = ingest_jobs(
+        iter_sources(names, query, location, max_pages=int(pages)),
+        user_id,
+        on_batch=lambda batch: invalidate_job_counts(user_id)
+    )
 
     return {
         "count": len(scraped),
-        "naukri": len(scraped_naukri),
-        "indeed": len(scraped_indeed)
+        "naukri": counts.get("naukri", 0),
+        "indeed": counts.get("indeed", 0),
+        "sources": {name: counts.get(name, 0) for name in names},
+        "duplicates": counts.get("duplicates", 0)
         }
 
 
@@ -157,6 +198,9 @@ def manage_schedule(
     location: str = Form(""),
     current_user: dict = Depends(get_current_user)
 ):
+    from redbeat import RedBeatSchedulerEntry
+    from worker import app as celery_app
+
     user_id = current_user["sub"]
     entry_name = f"scrape-task-{user_id}"
 
@@ -188,39 +232,99 @@ def manage_schedule(
 #--------------------LOAD JOBS (VIEW SCRAPED JOBS)-----------------------
 from fastapi import Query
 
+# fields the dashboard renders
+JOB_LIST_FIELDS = {
+    "title": 1, "company": 1, "location": 1, "salary": 1,
+    "description": 1, "link": 1, "source": 1, "extra": 1,
+}
+
+JOB_COUNT_TTL = 60  # seconds; totals are approximate by design
+JOB_COUNT_CACHE_SIZE = int(os.getenv("JOB_COUNT_CACHE_SIZE", "2048"))
+# (owner, company, title) -> (expires_at, total), LRU ordered
+_job_count_cache = OrderedDict()
+
+
+def invalidate_job_counts(owner: str):
+    for key in [k for k in _job_count_cache if k[0] == owner]:
+        _job_count_cache.pop(key, None)
+
+
+async def _cached_job_count(query: dict, cache_key: tuple):
+    now = time.monotonic()
+    hit = _job_count_cache.get(cache_key)
+    if hit and hit[0] > now:
+        _job_count_cache.move_to_end(cache_key)
+        return hit[1]
+    total = await ajobs_col.count_documents(query)
+    _job_count_cache[cache_key] = (now + JOB_COUNT_TTL, total)
+    _job_count_cache.move_to_end(cache_key)
+    while len(_job_count_cache) > JOB_COUNT_CACHE_SIZE:
+        _job_count_cache.popitem(last=False)
+    return total
+
+
+def _jobs_filter(user_id: str, company, title):
+    """
+    Word-prefix match per field: every word of the search must start a word
+    of the job's title / company, so "dev" finds "Senior Developer" and
+    "DevOps". Anchored lowercase prefixes on the stored *_terms arrays are
+    index range scans (owner_title_terms / owner_company_terms), not a scan
+    of all the user's jobs.
+    """
+    query = {"owner": user_id}
+
+    for field, text in (("company_terms", company), ("title_terms", title)):
+        terms = search_terms(text)
+        if terms:
+            query[field] = {"$all": [re.compile("^" + re.escape(t)) for t in terms]}
+
+    return query
+
+
+async def _fetch_jobs_page(query: dict, after_id, limit: int):
+    if after_id is not None:
+        query = {**query, "_id": {"$lt": after_id}}
+
+    cursor = (
+        ajobs_col
+        .find(query, JOB_LIST_FIELDS)
+        .sort("_id", -1)  # newest first (owner_newest index)
+        .limit(limit + 1)
+    )
+    jobs = await cursor.to_list(length=limit + 1)
+    return jobs[:limit], len(jobs) > limit
+
+
 @router.get("/jobs")
-def get_jobs(
+async def get_jobs(
     current_user: dict = Depends(get_current_user),
 
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=50),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
 
     company: str | None = Query(None),
     title: str | None = Query(None),
 ):
+    """
+    Keyset-paginated job list: pass back `next_cursor` to get the next page.
+    `page` is only echoed for display. `total` is cached for a minute.
+    """
     user_id = current_user["sub"]
 
-    # ---- build filter ----
-    query = {"owner": user_id}
-
-    if company:
-        query["company"] = {"$regex": company, "$options": "i"}
-
-    if title:
-        query["title"] = {"$regex": title, "$options": "i"}
-
-    skip = (page - 1) * limit
+    # ---- decode cursor: last _id of the previous page ----
+    after_id = None
+    if cursor:
+        try:
+            after_id = bson.ObjectId(cursor)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    cursor = (
-        jobs_col
-        .find(query)
-        .skip(skip)
-        .limit(limit)
-        .sort("_id", -1)  # newest first
-    )
+    # ---- build filter + fetch ----
+    query = _jobs_filter(user_id, company, title)
+    jobs, has_more = await _fetch_jobs_page(query, after_id, limit)
 
-    jobs = list(cursor)
-    total = jobs_col.count_documents(query)
+    total = await _cached_job_count(query, (user_id, company, title))
 
     for j in jobs:
         j["_id"] = str(j["_id"])
@@ -230,21 +334,24 @@ def get_jobs(
         "page": page,
         "limit": limit,
         "total": total,
-        "total_pages": (total + limit - 1) // limit
+        "total_pages": max((total + limit - 1) // limit, page + 1 if has_more else page),
+        "next_cursor": jobs[-1]["_id"] if has_more else None,
     }
 
 
 
 # Profile section --------------------------------------------------
 @router.get("/me")
-def get_me(current_user: dict = Depends(get_current_user)):
-    user = users_col.find_one(
-        {"_id": bson.ObjectId(current_user["sub"])},
-        {"password": 0}  # exclude password
-    )
-
-    if not user:
-        return {}
-
-    user["_id"] = str(user["_id"])
-    return user
\ No newline at end of file
+async def get_me(user: dict = Depends(get_current_user_profile)):
+    # cached profile; only expose the public fields (never the password hash)
+    me = {k: v for k, v in user.items() if k in USER_PUBLIC_FIELDS}
+
+    # the dashboard polls resume progress, which a background task on any
+    # worker may have just changed: read those fields from Mongo, not the cache
+    fresh = await ausers_col.find_one({"_id": user["_id"]}, {"_id": 0, "resume_url": 1, "resume_status": 1})
+    me.pop("resume_url", None)
+    me.pop("resume_status", None)
+    me.update(fresh or {})
+
+    me["_id"] = str(user["_id"])
+    return me
\ No newline at end of file
@@ -0,0 +1,60 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+import bson
+from bson.errors import InvalidId
+
+from api.db import ausers_col, USER_PUBLIC_FIELDS
+
+# ======================================================
+# PER-PROCESS USER PROFILE CACHE
+# ======================================================
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "60"))        # seconds
+USER_CACHE_MAX = int(os.getenv("USER_CACHE_MAX", "10000"))
+
+# display data only: anything that decides a write (e.g. which ImageKit file
+# to delete) is read from Mongo, since entries can be USER_CACHE_TTL old
+USER_PROFILE_FIELDS = USER_PUBLIC_FIELDS
+
+_profiles = OrderedDict()   # user_id -> (expires_at, profile)
+_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0}
+
+
+async def get_user_profile(user_id: str):
+    """
+    Cached users.find_one for the logged-in user. Entries live for
+    USER_CACHE_TTL seconds and are dropped by invalidate_user() whenever
+    this process changes the document (resume upload / status update).
+    Returns None for unknown users. Callers must not mutate the result.
+    """
+    now = time.monotonic()
+    with _lock:
+        hit = _profiles.get(user_id)
+        if hit and hit[0] > now:
+            _profiles.move_to_end(user_id)
+            stats["hits"] += 1
+            return hit[1]
+        stats["misses"] += 1
+
+    try:
+        oid = bson.ObjectId(user_id)
+    except InvalidId:
+        return None
+
+    profile = await ausers_col.find_one({"_id": oid}, USER_PROFILE_FIELDS)
+
+    if profile is not None:
+        with _lock:
+            _profiles[user_id] = (now + USER_CACHE_TTL, profile)
+            _profiles.move_to_end(user_id)
+            while len(_profiles) > USER_CACHE_MAX:
+                _profiles.popitem(last=False)
+    return profile
+
+
+def invalidate_user(user_id: str):
+    with _lock:
+        _profiles.pop(user_id, None)
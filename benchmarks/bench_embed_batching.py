@@ -0,0 +1,136 @@
+"""
+embed_texts throughput on a realistic mix of scraped job chunks
+(store_jobs' _job_content -> split_many, so full 800-char chunks
+interleaved with short tails and card-only postings), end to end from
+the raw texts, tokenization included:
+
+- arrival order, 64/batch: the old behaviour (encode() per slice);
+- length buckets, tokenized twice: token lengths for the bucketing, then
+  encode() per bucket, which tokenizes again;
+- length buckets, tokenized once: vector.embed_texts. With the ONNX
+  backend the bucketing encodings go straight to encode_tokenized; with
+  torch this is the same path as the one above.
+
+Also prints padding efficiency (real tokens / padded tokens computed) and
+the cost of one tokenizer pass. Uses whatever EMBEDDING_BACKEND is
+configured; without the model download, benchmarks/shaped_minilm.py
+writes a same-sized stand-in for the ONNX backend.
+
+    python benchmarks/bench_embed_batching.py
+    EMBEDDING_BACKEND=onnx python benchmarks/bench_embed_batching.py --jobs 400
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np  # noqa: E402
+
+import vector  # noqa: E402
+from chunking import split_many  # noqa: E402
+from benchmarks.bench_rerank import DUTIES, SKILLS, THINGS  # noqa: E402
+
+
+def job_chunks(n_jobs, seed=0):
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(n_jobs):
+        kind = rng.random()
+        if kind < 0.3:
+            # listing card only: a one-line snippet
+            n_sentences = rng.randint(1, 2)
+        elif kind < 0.8:
+            n_sentences = rng.randint(5, 25)
+        else:
+            n_sentences = rng.randint(40, 90)
+        description = " ".join(
+            f"{rng.choice(DUTIES).capitalize()} {rng.choice(THINGS)} using {rng.choice(SKILLS)}."
+            for _ in range(n_sentences)
+        )
+        jobs.append({"title": f"{rng.choice(SKILLS)} Developer", "company": f"Acme{i}",
+                     "location": "Bangalore", "salary": "N/A", "description": description,
+                     "link": f"https://example.com/job/{i}"})
+    chunks, _ = split_many([vector._job_content(job) for job in jobs])
+    return chunks
+
+
+def arrival_batches(n, batch_size=64):
+    return [list(range(i, min(i + batch_size, n))) for i in range(0, n, batch_size)]
+
+
+def padding_efficiency(lengths, batches):
+    real = sum(lengths)
+    padded = sum(len(b) * max(lengths[i] for i in b) for b in batches)
+    return real / padded
+
+
+def encode_in_batches(model, texts, batches):
+    out = np.empty((len(texts), model.get_sentence_embedding_dimension()), dtype=np.float32)
+    for idx in batches:
+        batch = [texts[i] for i in idx]
+        out[idx] = model.encode(batch, batch_size=len(batch), show_progress_bar=False, convert_to_numpy=True)
+    return out
+
+
+def arrival_order(model, texts):
+    return encode_in_batches(model, texts, arrival_batches(len(texts)))
+
+
+def buckets_tokenized_twice(model, texts):
+    lengths = vector._token_lengths(model, texts)
+    batches = vector._length_buckets(lengths, vector.EMBED_MAX_BATCH, vector.EMBED_TOKEN_BUDGET)
+    return encode_in_batches(model, texts, batches)
+
+
+def buckets_tokenized_once(model, texts):
+    return vector.embed_texts(texts)
+
+
+def best_time(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        runs.append(time.perf_counter() - start)
+    return min(runs), out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = job_chunks(args.jobs)
+    model = vector.get_embedding_model()
+    model.encode(texts[:16], show_progress_bar=False)
+
+    lengths = vector._token_lengths(model, texts)
+    tokenize, _ = best_time(lambda: vector._token_lengths(model, texts), args.repeat)
+    print(f"{len(texts)} chunks from {args.jobs} jobs, tokens min {min(lengths)} / "
+          f"median {int(np.median(lengths))} / max {max(lengths)} ({vector.EMBEDDING_BACKEND} backend)")
+    print(f"one tokenizer pass over all chunks: {tokenize * 1000:.1f} ms")
+
+    bucketed = vector._length_buckets(lengths, vector.EMBED_MAX_BATCH, vector.EMBED_TOKEN_BUDGET)
+    strategies = {
+        "arrival order, 64/batch": (arrival_order, arrival_batches(len(texts))),
+        "length buckets, tokenized twice": (buckets_tokenized_twice, bucketed),
+        "length buckets, tokenized once": (buckets_tokenized_once, bucketed),
+    }
+
+    results = {}
+    for name, (fn, batches) in strategies.items():
+        took, results[name] = best_time(lambda: fn(model, texts), args.repeat)
+        print(f"{name:>32}: {len(batches):>3} batches, padding efficiency "
+              f"{padding_efficiency(lengths, batches):.0%}, {took * 1000:7.0f} ms, {len(texts) / took:.0f} chunks/s")
+
+    base = results["arrival order, 64/batch"]
+    diff = max(np.abs(out - base).max() for out in results.values())
+    print(f"max |difference| between strategies: {diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+API cold-start benchmark based on `python -X importtime`.
+
+Imports api.main in fresh interpreters, reports the wall time and the
+heaviest top-level imports, so regressions (a heavy module imported at
+start-up again) show up immediately:
+
+    python benchmarks/bench_import_time.py            # 5 runs, top 15
+    python benchmarks/bench_import_time.py -r 10 -t 25
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def importtime_profile(module):
+    """Returns [(cumulative_us, self_us, name, depth)] for one import of `module`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-2000:])
+        raise SystemExit(f"importing {module} failed")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cum_us, name = [p for p in line[len("import time:"):].split("|")]
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((int(cum_us), int(self_us), name.strip(), depth))
+    return rows
+
+
+def wall_time(module, runs):
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], cwd=ROOT, check=True,
+                       capture_output=True)
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-m", "--module", default="api.main")
+    ap.add_argument("-r", "--runs", type=int, default=5)
+    ap.add_argument("-t", "--top", type=int, default=15)
+    args = ap.parse_args()
+
+    rows = importtime_profile(args.module)
+    total_us = sum(r[1] for r in rows)
+    top_level = sorted((r for r in rows if r[3] <= 1), reverse=True)[:args.top]
+
+    times = wall_time(args.module, args.runs)
+    print(f"import {args.module}: median {statistics.median(times) * 1000:.0f} ms "
+          f"over {args.runs} runs (incl. interpreter start)")
+    print(f"sum of self import time: {total_us / 1000:.0f} ms, {len(rows)} modules\n")
+    print(f"{'cumulative ms':>14}  module")
+    for cum_us, _, name, _ in top_level:
+        print(f"{cum_us / 1000:14.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
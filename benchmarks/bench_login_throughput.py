@@ -0,0 +1,69 @@
+"""
+Login (bcrypt verify) throughput under concurrency.
+
+Runs C concurrent verify_password_async calls through the dedicated
+hashing pool and reports throughput, 429 rejections and how late a 10 ms
+event-loop ticker fires (a stand-in for unrelated requests like /api/query).
+
+    python benchmarks/bench_login_throughput.py -n 200 -c 100
+    AUTH_HASH_WORKERS=4 python benchmarks/bench_login_throughput.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.auth import hash_password, verify_password_async, hash_pool_stats, AuthOverloaded
+
+
+async def ticker(stop, lags):
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - t0 - 0.01)
+
+
+async def run(total, concurrency):
+    hashed = hash_password("correct horse battery staple")
+    sem = asyncio.Semaphore(concurrency)
+    ok = rejected = 0
+
+    async def one():
+        nonlocal ok, rejected
+        async with sem:
+            try:
+                await verify_password_async("correct horse battery staple", hashed)
+                ok += 1
+            except AuthOverloaded:
+                rejected += 1
+
+    stop, lags = asyncio.Event(), []
+    tick = asyncio.create_task(ticker(stop, lags))
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - t0
+
+    stop.set()
+    await tick
+
+    stats = hash_pool_stats()
+    lags.sort()
+    print(f"logins:        {total} (concurrency {concurrency}, workers {stats['workers']}, queue {stats['max_queue']})")
+    print(f"ok / 429:      {ok} / {rejected}")
+    print(f"throughput:    {ok / elapsed:.1f} verifies/s")
+    print(f"avg wait/run:  {stats['avg_wait_ms']:.1f} / {stats['avg_run_ms']:.1f} ms")
+    if lags:
+        print(f"loop lag p50:  {lags[len(lags) // 2] * 1000:.2f} ms")
+        print(f"loop lag max:  {lags[-1] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", "--requests", type=int, default=100)
+    ap.add_argument("-c", "--concurrency", type=int, default=50)
+    args = ap.parse_args()
+    asyncio.run(run(args.requests, args.concurrency))
@@ -0,0 +1,96 @@
+"""
+Per-page parse time for saved listing pages: the old per-card
+BeautifulSoup(innerHTML, "html.parser") + select_one chains vs one lxml
+parse of page_source with the compiled scrape_sites selectors.
+
+The fixture cards are repeated to a realistic page size (--cards). The old
+path's per-card get_attribute("innerHTML") WebDriver round trips (a few ms
+each against a real browser) are NOT included, so the real gap is larger.
+
+    python benchmarks/bench_parse_listing.py
+    python benchmarks/bench_parse_listing.py --cards 50 --repeat 200
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scrape_sites import parse_cards  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_page(name, card_pattern, n_cards):
+    """Fixture page with its cards repeated until there are n_cards."""
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        page = f.read()
+    cards = re.findall(card_pattern, page, flags=re.S)
+    body = "".join(cards[i % len(cards)] for i in range(n_cards))
+    return f"<html><body>{body}</body></html>", n_cards
+
+
+def old_naukri(card_htmls):
+    from bs4 import BeautifulSoup
+    out = []
+    for inner_html in card_htmls:
+        soup = BeautifulSoup(inner_html, "html.parser")
+        title_tag = soup.select_one("a.title") or soup.select_one("h2 a") or soup.select_one("a")
+        comp = soup.select_one("a.comp-name") or soup.select_one("a.subTitle") or soup.select_one(".comp-dtls-wrap a")
+        exp = soup.select_one(".exp-wrap .expwdth") or soup.select_one(".exp-wrap")
+        sal = soup.select_one(".sal-wrap span[title]") or soup.select_one(".sal-wrap") or soup.select_one(".sal-wrap span")
+        loc = soup.select_one(".loc-wrap span[title]") or soup.select_one(".loc-wrap .locWdth") or soup.select_one(".loc-wrap")
+        desc = soup.select_one(".job-desc") or soup.select_one(".short-desc") or soup.select_one(".description")
+        tags = [t.get_text(strip=True) for t in soup.select("ul.tags-gt li.tag-li")]
+        post = soup.select_one(".job-post-day") or soup.select_one(".post-date")
+        out.append((title_tag and title_tag.get_text(strip=True), comp, exp, sal, loc, desc, tags, post))
+    return out
+
+
+def old_indeed(card_htmls):
+    from bs4 import BeautifulSoup
+    out = []
+    for inner_html in card_htmls:
+        soup = BeautifulSoup(inner_html, "html.parser")
+        out.append((soup.select_one("h2.jobTitle span"), soup.select_one("span.companyName"),
+                    soup.select_one("div.companyLocation"), soup.select_one("div.salary-snippet")))
+    return out
+
+
+def timeit(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cards", type=int, default=20)
+    ap.add_argument("--repeat", type=int, default=50)
+    args = ap.parse_args()
+
+    cases = [
+        ("naukri", "naukri_listing.html",
+         r'<div class="cust-job-tuple layout-wrapper">.*?\n  </div>\n', r'<div class="cust-job-tuple[^"]*">(.*)</div>', old_naukri),
+        ("indeed", "indeed_listing.html",
+         r'<a class="tapItem".*?</a>', r'<a class="tapItem"[^>]*>(.*)</a>', old_indeed),
+    ]
+
+    print(f"{'site':8} {'cards':>5} {'bs4 per card':>14} {'lxml page_source':>18} {'speedup':>8}")
+    for site, name, card_re, inner_re, old_fn in cases:
+        page, n = load_page(name, card_re, args.cards)
+        inner = [re.search(inner_re, c, flags=re.S).group(1) for c in re.findall(card_re, page, flags=re.S)]
+        assert len(parse_cards(site, page)) == n
+
+        t_old = timeit(lambda: old_fn(inner), args.repeat)
+        t_new = timeit(lambda: parse_cards(site, page), args.repeat)
+        print(f"{site:8} {n:5d} {t_old * 1000:11.2f} ms {t_new * 1000:15.2f} ms {t_old / t_new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+compute_job_resume_matches: exact mode (every resume chunk x every job
+chunk) vs profile mode (profile vectors x every job chunk, exact scoring
+on survivors), on a synthetic store in a temporary directory.
+
+Embeddings are clustered around topics so same-topic chunks land around
+the 0.6 match threshold: the resume covers a few topics (one of its chunks
+per topic is a skills list), the job store many. Reports time per run,
+how many job chunks survive the first pass and whether both modes return
+the same matches.
+
+    python benchmarks/bench_profile_matching.py
+    python benchmarks/bench_profile_matching.py --job-chunks 100000 --resume-chunks 30
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+DIM = 384
+
+
+def clustered(rng, topics, topic_ids, noise):
+    vecs = topics[topic_ids] + rng.normal(size=(len(topic_ids), DIM)) * noise / np.sqrt(DIM)
+    return (vecs / np.linalg.norm(vecs, axis=1, keepdims=True)).astype(np.float32)
+
+
+def build_store(folder, n_job_chunks, n_resume_chunks, n_topics=60, seed=0):
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(n_topics, DIM))
+    topics /= np.linalg.norm(topics, axis=1, keepdims=True)
+
+    resume_topics = rng.choice(n_topics, size=4, replace=False)
+    r_ids = resume_topics[np.arange(n_resume_chunks) % len(resume_topics)]
+    resume_embs = clustered(rng, topics, r_ids, noise=0.8)
+    resume_docs = [
+        ("Technical Skills: Python, SQL, Docker, AWS" if i < len(resume_topics) else "Worked on projects")
+        + f" (section {i})" for i in range(n_resume_chunks)
+    ]
+
+    j_ids = rng.integers(0, n_topics, size=n_job_chunks)
+    job_embs = clustered(rng, topics, j_ids, noise=0.8)
+
+    data = os.path.join(folder, "vector_data")
+    os.makedirs(data, exist_ok=True)
+    with open(os.path.join(data, "jobs_docs.json"), "w") as f:
+        json.dump([{"doc": "", "meta": {"job_index": i // 3, "chunk_index": i % 3, "user_id": "u1",
+                                       "source": f"https://example.com/{i // 3}"}}
+                   for i in range(n_job_chunks)], f)
+    np.save(os.path.join(data, "jobs_embs.npy"), job_embs)
+    with open(os.path.join(data, "resume_docs.json"), "w") as f:
+        json.dump([{"doc": d, "meta": {"chunk_index": i, "user_id": "u1", "resume_hash": "h1"}}
+                   for i, d in enumerate(resume_docs)], f)
+    np.save(os.path.join(data, "resume_embs.npy"), resume_embs)
+    return resume_docs, resume_embs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--job-chunks", type=int, default=30000)
+    parser.add_argument("--resume-chunks", type=int, default=16)
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+        resume_docs, resume_embs = build_store(folder, args.job_chunks, args.resume_chunks)
+
+        import vector
+        import worker_similarity as ws
+        vector._store_resume_profile("u1", "h1", resume_docs, resume_embs)
+        profile = np.load(ws.RESUME_PROFILE_EMB)
+
+        job_vecs = np.load(ws.JOBS_EMB)
+        survivors = len(ws._profile_survivors(profile, job_vecs, args.threshold, ws.PROFILE_MARGIN))
+
+        # scoring alone, without the store load
+        def exact_core():
+            return ws._cosine_sim_matrix(resume_embs, job_vecs).max(axis=0)
+
+        def profile_core():
+            keep = ws._profile_survivors(profile, job_vecs, args.threshold, ws.PROFILE_MARGIN)
+            return ws._cosine_sim_matrix(resume_embs, job_vecs[keep]).max(axis=0)
+
+        core = {}
+        for name, fn in (("exact", exact_core), ("profile", profile_core)):
+            runs = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                fn()
+                runs.append(time.perf_counter() - start)
+            core[name] = min(runs)
+
+        results, times = {}, {}
+        for mode in ("exact", "profile"):
+            runs = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results[mode] = ws.compute_job_resume_matches("u1", args.threshold, rerank=False, mode=mode)
+                runs.append(time.perf_counter() - start)
+            times[mode] = min(runs)
+
+    exact = {r["job_index"]: r["score"] for r in results["exact"]}
+    prof = {r["job_index"]: r["score"] for r in results["profile"]}
+    missed = set(exact) - set(prof)
+    print(f"{args.resume_chunks} resume chunks -> {len(profile)} profile vectors, {args.job_chunks} job chunks")
+    print(f"first pass keeps {survivors} job chunks ({survivors / args.job_chunks:.1%}), margin {ws.PROFILE_MARGIN}")
+    print(f"exact:   scoring {core['exact'] * 1000:6.1f} ms, whole run {times['exact'] * 1000:7.1f} ms, "
+          f"{len(exact)} matched jobs")
+    print(f"profile: scoring {core['profile'] * 1000:6.1f} ms, whole run {times['profile'] * 1000:7.1f} ms, "
+          f"{len(prof)} matched jobs, {len(missed)} missed, "
+          f"scores equal: {all(abs(prof[j] - exact[j]) < 1e-6 for j in prof)}")
+    print("(whole run includes loading the store from disk)")
+
+
+if __name__ == "__main__":
+    main()
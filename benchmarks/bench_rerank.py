@@ -0,0 +1,86 @@
+"""
+CPU latency of the cross-encoder re-ranking stage (rerank.py) per 100
+(resume chunk, job chunk) pairs, for a few batch sizes and thread counts,
+plus the cost of a fully cached re-run.
+
+Pairs are built from chunk-sized texts (~800 chars, the splitter's
+chunk_size) so the token lengths match what worker_similarity sends.
+
+    python benchmarks/bench_rerank.py
+    python benchmarks/bench_rerank.py --pairs 300 --batch-sizes 8 16 32 --threads 1 2 4
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import rerank  # noqa: E402
+
+SKILLS = ["Python", "FastAPI", "Django", "React", "AWS", "Docker", "Kubernetes", "SQL", "MongoDB",
+          "Spark", "Airflow", "Java", "Spring Boot", "Go", "Terraform", "pandas", "PyTorch"]
+DUTIES = ["design and build", "maintain", "own the roadmap for", "scale", "write tests for",
+          "deploy and monitor", "review code for", "improve the reliability of"]
+THINGS = ["REST services", "data pipelines", "internal dashboards", "ML models", "payment flows",
+          "search infrastructure", "CI/CD pipelines", "customer integrations"]
+
+
+def chunk(rng, lead, size=800):
+    parts = [lead]
+    while sum(len(p) for p in parts) < size:
+        parts.append(f"{rng.choice(DUTIES).capitalize()} {rng.choice(THINGS)} using "
+                     f"{rng.choice(SKILLS)} and {rng.choice(SKILLS)}.")
+    return " ".join(parts)[:size]
+
+
+def make_pairs(n, seed=0):
+    rng = random.Random(seed)
+    pairs = []
+    for i in range(n):
+        resume = chunk(rng, f"Experience: {rng.randint(1, 10)} years as a {rng.choice(SKILLS)} developer.")
+        job = chunk(rng, f"Job Title: {rng.choice(SKILLS)} Engineer\nCompany: Acme{i}\nDescription:")
+        pairs.append((resume, job))
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    import torch
+
+    pairs = make_pairs(args.pairs)
+
+    start = time.perf_counter()
+    model = rerank.get_rerank_model()
+    print(f"model {rerank.RERANK_MODEL} loaded in {time.perf_counter() - start:.2f}s")
+    model.predict(pairs[:8], show_progress_bar=False)  # first-inference setup
+
+    print(f"{'threads':>7} {'batch':>5} {'ms / 100 pairs':>15} {'pairs / s':>10}")
+    for threads in args.threads:
+        torch.set_num_threads(threads)
+        for batch_size in args.batch_sizes:
+            start = time.perf_counter()
+            model.predict(pairs, batch_size=batch_size, show_progress_bar=False)
+            elapsed = time.perf_counter() - start
+            print(f"{threads:>7} {batch_size:>5} {elapsed / len(pairs) * 100 * 1000:>15.0f} "
+                  f"{len(pairs) / elapsed:>10.1f}")
+
+    # same pairs through score_pairs twice: the second run is all cache hits
+    keys = [("resume-v1", i) for i in range(len(pairs))]
+    start = time.perf_counter()
+    rerank.score_pairs(pairs, keys)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    rerank.score_pairs(pairs, keys)
+    warm = time.perf_counter() - start
+    print(f"score_pairs: {cold * 1000:.0f} ms cold, {warm * 1000:.2f} ms cached ({rerank.cache_stats()})")
+
+
+if __name__ == "__main__":
+    main()
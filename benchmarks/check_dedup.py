@@ -0,0 +1,116 @@
+"""
+Checks dedup.JobDeduper on synthetic cross-posted jobs.
+
+Each base posting is "scraped" from Naukri and again from Indeed with a
+work-mode tag or different casing in the title, another spelling of the city, a tracking param on the link
+and a few words of the description changed. Distinct postings from the same
+company share boilerplate paragraphs, which must NOT be merged.
+
+    python benchmarks/check_dedup.py [--jobs 500]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from dedup import JobDeduper  # noqa: E402
+
+SKILLS = ["python", "django", "fastapi", "react", "aws", "docker", "kubernetes", "sql",
+          "mongodb", "spark", "airflow", "java", "spring", "golang", "terraform", "pandas"]
+VERBS = ["design", "build", "maintain", "own", "scale", "test", "deploy", "monitor", "improve", "review"]
+NOUNS = ["services", "pipelines", "APIs", "dashboards", "models", "platforms", "integrations", "tools"]
+CITIES = [("Bengaluru", "Bangalore"), ("Gurugram", "Gurgaon"), ("Mumbai", "Bombay"), ("Pune", "Pune")]
+
+
+# stand-in for the open vocabulary of real descriptions
+VOCAB = ["".join(random.Random(i).choice("abcdefghijklmnoprstuvw") for _ in range(3 + i % 6))
+         for i in range(5000)]
+
+
+def sentence(rng):
+    return (f"You will {rng.choice(VERBS)} {rng.choice(VOCAB)} {rng.choice(NOUNS)} using {rng.choice(SKILLS)} "
+            f"and {rng.choice(SKILLS)} for {rng.choice(VOCAB)} {rng.choice(VOCAB)} {rng.choice(VOCAB)}.")
+
+
+def make_jobs(n, seed=7):
+    rng = random.Random(seed)
+    companies = [f"Acme{i} Technologies" for i in range(n // 5)]
+    # per-company boilerplate shared by all of its postings
+    boiler = {c: " ".join(sentence(rng) for _ in range(3)) for c in companies}
+
+    jobs, truth = [], []
+    for i in range(n):
+        company = rng.choice(companies)
+        title = f"{rng.choice(['Senior', 'Junior', 'Lead'])} {rng.choice(SKILLS).title()} Developer"
+        city = rng.choice(CITIES)
+        body = " ".join(sentence(rng) for _ in range(12))
+        desc = f"{body}\n\nAbout {company}: {boiler[company]}"
+        naukri = {
+            "title": title, "company": company + " Pvt Ltd", "location": f"{city[0]}, Karnataka",
+            "salary": "N/A", "description": desc, "link": f"https://www.naukri.com/job-{i}?src=jobsearch",
+            "source": "naukri", "extra": {},
+        }
+        jobs.append(naukri)
+        truth.append(i)
+
+        # repeated on a later result page
+        if rng.random() < 0.2:
+            jobs.append(dict(naukri, link=f"https://www.naukri.com/job-{i}?src=page2", extra={}))
+            truth.append(i)
+
+        if rng.random() < 0.6:
+            words = desc.split()
+            for _ in range(3):
+                words[rng.randrange(len(words))] = rng.choice(SKILLS)
+            jobs.append({
+                "title": title + " - Remote" if rng.random() < 0.5 else title.upper(),
+                "company": company, "location": city[1], "salary": "₹12-18 LPA",
+                "description": " ".join(words), "link": f"https://in.indeed.com/viewjob?jk={i:08x}",
+                "source": "indeed", "extra": {},
+            })
+            truth.append(i)
+
+    order = list(range(len(jobs)))
+    rng.shuffle(order)
+    return [jobs[k] for k in order], [truth[k] for k in order]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=500)
+    args = parser.parse_args()
+
+    jobs, truth = make_jobs(args.jobs)
+    deduper = JobDeduper()
+
+    start = time.perf_counter()
+    kept = {}
+    for job, posting in zip(jobs, truth):
+        if deduper.add(job) is not None:
+            kept[id(job)] = posting
+    elapsed = time.perf_counter() - start
+
+    # each canonical job must only carry links of its own posting
+    wrong = 0
+    for job in deduper.canonical:
+        posting = kept[id(job)]
+        for ref in job.get("extra", {}).get("sources", []):
+            if f"-{posting}?" not in ref["link"] and f"jk={posting:08x}" not in ref["link"]:
+                wrong += 1
+
+    distinct = len(set(truth))
+    missed = len(deduper.canonical) - distinct
+    print(f"{len(jobs)} scraped, {distinct} distinct postings, {len(deduper.canonical)} kept "
+          f"({deduper.duplicates} merged) in {elapsed * 1000:.0f} ms "
+          f"({elapsed / len(jobs) * 1e6:.0f} us/job)")
+    print(f"missed duplicates: {missed}, wrongly merged links: {wrong}")
+    assert wrong == 0, "distinct postings were merged"
+    assert missed <= distinct * 0.02, "too many duplicates missed"
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
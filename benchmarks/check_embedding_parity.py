@@ -0,0 +1,112 @@
+"""
+Parity + speed of the ONNX embedding backend (embedding_onnx.py) against
+the sentence-transformers one, on job-chunk-like texts and chat queries.
+
+Checks, per ONNX variant (fp32 and int8):
+- cosine between the two backends' vectors for the same text;
+- max |difference| of query -> chunk cosine scores (what retrieval and
+  worker_similarity thresholds see);
+- same top-5 chunks per query.
+
+    python benchmarks/check_embedding_parity.py
+    python benchmarks/check_embedding_parity.py --texts 2000 --threads 4
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.bench_rerank import make_pairs  # noqa: E402
+
+# minimum per-text cosine / maximum score drift allowed per variant
+TOLERANCE = {"fp32": (0.999, 0.005), "int8": (0.97, 0.05)}
+
+QUERIES = [
+    "python backend jobs in bangalore", "which jobs match my resume best",
+    "remote data engineering roles with spark", "salary for senior java developer",
+    "jobs that need kubernetes and terraform", "entry level react developer openings",
+]
+
+
+def corpus(n, seed=0):
+    rng = random.Random(seed)
+    texts = []
+    for resume, job in make_pairs(n // 2 + 1, seed):
+        # realistic length mix: full chunks plus short tail chunks
+        texts.append(job)
+        texts.append(resume[: rng.randint(40, 800)])
+    return texts[:n]
+
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def timed_encode(model, texts, batch_size):
+    start = time.perf_counter()
+    embs = model.encode(texts, batch_size=batch_size, show_progress_bar=False, convert_to_numpy=True)
+    return embs, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=0)
+    args = parser.parse_args()
+
+    import numpy as np
+    import embedding_onnx
+
+    texts = corpus(args.texts)
+
+    variants = {}
+    for name, filename in (("fp32", "onnx/model.onnx"), ("int8", "onnx/model_quint8_avx2.onnx")):
+        embedding_onnx.EMBEDDING_ONNX_FILE = filename
+        rss_before = rss_mb()
+        start = time.perf_counter()
+        model = embedding_onnx.load_onnx_embedder(threads=args.threads)
+        load = time.perf_counter() - start
+        model.encode(texts[:8])
+        embs, took = timed_encode(model, texts, args.batch_size)
+        variants[name] = (model, embs, took, load, rss_mb() - rss_before)
+
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    from sentence_transformers import SentenceTransformer
+    import torch
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    ref_model = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
+    ref_load = time.perf_counter() - start
+    ref_model.encode(texts[:8])
+    ref, ref_took = timed_encode(ref_model, texts, args.batch_size)
+    ref_q = ref_model.encode(QUERIES, convert_to_numpy=True)
+    print(f"torch: load {ref_load:.1f}s (+{rss_mb() - rss_before:.0f} MB peak RSS), "
+          f"encode {len(texts) / ref_took:.0f} texts/s")
+
+    failed = False
+    for name, (model, embs, took, load, rss) in variants.items():
+        min_cos, max_drift = TOLERANCE[name]
+        cos = (embs * ref).sum(axis=1) / (np.linalg.norm(embs, axis=1) * np.linalg.norm(ref, axis=1))
+        q = model.encode(QUERIES)
+        drift = np.abs(q @ embs.T - ref_q @ ref.T).max()
+        top_ref = np.argsort(-(ref_q @ ref.T), axis=1)[:, :5]
+        top = np.argsort(-(q @ embs.T), axis=1)[:, :5]
+        overlap = np.mean([len(set(a) & set(b)) / 5 for a, b in zip(top, top_ref)])
+
+        ok = cos.min() >= min_cos and drift <= max_drift
+        failed |= not ok
+        print(f"onnx {name}: load {load:.1f}s (+{rss:.0f} MB peak RSS), encode {len(texts) / took:.0f} texts/s "
+              f"({ref_took / took:.1f}x torch) | cosine vs torch min {cos.min():.4f} mean {cos.mean():.4f} | "
+              f"max score drift {drift:.4f} | top-5 overlap {overlap:.0%} -> {'OK' if ok else 'FAIL'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
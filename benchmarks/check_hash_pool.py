@@ -0,0 +1,54 @@
+"""
+Checks the bounded bcrypt pool in api/auth.py keeps its queue accounting
+when callers go away: a hash cancelled while still queued (client
+disconnect, request timeout) must give its slot back, or enough of them
+would turn every login into a 429.
+
+    python benchmarks/check_hash_pool.py
+"""
+import asyncio
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ["AUTH_HASH_WORKERS"] = "1"
+os.environ["AUTH_HASH_MAX_QUEUE"] = "2"
+
+from api import auth  # noqa: E402
+
+
+async def main():
+    release = threading.Event()
+
+    # occupy the single pool thread
+    blocker = asyncio.ensure_future(auth._run_on_hash_pool(release.wait, 5))
+    await asyncio.sleep(0.1)
+
+    # queued behind it, then cancelled before a thread picks it up
+    for _ in range(5):
+        queued = asyncio.ensure_future(auth._run_on_hash_pool(lambda: "never"))
+        await asyncio.sleep(0.05)
+        assert auth.hash_pool_stats()["queued"] == 1, auth.hash_pool_stats()
+        queued.cancel()
+        try:
+            await queued
+        except asyncio.CancelledError:
+            pass
+        assert auth.hash_pool_stats()["queued"] == 0, auth.hash_pool_stats()
+
+    release.set()
+    assert await blocker is True
+
+    # pool still accepts work at full capacity afterwards
+    results = await asyncio.gather(*(auth._run_on_hash_pool(lambda: 1) for _ in range(3)))
+    stats = auth.hash_pool_stats()
+    assert results == [1, 1, 1] and stats["queued"] == 0 and stats["in_flight"] == 0, stats
+    assert stats["rejected"] == 0, stats
+    print("cancelled queued hashes released their slots:", stats)
+    print("OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
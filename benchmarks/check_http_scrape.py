@@ -0,0 +1,78 @@
+"""
+Runs the HTTP scrapers against the local fixture server and checks the
+parsed fields, then times a few pages (listing + detail requests over
+the pooled client):
+
+    python benchmarks/check_http_scrape.py
+    python benchmarks/check_http_scrape.py --pages 20
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixture_server  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=5)
+    args = ap.parse_args()
+
+    server, base = fixture_server.start()
+    os.environ["NAUKRI_BASE_URL"] = base
+    os.environ["INDEED_BASE_URL"] = base
+    # the local server needs no politeness delay (see check_scrape_limits.py for that)
+    for var in ("SCRAPE_RATE_PER_SEC", "SCRAPE_RATE_MAX", "SCRAPE_BURST"):
+        os.environ.setdefault(var, "100000")
+    os.environ.setdefault("SCRAPE_LIMITS_REDIS_URL", "redis://127.0.0.1:1/0")
+
+    import scrape_http
+    from scrape_http import Blocked, iter_indeed_http, iter_naukri_http, _naukri_api_page
+
+    naukri = list(iter_naukri_http("python+developer", "kolkata", max_pages=1))
+    assert [j["company"] for j in naukri] == ["Acme Software", "BrightData Labs", "Nimbus AI"], naukri
+    assert naukri[0]["salary"] == "6-10 Lacs PA" and naukri[0]["location"] == "Kolkata, Hybrid"
+    assert naukri[0]["extra"]["tags"] == ["python", "fastapi", "mongodb"]
+    assert naukri[0]["description"].startswith("We are hiring a Python Developer"), naukri[0]["description"]
+    assert naukri[2]["salary"] == "N/A"
+
+    api_jobs = _naukri_api_page("python+developer", "kolkata", 1)
+    assert [j["title"] for j in api_jobs] == ["Data Engineer", "Django Developer"], api_jobs
+    assert api_jobs[0]["link"] == f"{base}/job-listings-data-engineer-riverstone-analytics-kolkata-2-to-4-years-201"
+
+    indeed = list(iter_indeed_http("python+developer", "kolkata", max_pages=1))
+    assert [j["title"] for j in indeed] == ["Senior Python Developer", "Python Backend Intern"], indeed
+    assert indeed[0]["link"] == f"{base}/viewjob?jk=a1b2c3"
+    assert "5+ years with Django or FastAPI" in indeed[0]["description"]
+    assert indeed[1]["salary"] == "N/A"
+
+    # blocked listing -> Blocked carrying the page to resume from in the browser
+    blocked_server, blocked_base = fixture_server.start(blocked=("naukri",))
+    scrape_http.NAUKRI_BASE_URL = blocked_base
+    try:
+        list(iter_naukri_http("python+developer", "kolkata", max_pages=3, start_page=1))
+        raise AssertionError("expected Blocked")
+    except Blocked as e:
+        assert e.page == 1, e.page
+    scrape_http.NAUKRI_BASE_URL = base
+    blocked_server.shutdown()
+
+    print("fixture checks passed "
+          f"(http2 client: {scrape_http._http2_available()}, parser: lxml)")
+
+    t0 = time.perf_counter()
+    n = len(list(iter_naukri_http("python+developer", "kolkata", max_pages=args.pages)))
+    n += len(list(iter_indeed_http("python+developer", "kolkata", max_pages=args.pages)))
+    dt = time.perf_counter() - t0
+    print(f"{2 * args.pages} listing pages, {n} jobs with details in {dt * 1000:.0f} ms "
+          f"({dt / (2 * args.pages) * 1000:.1f} ms/page)")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
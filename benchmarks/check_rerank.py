@@ -0,0 +1,59 @@
+"""
+Checks rerank.score_pairs turns cross-encoder logits into probabilities
+before caching them: ms-marco cross-encoders output raw logits, and
+RERANK_THRESHOLD (0.5) is a probability. Uses a stub model that returns
+fixed logits, so neither torch nor sentence-transformers is needed.
+
+    python benchmarks/check_rerank.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np  # noqa: E402
+
+import rerank  # noqa: E402
+
+# job text -> logit the stub model returns for it
+LOGITS = {"strong": 6.0, "even": 0.0, "weak": -4.0, "unrelated": -9.5}
+
+
+class StubCrossEncoder:
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False, convert_to_numpy=True, **kwargs):
+        self.calls += 1
+        return np.array([LOGITS[job] for _, job in pairs], dtype=np.float32)
+
+
+def main():
+    model = StubCrossEncoder()
+    rerank._rerank_model = model
+
+    pairs = [("resume", job) for job in LOGITS]
+    keys = [("resume-v1", job) for job in LOGITS]
+    scores = rerank.score_pairs(pairs, keys)
+
+    expected = 1.0 / (1.0 + np.exp(-np.array(list(LOGITS.values()))))
+    assert np.allclose(scores, expected, atol=1e-6), scores
+    assert ((scores >= 0) & (scores <= 1)).all(), scores
+
+    # cached values are probabilities too: a re-run doesn't touch the model
+    again = rerank.score_pairs(pairs, keys)
+    assert model.calls == 1 and np.allclose(again, scores), (model.calls, again)
+
+    candidates = [
+        {"job_index": i, "score": 0.7, "resume_text": "resume", "job_text": job, "cache_key": key}
+        for i, (job, key) in enumerate(zip(LOGITS, keys))
+    ]
+    kept = rerank.rerank_matches(candidates, threshold=0.5)
+    assert [r["job_index"] for r in kept] == [0, 1], kept
+
+    print("scores:", {job: round(float(s), 4) for job, s in zip(LOGITS, scores)})
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
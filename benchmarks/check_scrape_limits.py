@@ -0,0 +1,79 @@
+"""
+Exercises scrape_limits against the fixture server, using the in-process
+fallback unless --redis points at a reachable Redis:
+
+- pacing: requests to one domain are spaced at the configured rate;
+- adaptive rate: block responses halve it, successes raise it again;
+- circuit breaker: repeated blocked pages open the breaker, and the
+  scraper then skips the source without touching the site.
+
+    python benchmarks/check_scrape_limits.py
+    python benchmarks/check_scrape_limits.py --redis redis://localhost:6379/0
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixture_server  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--redis", default="redis://127.0.0.1:1/0", help="default: unreachable -> in-process")
+    ap.add_argument("--rate", type=float, default=5.0)
+    args = ap.parse_args()
+
+    server, base = fixture_server.start()
+    blocked_server, blocked_base = fixture_server.start(blocked=("naukri", "indeed"))
+    os.environ.update({
+        "SCRAPE_LIMITS_REDIS_URL": args.redis,
+        "SCRAPE_RATE_PER_SEC": str(args.rate),
+        "SCRAPE_RATE_MAX": str(args.rate * 2),
+        "SCRAPE_BURST": "1",
+        "SCRAPE_MAX_RETRIES": "0",
+        "SCRAPE_CIRCUIT_FAILURES": "3",
+        "SCRAPE_CIRCUIT_COOLDOWN": "60",
+        "NAUKRI_BASE_URL": blocked_base,
+        "SCRAPE_MODE": "http",
+    })
+
+    import scrape_http
+    import scrape_limits
+    from scrape_limits import circuit_open, domain_of, report
+
+    # ---- pacing ----
+    n = 10
+    t0 = time.perf_counter()
+    for _ in range(n):
+        scrape_http.fetch(f"{base}/viewjob?jk=a1b2c3")
+    dt = time.perf_counter() - t0
+    print(f"pacing: {n} requests in {dt:.2f}s (rate {args.rate}/s, expected >= {(n - 1) / (args.rate * 2):.2f}s)")
+
+    # ---- adaptive rate ----
+    domain = domain_of(base)
+    before = report(domain, "error")
+    halved = report(domain, "blocked")
+    recovered = [round(report(domain, "ok", 0.05), 2) for _ in range(3)]
+    print(f"adaptive rate: {before:.2f} -> blocked {halved:.2f} -> ok {recovered}")
+    assert halved < before and recovered[-1] > halved
+
+    # ---- circuit breaker ----
+    from scrape_naukri import iter_naukri
+    for _ in range(scrape_limits.CIRCUIT_FAILURES):
+        assert list(iter_naukri("python+developer", "kolkata", max_pages=1)) == []
+    assert circuit_open("naukri")
+    t0 = time.perf_counter()
+    assert list(iter_naukri("python+developer", "kolkata", max_pages=1)) == []
+    print(f"circuit breaker: open after {scrape_limits.CIRCUIT_FAILURES} blocked pages, "
+          f"next run skipped in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    server.shutdown()
+    blocked_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Report how much memory gunicorn workers share with the master (Linux only).
+
+Start the API with gunicorn.conf.py, send one chat request per worker so
+every worker has encoded something, then:
+
+    python benchmarks/check_shared_model_memory.py <gunicorn master pid>
+
+PSS splits shared pages between the processes that map them; if the model
+is shared copy-on-write, each worker's Private figure stays far below the
+model size (~90 MB for all-MiniLM-L6-v2 plus torch) while RSS includes it.
+"""
+import sys
+
+
+def smaps_rollup(pid):
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 3 and parts[-1] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return fields
+
+
+def children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except FileNotFoundError:
+        return []
+
+
+def main():
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(1)
+
+    master = int(sys.argv[1])
+    pids = [master] + children(master)
+
+    print(f"{'pid':>8} {'role':<7} {'RSS MB':>8} {'PSS MB':>8} {'shared MB':>10} {'private MB':>11}")
+    total_rss = total_pss = 0
+    for pid in pids:
+        m = smaps_rollup(pid)
+        shared = m.get("Shared_Clean", 0) + m.get("Shared_Dirty", 0)
+        private = m.get("Private_Clean", 0) + m.get("Private_Dirty", 0)
+        total_rss += m.get("Rss", 0)
+        total_pss += m.get("Pss", 0)
+        role = "master" if pid == master else "worker"
+        print(f"{pid:>8} {role:<7} {m.get('Rss', 0) / 1024:8.1f} {m.get('Pss', 0) / 1024:8.1f} "
+              f"{shared / 1024:10.1f} {private / 1024:11.1f}")
+
+    print(f"\nsum of RSS: {total_rss / 1024:.1f} MB (what naive per-process accounting suggests)")
+    print(f"sum of PSS: {total_pss / 1024:.1f} MB (actual memory used)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Checks chunking.split_text against langchain's RecursiveCharacterTextSplitter
+(langchain-text-splitters, only needed for this script) on generated job
+postings, resume-like text and random whitespace-heavy edge cases, then
+times both on the same corpus:
+
+    python benchmarks/check_splitter_parity.py            # 5000 texts
+    python benchmarks/check_splitter_parity.py -n 20000 --seed 7
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter  # noqa: E402
+from chunking import split_text  # noqa: E402
+
+WORDS = ("python react backend engineer remote hybrid kolkata bangalore senior "
+         "junior django fastapi aws docker kubernetes sql nosql mongodb team "
+         "experience years salary lpa apply developer data ml").split()
+LONG_WORD = "x" * 1200
+
+
+def job_posting(rng):
+    desc = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 400)))
+    if rng.random() < 0.3:
+        desc = desc.replace(" team ", "\n\n").replace(" data ", "\n")
+    return (
+        f"Job Title: {rng.choice(WORDS).title()} Developer\n"
+        f"Company: {rng.choice(WORDS).title()} Ltd\n"
+        f"Location: {rng.choice(WORDS).title()}\n"
+        f"Salary: {rng.randint(3, 40)} LPA\n"
+        f"Description: {desc}\n"
+        f"Apply Link: https://example.com/job/{rng.randint(1, 10**9)}\n"
+    )
+
+
+def edge_case(rng):
+    pieces = []
+    for _ in range(rng.randint(1, 60)):
+        r = rng.random()
+        if r < 0.05:
+            pieces.append(LONG_WORD[: rng.randint(700, 1200)])
+        elif r < 0.2:
+            pieces.append(rng.choice(["\n\n", "\n", " ", "  ", "\n \n", "\t"]))
+        else:
+            pieces.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 80))))
+        pieces.append(rng.choice(["", " ", "\n", "\n\n"]))
+    return "".join(pieces)
+
+
+def corpus(n, seed):
+    rng = random.Random(seed)
+    return [job_posting(rng) if rng.random() < 0.7 else edge_case(rng) for _ in range(n)]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", type=int, default=5000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--chunk-size", type=int, default=800)
+    ap.add_argument("--chunk-overlap", type=int, default=150)
+    args = ap.parse_args()
+
+    texts = corpus(args.n, args.seed)
+    ref = RecursiveCharacterTextSplitter(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+
+    t0 = time.perf_counter()
+    expected = [ref.split_text(t) for t in texts]
+    t_ref = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    got = [split_text(t, args.chunk_size, args.chunk_overlap) for t in texts]
+    t_new = time.perf_counter() - t0
+
+    mismatches = [i for i, (a, b) in enumerate(zip(expected, got)) if a != b]
+    n_chunks = sum(len(c) for c in expected)
+    print(f"{len(texts)} texts, {n_chunks} chunks, {len(mismatches)} mismatches")
+    print(f"langchain: {t_ref * 1000:.0f} ms   chunking: {t_new * 1000:.0f} ms "
+          f"({t_ref / t_new:.1f}x)")
+
+    if mismatches:
+        i = mismatches[0]
+        print("first mismatch, text", i, repr(texts[i][:200]))
+        print(" expected:", [len(c) for c in expected[i]])
+        print(" got:     ", [len(c) for c in got[i]])
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
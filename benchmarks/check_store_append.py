@@ -0,0 +1,91 @@
+"""
+Checks store_jobs(append=True) extends the job store in place: after a
+scrape's micro-batches the files load to the same docs, metas and
+embeddings as one full write, and each batch writes only its own rows
+instead of re-reading and rewriting the whole store. Runs in a temporary
+directory with a hash-based stand-in for embed_texts (no model needed).
+
+    python benchmarks/check_store_append.py
+    python benchmarks/check_store_append.py --jobs 2000 --batch 10
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+
+def fake_embed(texts, *args, **kwargs):
+    out = np.empty((len(texts), 384), dtype=np.float32)
+    for i, text in enumerate(texts):
+        seed = int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:4], "little")
+        out[i] = np.random.default_rng(seed).normal(size=384)
+    return out
+
+
+def make_jobs(n):
+    return [{"title": f"Python Developer {i}", "company": f"Acme{i}", "location": "Kolkata",
+             "salary": "N/A", "description": "Build REST services. " * (1 + i % 40),
+             "link": f"https://example.com/job/{i}"} for i in range(n)]
+
+
+def load(vector):
+    with open(vector.JOBS_JSON, encoding="utf-8") as f:
+        items = json.load(f)
+    return items, np.load(vector.JOBS_EMB)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+        import vector
+        vector.embed_texts = fake_embed
+        jobs = make_jobs(args.jobs)
+
+        vector.store_jobs(jobs, "u1")
+        expected_items, expected_embs = load(vector)
+
+        start = time.perf_counter()
+        for offset in range(0, len(jobs), args.batch):
+            vector.store_jobs(jobs[offset:offset + args.batch], "u1",
+                              append=offset > 0, job_index_offset=offset)
+        took = time.perf_counter() - start
+        items, embs = load(vector)
+
+        assert items == expected_items, "appended docs/metas differ from a full write"
+        assert embs.dtype == np.float32 and np.array_equal(embs, expected_embs), embs.shape
+
+        # the last batch must not cost a full rewrite: time it against the store size
+        store_bytes = os.path.getsize(vector.JOBS_JSON) + os.path.getsize(vector.JOBS_EMB)
+        start = time.perf_counter()
+        vector.store_jobs(jobs[:args.batch], "u1", append=True, job_index_offset=len(jobs))
+        last = time.perf_counter() - start
+        new_chunks = len(vector.split_many([vector._job_content(j) for j in jobs[:args.batch]])[0])
+        assert len(load(vector)[0]) == len(load(vector)[1]) == len(items) + new_chunks
+
+        # an empty store is written normally
+        vector.store_jobs(jobs[:1], "u1")
+        with open(vector.JOBS_JSON, "w") as f:
+            f.write("[]")
+        vector.store_jobs(jobs[:2], "u1", append=True)
+        assert len(load(vector)[0]) == len(load(vector)[1]) > 0
+
+    print(f"{args.jobs} jobs in batches of {args.batch}: {len(items)} chunks, {took * 1000:.0f} ms total; "
+          f"one more batch on a {store_bytes / 1e6:.1f} MB store: {last * 1000:.1f} ms")
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Serves the saved pages in benchmarks/fixtures with Naukri- and Indeed-like
+routes, so the scrapers can run without touching the real sites:
+
+    python benchmarks/fixture_server.py --port 8765
+    NAUKRI_BASE_URL=http://127.0.0.1:8765 INDEED_BASE_URL=http://127.0.0.1:8765 \\
+        SCRAPE_MODE=http python -c "from scrape_naukri import scrape_naukri; print(scrape_naukri('python developer', 'kolkata'))"
+
+--block naukri|indeed answers that site's listing pages with 403 (to
+exercise the browser fallback / backoff paths).
+"""
+import argparse
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def route(path):
+    """(site, fixture file) for a request path."""
+    if path.startswith("/jobapi/v3/search"):
+        return "naukri", "naukri_search.json"
+    if path.startswith("/job-listings-"):
+        return "naukri", "naukri_job.html"
+    if path.startswith(("/viewjob", "/rc/clk")):
+        return "indeed", "indeed_job.html"
+    if path.startswith("/jobs"):
+        return "indeed", "indeed_listing.html"
+    if path.rstrip("/").split("?")[0].endswith("-jobs") or "-jobs-in-" in path:
+        return "naukri", "naukri_listing.html"
+    return None, None
+
+
+def make_handler(blocked=(), delay=0.0):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive, like the real sites
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            path = urlsplit(self.path).path
+            site, name = route(path)
+            if name is None:
+                return self._send(404, b"not found", "text/plain")
+            if site in blocked and name.endswith(("listing.html", ".json")):
+                return self._send(403, b"<html>Access Denied</html>", "text/html")
+            if delay:
+                threading.Event().wait(delay)
+            with open(os.path.join(FIXTURES, name), "rb") as f:
+                body = f.read()
+            ctype = "application/json" if name.endswith(".json") else "text/html; charset=utf-8"
+            self._send(200, body, ctype)
+
+        def _send(self, status, body, ctype):
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start(port=0, blocked=(), delay=0.0):
+    """Starts the server in a daemon thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(blocked, delay))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--block", action="append", default=[], choices=["naukri", "indeed"])
+    ap.add_argument("--delay", type=float, default=0.0, help="seconds added to every response")
+    args = ap.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args.block, args.delay))
+    print(f"Serving fixtures on http://127.0.0.1:{args.port}")
+    server.serve_forever()
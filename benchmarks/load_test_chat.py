@@ -0,0 +1,74 @@
+"""
+Concurrent load test for the chat endpoint.
+
+Fires N requests at /api/query with a fixed concurrency and reports
+throughput and latency percentiles. Run it once against the old sync
+handler (git checkout of the previous commit) and once against the
+async path to compare, using the same server flags, e.g.:
+
+    uvicorn api.main:app --workers 1
+    python benchmarks/load_test_chat.py --token <JWT> -n 200 -c 50
+
+Both runs hit Groq, so use the same query and similar time of day.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def _one(client, url, token, query, latencies, errors):
+    t0 = time.perf_counter()
+    try:
+        r = await client.post(
+            url,
+            json={"query": query},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        r.raise_for_status()
+        latencies.append(time.perf_counter() - t0)
+    except Exception as e:
+        errors.append(repr(e))
+
+
+async def run(base_url, token, query, total, concurrency, path):
+    url = base_url.rstrip("/") + path
+    latencies, errors = [], []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def bounded():
+        async with sem:
+            await _one(client, url, token, query, latencies, errors)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(bounded() for _ in range(total)))
+        elapsed = time.perf_counter() - t0
+
+    print(f"requests:    {total} (concurrency {concurrency})")
+    print(f"ok / errors: {len(latencies)} / {len(errors)}")
+    print(f"wall time:   {elapsed:.2f}s")
+    print(f"throughput:  {len(latencies) / elapsed:.2f} req/s")
+    if latencies:
+        lat = sorted(latencies)
+        print(f"latency p50: {statistics.median(lat) * 1000:.0f} ms")
+        print(f"latency p95: {lat[int(len(lat) * 0.95) - 1] * 1000:.0f} ms")
+        print(f"latency max: {lat[-1] * 1000:.0f} ms")
+    if errors:
+        print("first error:", errors[0])
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", default="http://127.0.0.1:8000")
+    ap.add_argument("--path", default="/api/query")
+    ap.add_argument("--token", required=True, help="JWT from /auth/login")
+    ap.add_argument("--query", default="Which job fits me best?")
+    ap.add_argument("-n", "--requests", type=int, default=100)
+    ap.add_argument("-c", "--concurrency", type=int, default=20)
+    args = ap.parse_args()
+
+    asyncio.run(run(args.url, args.token, args.query, args.requests, args.concurrency, args.path))
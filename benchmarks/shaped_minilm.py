@@ -0,0 +1,138 @@
+"""
+Writes a stand-in for the all-MiniLM-L6-v2 ONNX export when the real one
+can't be downloaded: same architecture and sizes (6 BERT layers, hidden
+384, 12 heads, FFN 1536, 512 position embeddings) with random weights, plus a
+WordPiece tokenizer.json over the benchmark vocabulary. Embeddings are
+meaningless, but cost per token (what the batching benchmarks measure)
+matches the real model.
+
+    python benchmarks/shaped_minilm.py /tmp/minilm-shaped
+    EMBEDDING_BACKEND=onnx EMBEDDING_ONNX_DIR=/tmp/minilm-shaped python benchmarks/bench_embed_batching.py
+"""
+import os
+import re
+import sys
+
+import numpy as np
+
+HIDDEN, HEADS, LAYERS, FFN, POSITIONS = 384, 12, 6, 1536, 512
+SPECIAL = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+
+
+def _vocab():
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from benchmarks.bench_rerank import DUTIES, SKILLS, THINGS
+
+    words = set()
+    for text in SKILLS + DUTIES + THINGS + ["job title company location salary description apply link "
+                                            "developer engineer bangalore https example com"]:
+        words.update(re.findall(r"\w+", text.lower()))
+    chars = "abcdefghijklmnopqrstuvwxyz0123456789"
+    pieces = sorted(words) + list(chars) + [f"##{c}" for c in chars] + list(".,:/-+#()&?=_")
+    return {tok: i for i, tok in enumerate(SPECIAL + pieces)}
+
+
+def write_tokenizer(path, vocab):
+    from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, processors
+
+    tok = Tokenizer(models.WordPiece(vocab, unk_token="[UNK]"))
+    tok.normalizer = normalizers.BertNormalizer(lowercase=True)
+    tok.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    tok.post_processor = processors.TemplateProcessing(
+        single="[CLS] $A [SEP]", special_tokens=[("[CLS]", vocab["[CLS]"]), ("[SEP]", vocab["[SEP]"])])
+    tok.save(str(path))
+
+
+def write_model(path, vocab_size, seed=0):
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    rng = np.random.default_rng(seed)
+    inits, nodes = [], []
+
+    def weight(name, *shape, scale=0.05):
+        inits.append(numpy_helper.from_array((rng.normal(size=shape) * scale).astype(np.float32), name))
+        return name
+
+    def const(name, value, dtype=np.int64):
+        inits.append(numpy_helper.from_array(np.array(value, dtype=dtype), name))
+        return name
+
+    def node(op, inputs, name, **attrs):
+        nodes.append(helper.make_node(op, inputs, [name], name=name, **attrs))
+        return name
+
+    def layer_norm(x, name):
+        gamma = const(f"{name}.g", np.ones(HIDDEN), np.float32)
+        beta = const(f"{name}.b", np.zeros(HIDDEN), np.float32)
+        return node("LayerNormalization", [x, gamma, beta], name, axis=-1, epsilon=1e-12)
+
+    def dense(x, n_in, n_out, name):
+        return node("Add", [node("MatMul", [x, weight(f"{name}.w", n_in, n_out)], f"{name}.mm"),
+                            weight(f"{name}.bias", n_out)], name)
+
+    head = HIDDEN // HEADS
+    heads_shape = const("heads_shape", [0, 0, HEADS, head])
+    hidden_shape = const("hidden_shape", [0, 0, HIDDEN])
+
+    # embeddings: word + position + token type
+    seq_len = node("Gather", [node("Shape", ["input_ids"], "ids_shape"), const("one", 1)], "seq_len", axis=0)
+    positions = node("Range", [const("zero", 0), seq_len, const("step", 1)], "positions")
+    x = node("Add", [node("Gather", [weight("word_emb", vocab_size, HIDDEN), "input_ids"], "words"),
+                     node("Gather", [weight("pos_emb", POSITIONS, HIDDEN), positions], "pos")], "emb_sum")
+    x = node("Add", [x, node("Gather", [weight("type_emb", 2, HIDDEN), "token_type_ids"], "types")], "emb_all")
+    x = layer_norm(x, "emb_ln")
+
+    # additive attention mask: 0 for real tokens, -10000 for padding, shape (B, 1, 1, S)
+    mask = node("Cast", ["attention_mask"], "mask_f", to=TensorProto.FLOAT)
+    mask = node("Unsqueeze", [mask, const("mask_axes", [1, 2])], "mask_4d")
+    mask = node("Mul", [node("Sub", [const("f_one", 1.0, np.float32), mask], "mask_inv"),
+                        const("neg", -10000.0, np.float32)], "mask_bias")
+
+    for i in range(LAYERS):
+        p = f"l{i}"
+
+        def split_heads(t, name):
+            return node("Transpose", [node("Reshape", [t, heads_shape], f"{name}.r")], name, perm=[0, 2, 1, 3])
+
+        q = split_heads(dense(x, HIDDEN, HIDDEN, f"{p}.q"), f"{p}.qh")
+        k = node("Transpose", [node("Reshape", [dense(x, HIDDEN, HIDDEN, f"{p}.k"), heads_shape], f"{p}.kr")],
+                 f"{p}.kh", perm=[0, 2, 3, 1])
+        v = split_heads(dense(x, HIDDEN, HIDDEN, f"{p}.v"), f"{p}.vh")
+        scores = node("Mul", [node("MatMul", [q, k], f"{p}.qk"), const(f"{p}.scale", 1 / np.sqrt(head), np.float32)],
+                      f"{p}.scaled")
+        probs = node("Softmax", [node("Add", [scores, mask], f"{p}.masked")], f"{p}.probs", axis=-1)
+        ctx = node("Transpose", [node("MatMul", [probs, v], f"{p}.ctx")], f"{p}.ctx_t", perm=[0, 2, 1, 3])
+        ctx = node("Reshape", [ctx, hidden_shape], f"{p}.ctx_r")
+        x = layer_norm(node("Add", [x, dense(ctx, HIDDEN, HIDDEN, f"{p}.o")], f"{p}.res1"), f"{p}.ln1")
+
+        h = dense(x, HIDDEN, FFN, f"{p}.ffn_in")
+        # exact GELU: 0.5 * h * (1 + erf(h / sqrt(2)))
+        erf = node("Erf", [node("Div", [h, const(f"{p}.sqrt2", np.sqrt(2.0), np.float32)], f"{p}.hs")], f"{p}.erf")
+        gelu = node("Mul", [node("Mul", [h, node("Add", [erf, "f_one"], f"{p}.erf1")], f"{p}.he"),
+                            const(f"{p}.half", 0.5, np.float32)], f"{p}.gelu")
+        x = layer_norm(node("Add", [x, dense(gelu, FFN, HIDDEN, f"{p}.ffn_out")], f"{p}.res2"), f"{p}.ln2")
+
+    nodes.append(helper.make_node("Identity", [x], ["last_hidden_state"], name="output"))
+
+    ids = [helper.make_tensor_value_info(n, TensorProto.INT64, ["batch", "seq"])
+           for n in ("input_ids", "attention_mask", "token_type_ids")]
+    out = helper.make_tensor_value_info("last_hidden_state", TensorProto.FLOAT, ["batch", "seq", HIDDEN])
+    graph = helper.make_graph(nodes, "minilm_l6_shaped", ids, [out], inits)
+    # IR 8 so older onnxruntime builds load it too
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)], ir_version=8)
+    onnx.checker.check_model(model)
+    onnx.save(model, str(path))
+
+
+def main():
+    folder = sys.argv[1] if len(sys.argv) > 1 else "minilm-shaped"
+    os.makedirs(folder, exist_ok=True)
+    vocab = _vocab()
+    write_tokenizer(os.path.join(folder, "tokenizer.json"), vocab)
+    write_model(os.path.join(folder, "model.onnx"), len(vocab))
+    print(f"wrote {folder}/model.onnx and tokenizer.json ({len(vocab)} word pieces)")
+
+
+if __name__ == "__main__":
+    main()
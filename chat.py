@@ -1,7 +1,9 @@
 import os
-from groq import Groq
+import threading
 from dotenv import load_dotenv
-from vector import retrieve_top_k
+from vector import embed_query, aembed_query, run_on_embed_pool, search_top_k, store_fingerprint
+from rag_context import build_context
+from answer_cache import answer_cache
 
 
 load_dotenv()
@@ -10,45 +12,39 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not GROQ_API_KEY:
     print("⚠ WARNING: GROQ_API_KEY not set; Groq calls will fail unless you set the env var.")
 
-client = Groq(api_key=GROQ_API_KEY)
+_client = None
+_async_client = None
+_client_lock = threading.Lock()
 
 
-def rag_answer(query: str, user_id):
-    """
-    Performs RAG:
-    1. Retrieves top job + resume chunks
-    2. Assembles context
-    3. Queries Groq LLM
-    """
-    
-    job_results, resume_results = retrieve_top_k(query, user_id, k_jobs=5, k_resume=5)
-
-    # -------- SAFETY GUARD --------
-    if not job_results and not resume_results:
-        return (
-            "I don’t have any information about you yet. "
-            "Please upload your resume or scrape jobs before asking questions."
-        )
-    # ----------------------------------------
+def get_client():
+    """Lazy Groq client: the SDK import + client setup happen on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from groq import Groq
+                _client = Groq(api_key=GROQ_API_KEY)
+    return _client
 
-    # if not job_results and not resume_results:
-    #     context = "No relevant job or resume data found in vector database."
-    else:
-        context = ""
-        for jr in job_results:
-            context += f"\n[JOB] (score={jr['score']:.3f})\n{jr['text']}\n"
 
-        for rr in resume_results:
-            context += f"\n[RESUME] (score={rr['score']:.3f})\n{rr['text']}\n"
+def get_async_client():
+    global _async_client
+    if _async_client is None:
+        with _client_lock:
+            if _async_client is None:
+                from groq import AsyncGroq
+                _async_client = AsyncGroq(api_key=GROQ_API_KEY)
+    return _async_client
 
+MODEL_NAME = "llama-3.1-8b-instant"
 
-    print("\n===== RAG CONTEXT =====")
-    print(context)
-    print("========================\n")
-
+NO_DATA_ANSWER = (
+    "I don’t have any information about you yet. "
+    "Please upload your resume or scrape jobs before asking questions."
+)
 
-
-    system_prompt = """
+SYSTEM_PROMPT = """
 You are a senior software engineer and technical recruiter.
 You MUST answer using ONLY the provided context.
 DO NOT use prior knowledge or assumptions.
@@ -57,6 +53,33 @@ If the context does not contain the answer, say:
 Give clear and practical answers.
 """
 
+
+# over-fetch job chunks so MMR has several postings to choose from
+K_JOBS = 15
+K_RESUME = 5
+
+
+def build_messages(query: str, user_id, q_emb=None):
+    """
+    Retrieval + context assembly shared by the blocking and streaming paths.
+    Returns None when the user has no jobs or resume stored yet.
+    """
+    if q_emb is None:
+        q_emb = embed_query(query)
+
+    job_results, resume_results = search_top_k(q_emb, user_id, k_jobs=K_JOBS, k_resume=K_RESUME)
+
+    # -------- SAFETY GUARD --------
+    if not job_results and not resume_results:
+        return None
+    # ----------------------------------------
+
+    context = build_context(job_results, resume_results)
+
+    print("\n===== RAG CONTEXT =====")
+    print(context)
+    print("========================\n")
+
     user_prompt = f"""
 Context:
 {context}
@@ -65,12 +88,144 @@ User Question:
 {query}
 """
 
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ]
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def _answer_from_response(response):
+    if response and response.choices:
+        return response.choices[0].message.content, True
+    return "No response from model.", False
+
+
+def rag_answer(query: str, user_id):
+    """
+    Performs RAG:
+    1. Returns a cached answer for a near-identical earlier question
+    2. Retrieves top job + resume chunks
+    3. Assembles a deduplicated, token-budgeted context
+    4. Queries Groq LLM
+    """
+    q_emb = embed_query(query)
+    fingerprint = store_fingerprint(user_id)
+
+    cached = answer_cache.get(user_id, q_emb, fingerprint)
+    if cached is not None:
+        return cached
+
+    messages = build_messages(query, user_id, q_emb)
+    if messages is None:
+        return NO_DATA_ANSWER
+
+    response = get_client().chat.completions.create(
+        model=MODEL_NAME,
+        messages=messages
+    )
+
+    answer, ok = _answer_from_response(response)
+    if ok:
+        answer_cache.put(user_id, q_emb, fingerprint, answer)
+    return answer
+
+
+def rag_answer_stream(query: str, user_id):
+    """
+    Same as rag_answer but yields the answer piece by piece
+    as Groq generates it.
+    """
+    q_emb = embed_query(query)
+    fingerprint = store_fingerprint(user_id)
+
+    cached = answer_cache.get(user_id, q_emb, fingerprint)
+    if cached is not None:
+        yield cached
+        return
+
+    messages = build_messages(query, user_id, q_emb)
+    if messages is None:
+        yield NO_DATA_ANSWER
+        return
+
+    stream = get_client().chat.completions.create(
+        model=MODEL_NAME,
+        messages=messages,
+        stream=True
+    )
+
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            yield delta
+
+    if parts:
+        answer_cache.put(user_id, q_emb, fingerprint, "".join(parts))
+
+
+# ======================================================
+# ASYNC PATH (used by the FastAPI routes)
+# ======================================================
+async def rag_answer_async(query: str, user_id):
+    """
+    Non-blocking rag_answer: query encode and retrieval (store load +
+    similarity search) run on the embedding executor, and the LLM call
+    uses AsyncGroq.
+    """
+    q_emb = await aembed_query(query)
+    fingerprint = store_fingerprint(user_id)
+
+    cached = answer_cache.get(user_id, q_emb, fingerprint)
+    if cached is not None:
+        return cached
+
+    messages = await run_on_embed_pool(build_messages, query, user_id, q_emb)
+    if messages is None:
+        return NO_DATA_ANSWER
+
+    response = await get_async_client().chat.completions.create(
+        model=MODEL_NAME,
+        messages=messages
+    )
+
+    answer, ok = _answer_from_response(response)
+    if ok:
+        answer_cache.put(user_id, q_emb, fingerprint, answer)
+    return answer
+
+
+async def rag_answer_stream_async(query: str, user_id):
+    q_emb = await aembed_query(query)
+    fingerprint = store_fingerprint(user_id)
+
+    cached = answer_cache.get(user_id, q_emb, fingerprint)
+    if cached is not None:
+        yield cached
+        return
+
+    messages = await run_on_embed_pool(build_messages, query, user_id, q_emb)
+    if messages is None:
+        yield NO_DATA_ANSWER
+        return
+
+    stream = await get_async_client().chat.completions.create(
+        model=MODEL_NAME,
+        messages=messages,
+        stream=True
     )
 
-    return response.choices[0].message.content if response and response.choices else "No response from model."
+    parts = []
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            yield delta
+
+    if parts:
+        answer_cache.put(user_id, q_emb, fingerprint, "".join(parts))
@@ -0,0 +1,112 @@
+"""
+Dependency-free text splitter for the ingest hot path.
+
+Produces exactly the same chunks as langchain's
+RecursiveCharacterTextSplitter(chunk_size, chunk_overlap) with its
+defaults (separators "\\n\\n", "\\n", " ", "", keep_separator=True,
+strip_whitespace=True, len as length function), without the langchain
+import or the per-call regex work. Parity is checked by
+benchmarks/check_splitter_parity.py.
+"""
+
+# ======================================================
+# CONFIG
+# ======================================================
+CHUNK_SIZE = 800
+CHUNK_OVERLAP = 150
+SEPARATORS = ("\n\n", "\n", " ", "")
+
+
+# ======================================================
+# INTERNALS
+# ======================================================
+def _split_keep(text: str, sep: str):
+    """str.split that keeps `sep` at the start of every piece after the first."""
+    if not sep:
+        return list(text)
+    pieces = text.split(sep)
+    splits = [pieces[0]] + [sep + p for p in pieces[1:]]
+    return [s for s in splits if s]
+
+
+def _merge(splits, chunk_size: int, chunk_overlap: int, out: list):
+    """
+    Greedily packs splits into chunks of at most chunk_size characters,
+    starting each new chunk with up to chunk_overlap characters of the
+    previous one. Splits are joined with "" (separators are kept inline).
+    """
+    start = 0       # current chunk is splits[start:i]
+    total = 0
+    for i, s in enumerate(splits):
+        n = len(s)
+        if total + n > chunk_size:
+            if i > start:
+                doc = "".join(splits[start:i]).strip()
+                if doc:
+                    out.append(doc)
+                while total > chunk_overlap or (total + n > chunk_size and total > 0):
+                    total -= len(splits[start])
+                    start += 1
+        total += n
+    doc = "".join(splits[start:]).strip()
+    if doc:
+        out.append(doc)
+
+
+def _split(text: str, separators, chunk_size: int, chunk_overlap: int, out: list):
+    separator = separators[-1]
+    rest = ()
+    for i, sep in enumerate(separators):
+        if sep == "":
+            separator = sep
+            break
+        if sep in text:
+            separator = sep
+            rest = separators[i + 1:]
+            break
+
+    good = []
+    for s in _split_keep(text, separator):
+        if len(s) < chunk_size:
+            good.append(s)
+            continue
+        if good:
+            _merge(good, chunk_size, chunk_overlap, out)
+            good = []
+        if rest:
+            _split(s, rest, chunk_size, chunk_overlap, out)
+        else:
+            out.append(s)
+    if good:
+        _merge(good, chunk_size, chunk_overlap, out)
+
+
+# ======================================================
+# PUBLIC
+# ======================================================
+def split_text(text: str, chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP):
+    if chunk_overlap > chunk_size:
+        raise ValueError("chunk_overlap must not be larger than chunk_size")
+
+    # short texts (most job postings) are a single chunk
+    if len(text) < chunk_size:
+        text = text.strip()
+        return [text] if text else []
+
+    out = []
+    _split(text, SEPARATORS, chunk_size, chunk_overlap, out)
+    return out
+
+
+def split_many(texts, chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP):
+    """
+    Splits a batch of texts in one pass.
+    Returns (chunks, owners) where owners[i] is the index of the text
+    chunks[i] came from.
+    """
+    chunks, owners = [], []
+    for idx, text in enumerate(texts):
+        parts = split_text(text, chunk_size, chunk_overlap)
+        chunks.extend(parts)
+        owners.extend([idx] * len(parts))
+    return chunks, owners
@@ -0,0 +1,231 @@
+"""
+Near-duplicate detection for scraped jobs, run by ingest before jobs are
+stored and embedded.
+
+Two jobs are the same posting when
+- their canonical links match (same job repeated across result pages), or
+- their normalized (title, company, location) keys match and their
+  descriptions aren't clearly different (a separate opening with the same
+  title), or
+- their descriptions' 64-bit SimHashes differ in at most DEDUP_SIMHASH_DISTANCE
+  bits and the companies don't disagree (same posting on Naukri and Indeed
+  with slightly different titles / location spellings).
+
+SimHash candidates are found with banded LSH: the fingerprint is split into
+DEDUP_SIMHASH_DISTANCE + 1 bands, so any pair within the distance shares at
+least one band exactly.
+
+Duplicates are merged into the first copy seen, which keeps every source
+link in extra["sources"].
+"""
+import os
+import re
+import hashlib
+
+import numpy as np
+
+from api.db import canonical_link
+
+# ======================================================
+# CONFIG
+# ======================================================
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "1").lower() in ("1", "true", "yes")
+DEDUP_SIMHASH_DISTANCE = int(os.getenv("DEDUP_SIMHASH_DISTANCE", "6"))
+# shorter descriptions (card snippets, "N/A") are too generic to compare
+DEDUP_MIN_TOKENS = int(os.getenv("DEDUP_MIN_TOKENS", "40"))
+
+SHINGLE_SIZE = 3
+# same-key jobs further apart than this are separate openings (unrelated texts: ~32 bits)
+KEY_CONFLICT_DISTANCE = 12
+
+_COMPANY_SUFFIXES = {
+    "pvt", "private", "ltd", "limited", "inc", "llp", "llc", "corp",
+    "corporation", "co", "company", "plc", "gmbh",
+}
+_LOCATION_ALIASES = {
+    "bengaluru": "bangalore", "gurugram": "gurgaon", "new delhi": "delhi",
+    "bombay": "mumbai", "calcutta": "kolkata", "madras": "chennai",
+}
+# work-mode / hiring tags sites append to titles ("Python Developer - Remote")
+_TITLE_NOISE = {"remote", "hybrid", "wfh", "onsite", "urgent", "urgently", "hiring", "immediate", "joiner", "joiners"}
+_WORD = re.compile(r"[a-z0-9+#]+")
+
+
+# ======================================================
+# KEYS
+# ======================================================
+def _words(text):
+    if not text or text == "N/A":
+        return []
+    return _WORD.findall(text.lower())
+
+
+def normalize_title(title):
+    return " ".join(w for w in _words(title) if w not in _TITLE_NOISE)
+
+
+def normalize_company(company):
+    words = _words(company)
+    while words and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def normalize_location(location):
+    """First listed place, lowercased, with common city renames folded."""
+    if not location or location == "N/A":
+        return ""
+    first = re.split(r"[,/;|(]", location, maxsplit=1)[0]
+    place = " ".join(_words(first))
+    return _LOCATION_ALIASES.get(place, place)
+
+
+def job_key(job):
+    """(title, company, location) key, or None when title or company is missing."""
+    title = normalize_title(job.get("title"))
+    company = normalize_company(job.get("company"))
+    if not title or not company:
+        return None
+    return title, company, normalize_location(job.get("location"))
+
+
+# ======================================================
+# SIMHASH
+# ======================================================
+def simhash(text):
+    """64-bit SimHash over word 3-shingles, or None for short texts."""
+    words = _words(text)
+    if len(words) < DEDUP_MIN_TOKENS:
+        return None
+
+    shingles = {}
+    for i in range(len(words) - SHINGLE_SIZE + 1):
+        sh = " ".join(words[i:i + SHINGLE_SIZE])
+        shingles[sh] = shingles.get(sh, 0) + 1
+
+    digests = b"".join(hashlib.blake2b(sh.encode("utf-8"), digest_size=8).digest() for sh in shingles)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(len(shingles), 64)
+    weights = np.fromiter(shingles.values(), dtype=np.int32, count=len(shingles))
+    # +weight where a bit is set, -weight where it isn't
+    totals = weights @ (bits.astype(np.int32) * 2 - 1)
+    return int.from_bytes(np.packbits(totals > 0).tobytes(), "big")
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def _bands(fingerprint, n_bands):
+    width = 64 // n_bands
+    for i in range(n_bands):
+        bits = 64 - width * i if i == n_bands - 1 else width
+        yield i, (fingerprint >> (width * i)) & ((1 << bits) - 1)
+
+
+# ======================================================
+# DEDUPER
+# ======================================================
+def _source_ref(job):
+    return {"source": job.get("source", "unknown"), "link": job.get("link", "N/A")}
+
+
+class JobDeduper:
+    """
+    Streaming deduper for one ingest run. add(job) returns the job when it is
+    new, or None after merging it into the canonical copy seen earlier.
+    """
+
+    def __init__(self, distance=DEDUP_SIMHASH_DISTANCE):
+        self.distance = distance
+        self.n_bands = distance + 1
+        self._by_link = {}
+        self._by_key = {}
+        self._bands = {}       # (band index, band value) -> [canonical index]
+        self._fingerprints = []  # per canonical job: fingerprints of every merged copy
+        self.canonical = []
+        self.duplicates = 0
+        # canonical jobs merged into after they were stored
+        self.stored = 0
+        self.changed = set()
+
+    def mark_stored(self):
+        """Everything returned so far has been stored; later merges are tracked in `changed`."""
+        self.stored = len(self.canonical)
+
+    def _find(self, job, link, key, fingerprint):
+        if link and link in self._by_link:
+            return self._by_link[link]
+        if key and key in self._by_key:
+            idx = self._by_key[key]
+            fps = self._fingerprints[idx]
+            if fingerprint is None or not fps or min(hamming(fingerprint, fp) for fp in fps) <= KEY_CONFLICT_DISTANCE:
+                return idx
+        if fingerprint is None:
+            return None
+
+        company = normalize_company(job.get("company"))
+        seen = set()
+        for band in _bands(fingerprint, self.n_bands):
+            for idx in self._bands.get(band, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                other = normalize_company(self.canonical[idx].get("company"))
+                if company and other and company != other:
+                    continue
+                if any(hamming(fingerprint, fp) <= self.distance for fp in self._fingerprints[idx]):
+                    return idx
+        return None
+
+    def _index(self, idx, link, key, fingerprint):
+        if link:
+            self._by_link.setdefault(link, idx)
+        if key:
+            self._by_key.setdefault(key, idx)
+        if fingerprint is not None:
+            self._fingerprints[idx].append(fingerprint)
+            for band in _bands(fingerprint, self.n_bands):
+                self._bands.setdefault(band, []).append(idx)
+
+    def add(self, job):
+        link = canonical_link(job.get("link"))
+        key = job_key(job)
+        fingerprint = simhash(job.get("description"))
+
+        idx = self._find(job, link, key, fingerprint)
+        if idx is None:
+            idx = len(self.canonical)
+            self.canonical.append(job)
+            self._fingerprints.append([])
+            self._index(idx, link, key, fingerprint)
+            return job
+
+        self._merge(idx, job)
+        self._index(idx, link, key, fingerprint)
+        self.duplicates += 1
+        return None
+
+    def _merge(self, idx, dup):
+        job = self.canonical[idx]
+        extra = job.setdefault("extra", {})
+        sources = extra.setdefault("sources", [_source_ref(job)])
+
+        ref = _source_ref(dup)
+        if ref not in sources:
+            sources.append(ref)
+
+        for field in ("company", "location", "salary"):
+            if job.get(field, "N/A") == "N/A" and dup.get(field, "N/A") != "N/A":
+                job[field] = dup[field]
+        # the description is already embedded once the job is stored
+        if idx >= self.stored and len(dup.get("description") or "") > len(job.get("description") or ""):
+            job["description"] = dup["description"]
+        for name, value in (dup.get("extra") or {}).items():
+            if name != "sources" and not extra.get(name) and value:
+                extra[name] = value
+
+        if idx < self.stored:
+            self.changed.add(idx)
+
+    def changed_jobs(self):
+        return [self.canonical[i] for i in sorted(self.changed)]
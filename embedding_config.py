@@ -0,0 +1,11 @@
+"""
+Embedding settings read by processes that haven't imported vector.py
+(numpy, text splitters, pypdf) and may never need to: the API decides on
+its start-up work before anything heavy is loaded.
+"""
+import os
+
+
+def warmup_enabled():
+    """WARMUP_EMBEDDING_MODEL=1: load + run the embedding model at process start (API, Celery worker)."""
+    return os.getenv("WARMUP_EMBEDDING_MODEL", "0").lower() in ("1", "true", "yes")
@@ -0,0 +1,143 @@
+"""
+ONNX Runtime backend for the sentence embedding model (EMBEDDING_BACKEND=onnx).
+
+Runs the ONNX export published in the model's Hugging Face repo, with the
+same pooling as the sentence-transformers pipeline of all-MiniLM-L6-v2
+(mean over real tokens, then L2 normalize). Only needs onnxruntime and
+tokenizers at run time, so torch is never imported.
+
+EMBEDDING_ONNX_QUANTIZE=1 picks the repo's dynamically quantized int8
+export instead of the fp32 one. EMBEDDING_ONNX_DIR points at a local
+folder (model.onnx + tokenizer.json) for offline images or custom exports.
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+
+# ======================================================
+# CONFIG
+# ======================================================
+EMBEDDING_ONNX_REPO = os.getenv("EMBEDDING_ONNX_REPO", "sentence-transformers/all-MiniLM-L6-v2")
+EMBEDDING_ONNX_QUANTIZE = os.getenv("EMBEDDING_ONNX_QUANTIZE", "0").lower() in ("1", "true", "yes")
+# int8 export: avx2 build runs on any recent x86; the repo also has avx512 / arm64 variants
+EMBEDDING_ONNX_FILE = os.getenv(
+    "EMBEDDING_ONNX_FILE",
+    "onnx/model_quint8_avx2.onnx" if EMBEDDING_ONNX_QUANTIZE else "onnx/model.onnx",
+)
+EMBEDDING_ONNX_DIR = os.getenv("EMBEDDING_ONNX_DIR", "")
+
+# all-MiniLM-L6-v2 truncates at 256 word pieces
+MAX_SEQ_LENGTH = 256
+
+
+# ======================================================
+# ENCODER
+# ======================================================
+class OnnxEmbedder:
+    """
+    The subset of the SentenceTransformer interface vector.py uses:
+    encode() and get_sentence_embedding_dimension().
+    """
+
+    def __init__(self, model_path, tokenizer_path, threads=0, max_seq_length=MAX_SEQ_LENGTH):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        opts.inter_op_num_threads = 1
+        if threads:
+            opts.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(str(model_path), opts, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(str(tokenizer_path))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.no_padding()
+        self.pad_id = self.tokenizer.token_to_id("[PAD]") or 0
+
+        self._dim = None
+
+    def get_sentence_embedding_dimension(self):
+        if self._dim is None:
+            self._dim = int(self.encode(["dimension probe"]).shape[1])
+        return self._dim
+
+    def tokenize(self, texts):
+        """Truncated encodings; pass them to encode_tokenized to skip re-tokenizing."""
+        return self.tokenizer.encode_batch(list(texts))
+
+    def token_lengths(self, texts):
+        """Word-piece count of each text after truncation (special tokens included)."""
+        return [len(e.ids) for e in self.tokenize(texts)]
+
+    def _run(self, encodings):
+        max_len = max(len(e.ids) for e in encodings)
+        ids = np.full((len(encodings), max_len), self.pad_id, dtype=np.int64)
+        mask = np.zeros((len(encodings), max_len), dtype=np.int64)
+        for row, e in enumerate(encodings):
+            ids[row, :len(e.ids)] = e.ids
+            mask[row, :len(e.ids)] = 1
+
+        feed = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self.input_names:
+            feed["token_type_ids"] = np.zeros_like(ids)
+        token_embs = self.session.run(None, feed)[0]
+
+        # mean pooling over real tokens, then L2 normalize (sentence-transformers Pooling + Normalize)
+        weights = mask[:, :, None].astype(np.float32)
+        pooled = (token_embs * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def encode(self, sentences, batch_size=32, show_progress_bar=False, convert_to_numpy=True, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        out = self.encode_tokenized(self.tokenize(texts), batch_size=batch_size)
+        return out[0] if single else out
+
+    def encode_tokenized(self, encodings, batch_size=32):
+        """encode() for output of tokenize(); rows come back in input order."""
+        if len(encodings) <= batch_size:
+            # one batch (e.g. a length bucket from vector.embed_texts): nothing to reorder
+            return self._run(encodings)
+
+        # batch similar lengths together so little of each batch is padding
+        order = np.argsort([len(e.ids) for e in encodings], kind="stable")
+
+        out = None
+        for start in range(0, len(encodings), batch_size):
+            idx = order[start:start + batch_size]
+            embs = self._run([encodings[i] for i in idx])
+            if out is None:
+                out = np.empty((len(encodings), embs.shape[1]), dtype=np.float32)
+            out[idx] = embs
+        return out
+
+
+# ======================================================
+# LOADING
+# ======================================================
+def _resolve_files():
+    """(model.onnx path, tokenizer.json path), downloading from the model repo if needed."""
+    if EMBEDDING_ONNX_DIR:
+        folder = Path(EMBEDDING_ONNX_DIR)
+        model = folder / Path(EMBEDDING_ONNX_FILE).name
+        if not model.exists():
+            model = folder / "model.onnx"
+        return model, folder / "tokenizer.json"
+
+    from huggingface_hub import hf_hub_download
+    model = hf_hub_download(EMBEDDING_ONNX_REPO, EMBEDDING_ONNX_FILE)
+    tokenizer = hf_hub_download(EMBEDDING_ONNX_REPO, "tokenizer.json")
+    return model, tokenizer
+
+
+def load_onnx_embedder(threads=0):
+    model_path, tokenizer_path = _resolve_files()
+    print(f"Loading ONNX embedding model {model_path} (threads={threads or 'default'})")
+    return OnnxEmbedder(model_path, tokenizer_path, threads=threads)
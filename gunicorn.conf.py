@@ -0,0 +1,63 @@
+# Multi-worker API deployment (Linux):
+#
+#     gunicorn -c gunicorn.conf.py api.main:app
+#
+# With the torch backend the embedding model is loaded ONCE in the gunicorn
+# master before it forks the workers. Every worker inherits the
+# already-loaded model and shares its weights copy-on-write, so adding
+# workers costs roughly one app's worth of Python heap each instead of
+# another full model. The ONNX backend (EMBEDDING_BACKEND=onnx) is loaded
+# in each worker after fork instead.
+#
+# The app itself is NOT preloaded: Mongo/Motor clients, the embedding
+# executor and the bcrypt pool must be created after fork, inside each worker.
+import gc
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = False
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+# embedding threads per worker (torch or ONNX Runtime); workers * threads
+# should not exceed the cores
+EMBED_THREADS_PER_WORKER = int(os.getenv("EMBED_THREADS_PER_WORKER", "1"))
+
+
+def on_starting(server):
+    # HF tokenizers' thread pool doesn't survive fork; keep it off in the master
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+    import vector
+    if vector.EMBEDDING_BACKEND == "onnx":
+        # An ORT session's thread pool doesn't survive fork, so each worker
+        # builds its own in post_fork instead of sharing the master's.
+        server.log.info("ONNX embedding backend: model is loaded per worker")
+        return
+
+    # Run the master's warm-up single-threaded so no OpenMP pool exists at fork time
+    import torch
+    torch.set_num_threads(1)
+
+    vector.warm_up()
+
+    # Move everything loaded so far out of the GC's reach: collections in the
+    # workers then don't write to (and un-share) these pages.
+    gc.collect()
+    gc.freeze()
+    server.log.info("Embedding model loaded in master (pid %s), shared with workers", os.getpid())
+
+
+def post_fork(server, worker):
+    import vector
+    if vector.EMBEDDING_BACKEND == "onnx":
+        # get_embedding_model passes this to load_onnx_embedder
+        vector.EMBEDDING_THREADS = EMBED_THREADS_PER_WORKER
+        vector.warm_up()
+        return
+
+    import torch
+    torch.set_num_threads(EMBED_THREADS_PER_WORKER)
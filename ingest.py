@@ -0,0 +1,91 @@
+import os
+import time
+import logging
+
+# ======================================================
+# CONFIG
+# ======================================================
+# jobs per Mongo upsert + embedding flush
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "10"))
+# flush a partial batch if the scraper has been slow for this long
+INGEST_FLUSH_SECONDS = float(os.getenv("INGEST_FLUSH_SECONDS", "15"))
+
+
+# ======================================================
+# PIPELINE
+# ======================================================
+def ingest_jobs(job_iter, user_id: str, batch_size=None, on_batch=None):
+    """
+    Consumes a scraper generator (iter_sources / iter_naukri / ...) and stores
+    jobs in micro-batches as they arrive: drop near-duplicates (dedup.py),
+    upsert to Mongo, then chunk + embed into the vector store. The first batch replaces the user's previous scrape
+    in the vector store, later ones are appended.
+
+    If the scraper fails midway, everything scraped so far is still stored.
+    on_batch(batch) runs after each flush (e.g. to drop cached job counts).
+
+    Returns (jobs, counts): every ingested job in scrape order (job_index in
+    the vector store points into this list) and the number scraped per
+    source, plus counts["duplicates"] merged into an earlier job.
+    """
+    from api.db import upsert_jobs
+    from vector import store_jobs
+    from dedup import DEDUP_ENABLED, JobDeduper
+
+    deduper = JobDeduper() if DEDUP_ENABLED else None
+
+    batch_size = batch_size or INGEST_BATCH_SIZE
+    jobs, batch, counts = [], [], {}
+    last_flush = time.monotonic()
+
+    def flush():
+        nonlocal batch, last_flush
+        if not batch:
+            return
+        upsert_jobs(batch, user_id)
+        store_jobs(batch, user_id, append=bool(jobs), job_index_offset=len(jobs))
+        jobs.extend(batch)
+        if deduper:
+            deduper.mark_stored()
+        if on_batch:
+            on_batch(batch)
+        logging.info("Ingested %d jobs (%d total) for %s", len(batch), len(jobs), user_id)
+        batch = []
+        last_flush = time.monotonic()
+
+    it = iter(job_iter)
+    try:
+        while True:
+            try:
+                job = next(it)
+            except StopIteration:
+                break
+            except Exception:
+                logging.exception("Scraper failed after %d jobs; keeping what was scraped",
+                                  len(jobs) + len(batch))
+                break
+
+            job["owner"] = user_id
+            source = job.get("source", "unknown")
+            counts[source] = counts.get(source, 0) + 1
+            if deduper and deduper.add(job) is None:
+                continue
+            batch.append(job)
+
+            if len(batch) >= batch_size or time.monotonic() - last_flush >= INGEST_FLUSH_SECONDS:
+                flush()
+        flush()
+
+        # already stored jobs that picked up links from later duplicates
+        if deduper and deduper.changed:
+            upsert_jobs(deduper.changed_jobs(), user_id)
+    finally:
+        # closes the browser if a flush failed mid-scrape
+        if hasattr(it, "close"):
+            it.close()
+
+    if deduper:
+        counts["duplicates"] = deduper.duplicates
+        logging.info("Merged %d duplicate jobs for %s", deduper.duplicates, user_id)
+    return jobs, counts
+
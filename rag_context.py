@@ -0,0 +1,250 @@
+import os
+import re
+import numpy as np
+
+# ======================================================
+# CONFIG
+# ======================================================
+CONTEXT_TOKEN_BUDGET = int(os.getenv("RAG_CONTEXT_TOKENS", "1800"))
+RESUME_BUDGET_SHARE = 0.35     # part of the budget reserved for resume chunks
+MAX_CONTEXT_JOBS = 5
+MMR_LAMBDA = 0.7               # 1.0 = pure relevance, 0.0 = pure diversity
+
+MIN_OVERLAP = 20               # shortest suffix/prefix run treated as splitter overlap
+MAX_OVERLAP = 200              # splitter uses chunk_overlap=150
+
+
+# ======================================================
+# TOKEN COUNTING
+# ======================================================
+_encoder = None
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def _get_encoder():
+    """
+    Lazy-load tiktoken if available. Falls back to a regex
+    estimate when the package (or its BPE file) is missing.
+    """
+    global _encoder
+    if _encoder is None:
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoder = False
+    return _encoder
+
+
+def count_tokens(text: str) -> int:
+    enc = _get_encoder()
+    if enc:
+        return len(enc.encode_ordinary(text))
+    return len(_TOKEN_RE.findall(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return ""
+
+    enc = _get_encoder()
+    if enc:
+        ids = enc.encode_ordinary(text)
+        if len(ids) <= max_tokens:
+            return text
+        return enc.decode(ids[:max_tokens]).rstrip() + " ..."
+
+    matches = list(_TOKEN_RE.finditer(text))
+    if len(matches) <= max_tokens:
+        return text
+    return text[:matches[max_tokens - 1].end()].rstrip() + " ..."
+
+
+# ======================================================
+# CHUNK MERGING / DEDUP
+# ======================================================
+def _normalize(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def merge_overlap(a: str, b: str) -> str:
+    """
+    Join two neighbouring chunks, dropping the text the splitter
+    duplicated between the end of `a` and the start of `b`.
+    """
+    if not a:
+        return b
+    if not b:
+        return a
+
+    head = b[:MIN_OVERLAP]
+    start = max(0, len(a) - MAX_OVERLAP)
+    best = 0
+
+    pos = a.find(head, start)
+    while pos != -1:
+        k = len(a) - pos
+        if k <= len(b) and b.startswith(a[pos:]):
+            best = k
+            break          # first hit from the left is the longest overlap
+        pos = a.find(head, pos + 1)
+
+    if best:
+        return a + b[best:]
+    return a + "\n" + b
+
+
+def _merge_group(chunks):
+    """
+    chunks: list of (chunk_index, text) for one job / resume.
+    Adjacent chunks are stitched together, gaps are marked with '...'.
+    """
+    chunks = sorted(chunks, key=lambda c: c[0])
+    parts = []
+    prev_idx = None
+
+    for idx, text in chunks:
+        if parts and prev_idx is not None and idx == prev_idx + 1:
+            parts[-1] = merge_overlap(parts[-1], text)
+        else:
+            parts.append(text)
+        prev_idx = idx
+
+    return "\n...\n".join(parts)
+
+
+def _dedup_results(results):
+    """Drop chunks whose text was already seen (same posting scraped twice, boilerplate)."""
+    seen = set()
+    out = []
+    for r in results:
+        key = _normalize(r["text"])
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(r)
+    return out
+
+
+# ======================================================
+# MMR ACROSS JOBS
+# ======================================================
+def _group_jobs(job_results):
+    groups = {}
+    for r in job_results:
+        meta = r.get("meta", {})
+        key = meta.get("job_index", meta.get("source"))
+        g = groups.setdefault(key, {"chunks": [], "embs": [], "score": 0.0})
+        g["chunks"].append((meta.get("chunk_index", len(g["chunks"])), r["text"]))
+        if r.get("emb") is not None:
+            g["embs"].append(r["emb"])
+        g["score"] = max(g["score"], r["score"])
+    return list(groups.values())
+
+
+def mmr_select(groups, k=MAX_CONTEXT_JOBS, lam=MMR_LAMBDA):
+    """
+    Maximal Marginal Relevance over job groups: prefer relevant jobs
+    but penalise ones that look like a job we already picked.
+    """
+    if not groups:
+        return []
+
+    vecs = []
+    for g in groups:
+        if g["embs"]:
+            v = np.mean(np.asarray(g["embs"], dtype=np.float32), axis=0)
+            n = np.linalg.norm(v)
+            vecs.append(v / n if n else v)
+        else:
+            vecs.append(None)
+
+    remaining = list(range(len(groups)))
+    selected = []
+
+    while remaining and len(selected) < k:
+        best_i, best_val = None, -np.inf
+        for i in remaining:
+            redundancy = 0.0
+            if vecs[i] is not None:
+                for j in selected:
+                    if vecs[j] is not None:
+                        redundancy = max(redundancy, float(vecs[i] @ vecs[j]))
+            val = lam * groups[i]["score"] - (1 - lam) * redundancy
+            if val > best_val:
+                best_i, best_val = i, val
+        selected.append(best_i)
+        remaining.remove(best_i)
+
+    return [groups[i] for i in selected]
+
+
+# ======================================================
+# CONTEXT BUILDER
+# ======================================================
+def _add_blocks(blocks, budget):
+    """
+    blocks: list of (header, text). Splits the token budget across
+    blocks (water-filling: short blocks keep their full size, long
+    ones share what is left) and truncates blocks that don't fit.
+    Returns (context_parts, tokens_used).
+    """
+    costs = [count_tokens(h) + count_tokens(t) for h, t in blocks]
+
+    alloc = [0] * len(blocks)
+    remaining = budget
+    order = sorted(range(len(blocks)), key=lambda i: costs[i])
+    for n, i in enumerate(order):
+        share = remaining // (len(order) - n)
+        alloc[i] = min(costs[i], share)
+        remaining -= alloc[i]
+
+    parts = []
+    used = 0
+    for (header, text), cost, room in zip(blocks, costs, alloc):
+        if room >= cost:
+            parts.append(f"\n{header}\n{text}\n")
+            used += cost
+            continue
+
+        text_room = room - count_tokens(header)
+        if text_room < 50:
+            continue
+        parts.append(f"\n{header}\n{truncate_to_tokens(text, text_room)}\n")
+        used += room
+    return parts, used
+
+
+def build_context(job_results, resume_results, token_budget=CONTEXT_TOKEN_BUDGET,
+                  max_jobs=MAX_CONTEXT_JOBS):
+    """
+    Turns raw retrieval hits into a compact prompt context:
+    1. Drops duplicate chunk texts
+    2. Merges adjacent chunks of the same job / resume (removing splitter overlap)
+    3. Picks diverse jobs with MMR
+    4. Fits everything into `token_budget`
+    """
+    job_groups = mmr_select(_group_jobs(_dedup_results(job_results)), k=max_jobs)
+
+    resume_results = _dedup_results(resume_results)
+    resume_text = ""
+    resume_score = 0.0
+    if resume_results:
+        resume_text = _merge_group([
+            (r.get("meta", {}).get("chunk_index", i), r["text"])
+            for i, r in enumerate(resume_results)
+        ])
+        resume_score = max(r["score"] for r in resume_results)
+
+    resume_budget = int(token_budget * RESUME_BUDGET_SHARE) if job_groups else token_budget
+    resume_parts, resume_used = _add_blocks(
+        [(f"[RESUME] (score={resume_score:.3f})", resume_text)] if resume_text else [],
+        resume_budget
+    )
+
+    job_parts, _ = _add_blocks(
+        [(f"[JOB] (score={g['score']:.3f})", _merge_group(g["chunks"])) for g in job_groups],
+        token_budget - resume_used
+    )
+
+    return "".join(job_parts + resume_parts)
@@ -0,0 +1,145 @@
+"""
+Second-stage re-ranking of job <-> resume matches.
+
+worker_similarity shortlists jobs by max chunk cosine; the top RERANK_TOP_N
+of those are re-scored with a small cross-encoder that reads the best
+resume chunk and the best job chunk together. Scores are relevance
+probabilities in [0, 1] (sigmoid of the ms-marco logit) and are cached per
+(resume version, job) so re-runs only score new postings.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# ======================================================
+# CONFIG
+# ======================================================
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "0").lower() in ("1", "true", "yes")
+RERANK_MODEL = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+RERANK_TOP_N = int(os.getenv("RERANK_TOP_N", "30"))
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "16"))
+# re-ranked jobs below this score are dropped from the matches
+RERANK_THRESHOLD = float(os.getenv("RERANK_THRESHOLD", "0.5"))
+RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "20000"))
+# cross-encoder input limit is 512 tokens for both texts together
+RERANK_MAX_LENGTH = 512
+
+
+_rerank_model = None
+_model_lock = threading.Lock()
+
+
+def get_rerank_model():
+    """Lazy-load the cross-encoder (CPU) on first use."""
+    global _rerank_model
+    if _rerank_model is None:
+        with _model_lock:
+            if _rerank_model is None:
+                import torch
+                from sentence_transformers import CrossEncoder
+                # predict() returns raw logits whatever the model config says;
+                # score_pairs applies the sigmoid itself
+                _rerank_model = CrossEncoder(
+                    RERANK_MODEL, max_length=RERANK_MAX_LENGTH, device="cpu",
+                    default_activation_function=torch.nn.Identity(),
+                )
+    return _rerank_model
+
+
+# ======================================================
+# SCORE CACHE
+# ======================================================
+# (resume hash, job key) -> score, LRU ordered
+_score_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def cache_stats():
+    with _cache_lock:
+        return {**_cache_stats, "size": len(_score_cache)}
+
+
+def _cache_get_many(keys):
+    with _cache_lock:
+        found = {}
+        for key in keys:
+            score = _score_cache.get(key)
+            if score is not None:
+                _score_cache.move_to_end(key)
+                found[key] = score
+        _cache_stats["hits"] += len(found)
+        _cache_stats["misses"] += len(keys) - len(found)
+        return found
+
+
+def _cache_put_many(scored):
+    with _cache_lock:
+        for key, score in scored.items():
+            _score_cache[key] = score
+            _score_cache.move_to_end(key)
+        while len(_score_cache) > RERANK_CACHE_SIZE:
+            _score_cache.popitem(last=False)
+
+
+# ======================================================
+# SCORING
+# ======================================================
+def score_pairs(pairs, keys):
+    """
+    Relevance probabilities (sigmoid of the cross-encoder logit) for
+    (resume text, job text) pairs. keys[i] is the cache key of pairs[i];
+    only uncached pairs reach the model, in batches of RERANK_BATCH_SIZE.
+    """
+    cached = _cache_get_many(keys)
+    todo = [i for i, key in enumerate(keys) if key not in cached]
+
+    if todo:
+        model = get_rerank_model()
+        new_scores = model.predict(
+            [pairs[i] for i in todo],
+            batch_size=RERANK_BATCH_SIZE,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+        )
+        logits = np.asarray(new_scores, dtype=np.float64).reshape(-1)
+        probs = 1.0 / (1.0 + np.exp(-logits))
+        fresh = {keys[i]: float(p) for i, p in zip(todo, probs)}
+        _cache_put_many(fresh)
+        cached.update(fresh)
+
+    return np.array([cached[key] for key in keys], dtype=np.float32)
+
+
+def rerank_matches(candidates, top_n=None, threshold=None):
+    """
+    candidates: dicts from the vector stage with "score", "resume_text",
+    "job_text" and "cache_key". The top_n by vector score are re-scored;
+    returns those at or above threshold, best first, with the cross-encoder
+    score as "score" and the cosine kept as "vector_score".
+    """
+    top_n = RERANK_TOP_N if top_n is None else top_n
+    threshold = RERANK_THRESHOLD if threshold is None else threshold
+
+    shortlist = sorted(candidates, key=lambda c: c["score"], reverse=True)[:top_n]
+    if not shortlist:
+        return []
+
+    scores = score_pairs(
+        [(c["resume_text"], c["job_text"]) for c in shortlist],
+        [c["cache_key"] for c in shortlist],
+    )
+
+    results = []
+    for c, score in zip(shortlist, scores):
+        if score < threshold:
+            continue
+        results.append({
+            "job_index": c["job_index"],
+            "score": float(score),
+            "vector_score": c["score"],
+        })
+    results.sort(key=lambda r: r["score"], reverse=True)
+    return results
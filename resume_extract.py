@@ -0,0 +1,105 @@
+import os
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+
+# ======================================================
+# CONFIG
+# ======================================================
+# "auto" uses PyMuPDF when installed and falls back to pypdf
+PDF_BACKEND = os.getenv("RESUME_PDF_BACKEND", "auto").lower()
+# pypdf documents with at least this many pages are extracted in parallel
+# (PyMuPDF is fast enough that process start-up would dominate)
+PARALLEL_MIN_PAGES = int(os.getenv("RESUME_PARALLEL_MIN_PAGES", "16"))
+PARALLEL_WORKERS = int(os.getenv("RESUME_PARALLEL_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+def _resolve_backend(backend=None):
+    backend = (backend or PDF_BACKEND).lower()
+    if backend in ("auto", "pymupdf"):
+        try:
+            import fitz  # noqa: F401  (PyMuPDF)
+            return "pymupdf"
+        except ImportError:
+            if backend == "pymupdf":
+                print("PyMuPDF not installed, falling back to pypdf.")
+    return "pypdf"
+
+
+# ======================================================
+# BACKENDS
+# ======================================================
+def _page_count(pdf_bytes: bytes, backend: str) -> int:
+    if backend == "pymupdf":
+        import fitz
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            return doc.page_count
+
+    from pypdf import PdfReader
+    return len(PdfReader(BytesIO(pdf_bytes)).pages)
+
+
+def _extract_page_range(pdf_bytes: bytes, backend: str, start: int, end: int):
+    """
+    Extract text for pages [start, end). Top-level so it can run in a
+    worker process; each call opens its own document handle.
+    """
+    texts = []
+
+    if backend == "pymupdf":
+        import fitz
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            for i in range(start, end):
+                try:
+                    texts.append(doc.load_page(i).get_text() or "")
+                except Exception:
+                    texts.append("")
+        return texts
+
+    from pypdf import PdfReader
+    reader = PdfReader(BytesIO(pdf_bytes))
+    for i in range(start, end):
+        try:
+            texts.append(reader.pages[i].extract_text() or "")
+        except Exception:
+            texts.append("")
+    return texts
+
+
+def _extract_parallel(pdf_bytes: bytes, backend: str, n_pages: int):
+    workers = max(1, min(PARALLEL_WORKERS, n_pages))
+    step = (n_pages + workers - 1) // workers
+    ranges = [(s, min(s + step, n_pages)) for s in range(0, n_pages, step)]
+
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        futures = [pool.submit(_extract_page_range, pdf_bytes, backend, s, e) for s, e in ranges]
+        pages = []
+        for f in futures:
+            pages.extend(f.result())
+    return pages
+
+
+# ======================================================
+# PUBLIC
+# ======================================================
+def extract_pdf_text(pdf_bytes: bytes, backend=None) -> str:
+    """
+    Extract the full text of a PDF given its bytes.
+    Long documents on the pypdf backend are split into page ranges and
+    extracted in parallel processes; short ones (typical resumes) and
+    PyMuPDF stay in-process.
+    """
+    backend = _resolve_backend(backend)
+    n_pages = _page_count(pdf_bytes, backend)
+
+    pages_text = None
+    if backend == "pypdf" and n_pages >= PARALLEL_MIN_PAGES and PARALLEL_WORKERS > 1:
+        try:
+            pages_text = _extract_parallel(pdf_bytes, backend, n_pages)
+        except Exception as e:
+            # e.g. inside a daemonic Celery pool process, which can't fork children
+            print("Parallel PDF extraction unavailable, extracting sequentially:", e)
+
+    if pages_text is None:
+        pages_text = _extract_page_range(pdf_bytes, backend, 0, n_pages)
+
+    return "\n".join(pages_text).strip()
@@ -162,12 +162,50 @@ import time
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+import logging
+from scrape_sites import SITES, detail_cache, parse_cards, parse_description
+from scrape_http import SCRAPE_MODE, Blocked, iter_indeed_http
+from scrape_limits import acquire, circuit_open, domain_of, record_result, report
 
+# upper bounds for explicit waits (they return as soon as the element is there)
+PAGE_WAIT_SECONDS = 10
+DETAIL_WAIT_SECONDS = 8
 
-def scrape_indeed(job, location, max_pages=1):
+
+def iter_indeed(job, location, max_pages=1, mode=None):
+    """
+    Scrape Indeed India job listings, yielding each job as it is scraped.
+    mode works as in scrape_naukri.iter_naukri: plain HTTP first ("auto"),
+    HTTP only ("http") or the browser only ("browser"), all rate limited
+    per domain by scrape_limits.
+    """
+    mode = (mode or SCRAPE_MODE).lower()
+    start_page = 0
+
+    if circuit_open("indeed"):
+        logging.warning("Indeed is paused by its circuit breaker; skipping.")
+        return
+
+    if mode in ("auto", "http"):
+        try:
+            yield from iter_indeed_http(job, location, max_pages=max_pages)
+            return
+        except Blocked as e:
+            if mode == "http" or circuit_open("indeed"):
+                logging.warning("Indeed HTTP scrape blocked: %s", e)
+                return
+            logging.warning("Indeed HTTP scrape blocked (%s); using the browser from page %d", e, e.page + 1)
+            start_page = e.page
+
+    yield from _iter_indeed_browser(job, location, max_pages, start_page)
+
+
+def _iter_indeed_browser(job, location, max_pages, start_page=0):
     """
-    Scrape Indeed India job listings.
+    Selenium path.
     Shadow DOM REMOVED.
     Uses stable <a class="tapItem"> job cards.
     """
@@ -193,85 +231,63 @@ def scrape_indeed(job, location, max_pages=1):
     )
 
     driver = webdriver.Chrome(options=chrome_options)
+    try:
+        yield from _iter_indeed_pages(driver, job, location, max_pages, start_page)
+    finally:
+        driver.quit()
+
+
+def scrape_indeed(job, location, max_pages=1, mode=None):
+    """Same as iter_indeed, collected into a list."""
+    return list(iter_indeed(job, location, max_pages=max_pages, mode=mode))
 
-    results = []
 
+def _iter_indeed_pages(driver, job, location, max_pages, start_page=0):
     base_url = f"https://in.indeed.com/jobs?q={job}&l={location}"
 
-    for page in range(max_pages):
+    for page in range(start_page, max_pages):
         start = page * 10
         url = f"{base_url}&start={start}"
 
         print(f"\nScraping page {page + 1}: {url}")
 
+        acquire(domain_of(url))
+        started = time.monotonic()
         driver.get(url)
-        time.sleep(3)
+
+        # wait for the job cards instead of a fixed sleep
+        try:
+            WebDriverWait(driver, PAGE_WAIT_SECONDS).until(EC.presence_of_element_located(
+                (By.CSS_SELECTOR, ", ".join(SITES["indeed"]["cards"]))))
+        except TimeoutException:
+            pass
+        elapsed = time.monotonic() - started
 
         # Scroll to trigger lazy loading
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
 
         # ==============================
         # JOB CARDS (NO SHADOW DOM)
         # ==============================
-        job_cards = driver.find_elements(By.CSS_SELECTOR, "a.tapItem")
+        # parsed once from page_source (selectors: scrape_sites.SITES["indeed"])
+        jobs = parse_cards("indeed", driver.page_source)
 
-        if not job_cards:
+        if not jobs:
             print("WARNING!!! No job cards found. Indeed likely blocked.")
+            report(domain_of(url), "blocked", elapsed)
+            record_result("indeed", False)
+            if circuit_open("indeed"):
+                break
             continue
+        report(domain_of(url), "ok", elapsed)
+        record_result("indeed", True)
 
-        for card in job_cards:
-            soup = BeautifulSoup(card.get_attribute("innerHTML"), "html.parser")
-
-            # ------------------------------
-            # TITLE
-            # ------------------------------
-            title_tag = soup.select_one("h2.jobTitle span")
-            title = title_tag.text.strip() if title_tag else "N/A"
-
-            # ------------------------------
-            # COMPANY
-            # ------------------------------
-            company_tag = soup.select_one("span.companyName")
-            company = company_tag.text.strip() if company_tag else "N/A"
-
-            # ------------------------------
-            # LOCATION
-            # ------------------------------
-            loc_tag = soup.select_one("div.companyLocation")
-            loc = loc_tag.text.strip() if loc_tag else "N/A"
-
-            # ------------------------------
-            # SALARY
-            # ------------------------------
-            salary_tag = soup.select_one("div.salary-snippet")
-            salary = salary_tag.text.strip() if salary_tag else "N/A"
-
-            # ------------------------------
-            # JOB LINK (IMPORTANT FIX)
-            # ------------------------------
-            link = card.get_attribute("href")
-            if link and not link.startswith("http"):
-                link = "https://in.indeed.com" + link
-
+        for item in jobs:
             # ------------------------------
             # JOB DESCRIPTION
             # ------------------------------
-            description = scrape_description(driver, link)
-
-            results.append({
-                "title": title or "N/A",
-                "company": company or "N/A",
-                "location": loc or "N/A",
-                "salary": salary or "N/A",
-                "description": description or "N/A",
-                "link": link or "N/A",
-                "source": "indeed",
-                "extra": {}
-            })
-
-    driver.quit()
-    return results
+            item["description"] = scrape_description(driver, item["link"]) or "N/A"
+            yield item
 
 
 def scrape_description(driver, link):
@@ -282,24 +298,32 @@ def scrape_description(driver, link):
     if not link or link == "N/A":
         return "N/A"
 
+    cached = detail_cache.get(link)
+    if cached is not None:
+        return cached
+
     try:
         driver.execute_script("window.open('');")
         driver.switch_to.window(driver.window_handles[-1])
 
+        acquire(domain_of(link))
         driver.get(link)
-        time.sleep(3)
+        try:
+            WebDriverWait(driver, DETAIL_WAIT_SECONDS).until(EC.presence_of_element_located(
+                (By.CSS_SELECTOR, ", ".join(SITES["indeed"]["description"]))))
+        except TimeoutException:
+            pass
 
-        desc_elem = driver.find_elements(By.CSS_SELECTOR, "#jobDescriptionText")
+        text = parse_description("indeed", driver.page_source)
 
-        if desc_elem:
-            text = desc_elem[0].text.strip()
-        else:
+        if not text:
             # fallback
             text = driver.find_element(By.TAG_NAME, "body").text[:500]
 
         driver.close()
         driver.switch_to.window(driver.window_handles[0])
 
+        detail_cache.put(link, text)
         return text
 
     except Exception:
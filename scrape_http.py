@@ -0,0 +1,330 @@
+import os
+import re
+import json
+import logging
+import time
+import threading
+from urllib.parse import urljoin, quote_plus, urlencode
+
+import httpx
+from lxml import html as lxml_html
+from scrape_sites import clean, html_to_text, make_job, parse_cards, parse_description
+from scrape_limits import MAX_RETRIES, acquire, backoff_delay, domain_of, record_result, report
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+# ======================================================
+# CONFIG
+# ======================================================
+# "auto": HTTP first, browser when blocked | "http": never start Chrome | "browser": Selenium only
+SCRAPE_MODE = os.getenv("SCRAPE_MODE", "auto").lower()
+
+# overridable so the scrapers can run against a local fixture server
+NAUKRI_BASE_URL = os.getenv("NAUKRI_BASE_URL", "https://www.naukri.com").rstrip("/")
+INDEED_BASE_URL = os.getenv("INDEED_BASE_URL", "https://in.indeed.com").rstrip("/")
+
+SCRAPE_HTTP2 = os.getenv("SCRAPE_HTTP2", "1").lower() in ("1", "true", "yes")
+SCRAPE_HTTP_TIMEOUT = float(os.getenv("SCRAPE_HTTP_TIMEOUT", "15"))
+SCRAPE_HTTP_MAX_CONNECTIONS = int(os.getenv("SCRAPE_HTTP_MAX_CONNECTIONS", "10"))
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+              "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+BLOCK_STATUS = {401, 403, 429, 503}
+# retried with backoff before giving up (429/503 then count as blocked)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+BLOCK_MARKERS = ("g-recaptcha", "h-captcha", "cf-chl", "challenge-platform", "Access Denied")
+
+
+class Blocked(Exception):
+    """The site refused the plain HTTP request or served nothing parseable."""
+
+    def __init__(self, message, page=0):
+        super().__init__(message)
+        self.page = page
+
+
+# ======================================================
+# HTTP CLIENT
+# ======================================================
+_client = None
+_client_lock = threading.Lock()
+
+
+def _http2_available():
+    if not SCRAPE_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_http_client():
+    """One pooled keep-alive client per process (HTTP/2 when `h2` is installed)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    http2=_http2_available(),
+                    timeout=SCRAPE_HTTP_TIMEOUT,
+                    follow_redirects=True,
+                    limits=httpx.Limits(
+                        max_connections=SCRAPE_HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=SCRAPE_HTTP_MAX_CONNECTIONS,
+                    ),
+                    headers={
+                        "User-Agent": USER_AGENT,
+                        "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+                        "Accept-Language": "en-IN,en;q=0.9",
+                    },
+                )
+    return _client
+
+
+def _retry_after(resp):
+    try:
+        return float(resp.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+def fetch(url, headers=None):
+    """
+    GET url through the per-domain rate limiter and return the body text.
+    Timeouts and 429/5xx are retried with jittered backoff; raises Blocked
+    on refusals / captcha pages.
+    """
+    domain = domain_of(url)
+
+    for attempt in range(MAX_RETRIES + 1):
+        acquire(domain)
+        started = time.monotonic()
+        try:
+            resp = get_http_client().get(url, headers=headers)
+        except httpx.TransportError as e:
+            report(domain, "error")
+            if attempt == MAX_RETRIES:
+                raise
+            logging.warning("Request to %s failed (%s); retrying", url, e)
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        elapsed = time.monotonic() - started
+        if resp.status_code in RETRY_STATUS and attempt < MAX_RETRIES:
+            report(domain, "blocked" if resp.status_code in BLOCK_STATUS else "error", elapsed)
+            time.sleep(backoff_delay(attempt, _retry_after(resp)))
+            continue
+        if resp.status_code in BLOCK_STATUS:
+            report(domain, "blocked", elapsed)
+            raise Blocked(f"HTTP {resp.status_code} for {url}")
+        if resp.status_code >= 500:
+            report(domain, "error", elapsed)
+        resp.raise_for_status()
+
+        text = resp.text
+        if any(marker in text for marker in BLOCK_MARKERS):
+            report(domain, "blocked", elapsed)
+            raise Blocked(f"challenge page served for {url}")
+
+        report(domain, "ok", elapsed)
+        return text
+
+
+# ======================================================
+# DETAIL PAGES
+# ======================================================
+def _json_ld_job_posting(doc):
+    for script in doc.cssselect('script[type="application/ld+json"]'):
+        try:
+            data = json.loads(script.text or "")
+        except ValueError:
+            continue
+        for item in data if isinstance(data, list) else [data]:
+            if isinstance(item, dict) and item.get("@type") == "JobPosting":
+                return item
+    return None
+
+
+def parse_job_detail(page_html, site):
+    """
+    Description from a job detail page: the JSON-LD JobPosting when
+    present, else the site's description selectors (scrape_sites.SITES).
+    """
+    doc = lxml_html.fromstring(page_html)
+
+    posting = _json_ld_job_posting(doc)
+    if posting and posting.get("description"):
+        return html_to_text(posting["description"])
+    return parse_description(site, doc)
+
+
+def _fetch_description(link, site):
+    """Detail-page description, or None; caching is up to the caller (JobSource pipeline)."""
+    try:
+        return parse_job_detail(fetch(link), site)
+    except Blocked as e:
+        record_result(site, False)
+        logging.warning("Unable to fetch description for %s: %s", link, e)
+        return None
+    except Exception as e:
+        # the listing data is still useful without the full description
+        logging.warning("Unable to fetch description for %s: %s", link, e)
+        return None
+
+
+# ======================================================
+# NAUKRI
+# ======================================================
+def parse_naukri_listing(page_html, base_url=None):
+    """Job dicts from a server-rendered Naukri search page (card description only)."""
+    return parse_cards("naukri", page_html, base_url or NAUKRI_BASE_URL)
+
+
+def parse_naukri_search_json(data, base_url=None):
+    """Job dicts from Naukri's search API payload (what its SPA renders from)."""
+    base_url = base_url or NAUKRI_BASE_URL
+    jobs = []
+    for item in data.get("jobDetails") or []:
+        placeholders = {p.get("type"): p.get("label") for p in item.get("placeholders") or []}
+        card_description = html_to_text(item.get("jobDescription"))
+        link = item.get("jdURL")
+
+        jobs.append(make_job(
+            "naukri",
+            title=clean(item.get("title")),
+            company=clean(item.get("companyName")),
+            location=placeholders.get("location"),
+            salary=placeholders.get("salary"),
+            description=card_description,
+            link=urljoin(base_url, link) if link else None,
+            extra={
+                "experience": placeholders.get("experience"),
+                "tags": [t for t in (item.get("tagsAndSkills") or "").split(",") if t],
+                "post_date": item.get("footerPlaceholderLabel"),
+                "card_description": card_description,
+            },
+        ))
+    return jobs
+
+
+def _naukri_api_page(job, location, page_num):
+    keyword = job.replace("+", " ")
+    params = {
+        "noOfResults": 20, "urlType": "search_by_keyword", "searchType": "adv",
+        "keyword": keyword, "location": location, "pageNo": page_num,
+    }
+    body = fetch(f"{NAUKRI_BASE_URL}/jobapi/v3/search?{urlencode(params)}",
+                 headers={"appid": "109", "systemid": "Naukri", "Accept": "application/json"})
+    try:
+        return parse_naukri_search_json(json.loads(body))
+    except ValueError:
+        return []
+
+
+def naukri_pages(job, location="", max_pages=1, start_page=0):
+    """
+    One list of card-level job dicts per Naukri result page: listing HTML,
+    or the search API JSON when the HTML has no cards. Raises
+    Blocked(page=...) so the caller can continue in a browser.
+    """
+    q = quote_plus(job.replace(" ", "-"))
+    if location:
+        loc = quote_plus(location.replace(" ", "-"))
+        start_url = f"{NAUKRI_BASE_URL}/{q}-jobs-in-{loc}"
+    else:
+        start_url = f"{NAUKRI_BASE_URL}/{q}-jobs"
+
+    for page in range(start_page, max_pages):
+        page_num = page + 1
+        url = f"{start_url}?p={page_num}"
+        logging.info("Fetching Naukri page %d over HTTP: %s", page_num, url)
+
+        try:
+            jobs = parse_naukri_listing(fetch(url)) or _naukri_api_page(job, location, page_num)
+        except Blocked as e:
+            record_result("naukri", False)
+            raise Blocked(str(e), page=page)
+        if not jobs:
+            record_result("naukri", False)
+            raise Blocked(f"no Naukri jobs parsed from {url}", page=page)
+        record_result("naukri", True)
+        yield jobs
+
+
+def iter_naukri_http(job, location="", max_pages=1, start_page=0, fetch_details=True):
+    """
+    HTTP version of scrape_naukri.iter_naukri: the naukri JobSource pipeline
+    (naukri_pages -> cached detail pages -> make_job) over one pooled client.
+    Raises Blocked(page=...) like naukri_pages.
+    """
+    from scrape_sources import get_source
+    return get_source("naukri").pipeline(job, location, max_pages, start_page, fetch_details)
+
+
+# ======================================================
+# INDEED
+# ======================================================
+_INDEED_JOBCARDS_JSON = re.compile(r'window\.mosaic\.providerData\["mosaic-provider-jobcards"\]\s*=\s*')
+
+
+def _indeed_embedded_results(page_html):
+    m = _INDEED_JOBCARDS_JSON.search(page_html)
+    if not m:
+        return None
+    try:
+        data, _ = json.JSONDecoder().raw_decode(page_html, m.end())
+        return data["metaData"]["mosaicProviderJobCardsModel"]["results"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def parse_indeed_listing(page_html, base_url=None):
+    """Job dicts from an Indeed search page: embedded job-card JSON, else the tapItem cards."""
+    base_url = base_url or INDEED_BASE_URL
+
+    results = _indeed_embedded_results(page_html)
+    if results:
+        return [
+            make_job(
+                "indeed",
+                title=clean(r.get("displayTitle") or r.get("title")),
+                company=clean(r.get("company")),
+                location=clean(r.get("formattedLocation")),
+                salary=clean((r.get("salarySnippet") or {}).get("text")),
+                description=html_to_text(r.get("snippet")),
+                link=f"{base_url}/viewjob?jk={r['jobkey']}" if r.get("jobkey") else None,
+                extra={"post_date": r.get("formattedRelativeTime")},
+            )
+            for r in results
+        ]
+
+    return parse_cards("indeed", page_html, base_url)
+
+
+def indeed_pages(job, location, max_pages=1, start_page=0):
+    """One list of card-level job dicts per Indeed result page; raises Blocked(page=...) like naukri_pages."""
+    base_url = f"{INDEED_BASE_URL}/jobs?q={job}&l={location}"
+
+    for page in range(start_page, max_pages):
+        url = f"{base_url}&start={page * 10}"
+        logging.info("Fetching Indeed page %d over HTTP: %s", page + 1, url)
+
+        try:
+            jobs = parse_indeed_listing(fetch(url))
+        except Blocked as e:
+            record_result("indeed", False)
+            raise Blocked(str(e), page=page)
+        if not jobs:
+            record_result("indeed", False)
+            raise Blocked(f"no Indeed jobs parsed from {url}", page=page)
+        record_result("indeed", True)
+        yield jobs
+
+
+def iter_indeed_http(job, location, max_pages=1, start_page=0, fetch_details=True):
+    """HTTP version of scrape.iter_indeed, through the indeed JobSource pipeline like iter_naukri_http."""
+    from scrape_sources import get_source
+    return get_source("indeed").pipeline(job, location, max_pages, start_page, fetch_details)
@@ -0,0 +1,242 @@
+"""
+Politeness controls shared by every scraper request:
+
+- a token bucket per domain whose refill rate adapts to the site:
+  halved on block signals (403/429/captcha), slowly reduced while
+  responses get slow, slowly raised again while requests succeed;
+- exponential backoff with full jitter for retries;
+- a circuit breaker per source that stops scraping a site for a
+  cool-down after repeated failures.
+
+State lives in Redis (the Celery broker) so all workers share one budget
+per domain. When Redis is unreachable the same logic runs in-process.
+"""
+import os
+import time
+import random
+import logging
+import threading
+from urllib.parse import urlsplit
+
+# ======================================================
+# CONFIG
+# ======================================================
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+SCRAPE_LIMITS_REDIS_URL = os.getenv("SCRAPE_LIMITS_REDIS_URL", f"redis://{REDIS_HOST}:6379/0")
+
+RATE_START = float(os.getenv("SCRAPE_RATE_PER_SEC", "0.5"))     # requests / second / domain
+RATE_MIN = float(os.getenv("SCRAPE_RATE_MIN", "0.05"))
+RATE_MAX = float(os.getenv("SCRAPE_RATE_MAX", "2"))
+RATE_STEP = float(os.getenv("SCRAPE_RATE_STEP", "0.05"))        # additive increase per success
+BURST = float(os.getenv("SCRAPE_BURST", "3"))
+SLOW_SECONDS = float(os.getenv("SCRAPE_SLOW_SECONDS", "3"))     # smoothed response time that counts as strain
+
+MAX_RETRIES = int(os.getenv("SCRAPE_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("SCRAPE_BACKOFF_BASE", "1"))
+BACKOFF_CAP = float(os.getenv("SCRAPE_BACKOFF_CAP", "60"))
+
+CIRCUIT_FAILURES = int(os.getenv("SCRAPE_CIRCUIT_FAILURES", "5"))
+CIRCUIT_COOLDOWN = float(os.getenv("SCRAPE_CIRCUIT_COOLDOWN", "900"))
+
+# after a Redis error, stay in-process for this long before trying again
+REDIS_RETRY_SECONDS = 30
+STATE_TTL = 24 * 3600
+
+
+def domain_of(url):
+    return urlsplit(url).netloc.lower()
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff; honours a server Retry-After when larger."""
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+    if retry_after:
+        delay = max(delay, min(float(retry_after), BACKOFF_CAP))
+    return delay
+
+
+# ======================================================
+# REDIS BACKEND
+# ======================================================
+# Reserve one token; returns the seconds to wait before using it (tokens may go negative).
+_ACQUIRE_LUA = """
+local now_t = redis.call('TIME')
+local now = tonumber(now_t[1]) + tonumber(now_t[2]) / 1000000
+local burst = tonumber(ARGV[2])
+local rate = tonumber(redis.call('HGET', KEYS[2], 'rate') or ARGV[1])
+local b = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(b[1]) or burst
+local ts = tonumber(b[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+tokens = tokens - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+if tokens >= 0 then return '0' end
+return tostring(-tokens / rate)
+"""
+
+# Adapt the refill rate: ARGV = outcome ('ok'|'blocked'|'error'), elapsed, start, min, max, step, slow, ttl
+_ADJUST_LUA = """
+local rate = tonumber(redis.call('HGET', KEYS[1], 'rate') or ARGV[3])
+local ewma = tonumber(redis.call('HGET', KEYS[1], 'ewma') or ARGV[2])
+local elapsed = tonumber(ARGV[2])
+if ARGV[1] == 'blocked' then
+  rate = rate * 0.5
+elseif ARGV[1] == 'ok' then
+  ewma = 0.8 * ewma + 0.2 * elapsed
+  if ewma > tonumber(ARGV[7]) then rate = rate * 0.9 else rate = rate + tonumber(ARGV[6]) end
+end
+rate = math.max(tonumber(ARGV[4]), math.min(tonumber(ARGV[5]), rate))
+redis.call('HSET', KEYS[1], 'rate', tostring(rate), 'ewma', tostring(ewma))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[8]))
+return tostring(rate)
+"""
+
+_redis = None
+_redis_down_until = 0.0
+_redis_lock = threading.Lock()
+
+
+def _get_redis():
+    """Shared Redis client, or None while Redis is unavailable."""
+    global _redis
+    if time.monotonic() < _redis_down_until:
+        return None
+    if _redis is None:
+        with _redis_lock:
+            if _redis is None:
+                try:
+                    import redis
+                    client = redis.Redis.from_url(SCRAPE_LIMITS_REDIS_URL, socket_timeout=0.5,
+                                                  socket_connect_timeout=0.5, decode_responses=True)
+                    _redis = (client, client.register_script(_ACQUIRE_LUA),
+                              client.register_script(_ADJUST_LUA))
+                except ImportError:
+                    _mark_redis_down("redis package not installed")
+                    return None
+    return _redis
+
+
+def _mark_redis_down(reason):
+    global _redis_down_until
+    if time.monotonic() >= _redis_down_until:
+        logging.warning("Scrape limiter using in-process state (%s)", reason)
+    _redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+
+def _with_redis(fn, fallback):
+    r = _get_redis()
+    if r is not None:
+        try:
+            return fn(*r)
+        except Exception as e:
+            _mark_redis_down(e)
+    return fallback()
+
+
+# ======================================================
+# IN-PROCESS FALLBACK
+# ======================================================
+_local_lock = threading.Lock()
+_local_buckets = {}     # domain -> [tokens, ts]
+_local_rates = {}       # domain -> [rate, ewma]
+_local_circuits = {}    # source -> [failures, open_until]
+
+
+def _local_acquire(domain):
+    with _local_lock:
+        rate = _local_rates.get(domain, [RATE_START, 0.0])[0]
+        now = time.time()
+        tokens, ts = _local_buckets.get(domain, (BURST, now))
+        tokens = min(BURST, tokens + max(0.0, now - ts) * rate) - 1
+        _local_buckets[domain] = [tokens, now]
+        return 0.0 if tokens >= 0 else -tokens / rate
+
+
+def _local_adjust(domain, outcome, elapsed):
+    with _local_lock:
+        rate, ewma = _local_rates.get(domain, [RATE_START, elapsed])
+        if outcome == "blocked":
+            rate *= 0.5
+        elif outcome == "ok":
+            ewma = 0.8 * ewma + 0.2 * elapsed
+            rate = rate * 0.9 if ewma > SLOW_SECONDS else rate + RATE_STEP
+        rate = max(RATE_MIN, min(RATE_MAX, rate))
+        _local_rates[domain] = [rate, ewma]
+        return rate
+
+
+# ======================================================
+# PUBLIC
+# ======================================================
+def acquire(domain):
+    """Blocks until this domain's shared token bucket allows one more request."""
+    wait = _with_redis(
+        lambda client, acquire_script, _: float(acquire_script(
+            keys=[f"scrape:bucket:{domain}", f"scrape:rate:{domain}"],
+            args=[RATE_START, BURST, STATE_TTL])),
+        lambda: _local_acquire(domain),
+    )
+    if wait > 0:
+        time.sleep(wait)
+    return wait
+
+
+def report(domain, outcome, elapsed=0.0):
+    """
+    Feed back one request result: outcome is "ok", "blocked" (refused /
+    captcha / rate limited) or "error" (timeout, 5xx). Returns the new rate.
+    """
+    return _with_redis(
+        lambda client, _, adjust_script: float(adjust_script(
+            keys=[f"scrape:rate:{domain}"],
+            args=[outcome, elapsed, RATE_START, RATE_MIN, RATE_MAX, RATE_STEP, SLOW_SECONDS, STATE_TTL])),
+        lambda: _local_adjust(domain, outcome, elapsed),
+    )
+
+
+def circuit_open(source):
+    """True while the source's breaker is open (after the cool-down one trial run is let through)."""
+    def redis_check(client, *_):
+        return float(client.hget(f"scrape:circuit:{source}", "open_until") or 0)
+
+    def local_check():
+        with _local_lock:
+            return _local_circuits.get(source, [0, 0.0])[1]
+
+    return time.time() < _with_redis(redis_check, local_check)
+
+
+def record_result(source, ok):
+    """
+    Closes the breaker on success; opens it after CIRCUIT_FAILURES failures
+    in a row. After the cool-down a single further failure re-opens it.
+    """
+    key = f"scrape:circuit:{source}"
+    half_open = CIRCUIT_FAILURES - 1
+
+    def redis_record(client, *_):
+        if ok:
+            client.delete(key)
+            return False
+        failures = client.hincrby(key, "failures", 1)
+        client.expire(key, STATE_TTL)
+        if failures >= CIRCUIT_FAILURES:
+            client.hset(key, mapping={"open_until": time.time() + CIRCUIT_COOLDOWN, "failures": half_open})
+            return True
+        return False
+
+    def local_record():
+        with _local_lock:
+            if ok:
+                _local_circuits.pop(source, None)
+                return False
+            state = _local_circuits.setdefault(source, [0, 0.0])
+            state[0] += 1
+            if state[0] >= CIRCUIT_FAILURES:
+                state[:] = [half_open, time.time() + CIRCUIT_COOLDOWN]
+                return True
+            return False
+
+    if _with_redis(redis_record, local_record):
+        logging.warning("Circuit for %s opened for %.0fs", source, CIRCUIT_COOLDOWN)
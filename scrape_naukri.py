@@ -1,12 +1,21 @@
 import time
 import logging
-from urllib.parse import urljoin, quote_plus
+from urllib.parse import quote_plus
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import WebDriverException, NoSuchElementException
-from bs4 import BeautifulSoup
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import WebDriverException, TimeoutException
+from scrape_sites import SITES, as_doc, detail_cache, find_cards, parse_cards, parse_description
+from scrape_http import SCRAPE_MODE, Blocked, iter_naukri_http
+from scrape_limits import acquire, circuit_open, domain_of, record_result, report
+
+# upper bounds for explicit waits (they return as soon as the element is there)
+PAGE_WAIT_SECONDS = 10
+LAZY_WAIT_SECONDS = 1.5
+DETAIL_WAIT_SECONDS = 8
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
@@ -23,14 +32,41 @@ def make_driver(headless=False):
     # opts.add_argument("--window-size=1920,1080")
     return webdriver.Chrome(options=opts)
 
-def scrape_naukri(job, location="", max_pages=1, headless=False):
+def iter_naukri(job, location="", max_pages=1, headless=False, mode=None):
     """
     Scrape Naukri search results (robust to multiple layouts).
-    Returns a list of dicts with fields:
-      title, company, location, salary, experience, tags, post_date, description, link
+    Yields one dict per job as soon as its description is fetched, with fields:
+      title, company, location, salary, description, link, source, extra
+
+    mode (default SCRAPE_MODE): "auto" tries plain HTTP first and continues
+    in Chrome from the page where it got blocked, "http" never starts
+    Chrome, "browser" always uses it. Requests go through the shared
+    per-domain rate limiter (scrape_limits).
     """
+    mode = (mode or SCRAPE_MODE).lower()
+    start_page = 0
+
+    if circuit_open("naukri"):
+        logging.warning("Naukri is paused by its circuit breaker; skipping.")
+        return
+
+    if mode in ("auto", "http"):
+        try:
+            yield from iter_naukri_http(job, location, max_pages=max_pages)
+            return
+        except Blocked as e:
+            if mode == "http" or circuit_open("naukri"):
+                logging.warning("Naukri HTTP scrape blocked: %s", e)
+                return
+            logging.warning("Naukri HTTP scrape blocked (%s); using the browser from page %d", e, e.page + 1)
+            start_page = e.page
+
+    yield from _iter_naukri_browser(job, location, max_pages, headless, start_page)
+
+
+def _iter_naukri_browser(job, location, max_pages, headless, start_page=0):
+    """Selenium path; the browser is closed when the generator finishes or is closed early."""
     driver = make_driver(headless=headless)
-    results = []
 
     # format that tends to return server-rendered pages
     q = quote_plus(job.replace(" ", "-"))
@@ -43,136 +79,53 @@ def scrape_naukri(job, location="", max_pages=1, headless=False):
     logging.info("Start URL: %s", start_url)
 
     try:
-        for page in range(max_pages):
+        for page in range(start_page, max_pages):
             page_num = page + 1
             url = f"{start_url}?p={page_num}"
             logging.info("Scraping page %d: %s", page_num, url)
 
+            acquire(domain_of(url))
+            started = time.monotonic()
             driver.get(url)
-            time.sleep(2.5)  # let initial HTML/JS settle
+
+            # wait for the first card instead of a fixed sleep
+            card_css = ", ".join(SITES["naukri"]["cards"])
+            try:
+                WebDriverWait(driver, PAGE_WAIT_SECONDS).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, card_css)))
+            except TimeoutException:
+                pass
+            elapsed = time.monotonic() - started
 
             # attempt to force-load lazy content
             try:
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-                time.sleep(1.0)
+                n_cards = len(driver.find_elements(By.CSS_SELECTOR, card_css))
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1.0)
+                WebDriverWait(driver, LAZY_WAIT_SECONDS).until(
+                    lambda d: len(d.find_elements(By.CSS_SELECTOR, card_css)) > n_cards)
             except Exception:
                 pass
 
-            # Try several card selectors (layout + common fallbacks)
-            card_selectors = [
-                "div.cust-job-tuple",    
-                "article.jobTuple",  
-                "div.listingTuple",
-                "div.jobTuple",          
-                "a.title"
-            ]
-
-            job_cards = []
-            for sel in card_selectors:
-                try:
-                    found = driver.find_elements(By.CSS_SELECTOR, sel)
-                    if found and len(found) > 0:
-                        job_cards = found
-                        logging.info("Found %d job cards using selector: %s", len(found), sel)
-                        break
-                except Exception:
-                    continue
-
-            if not job_cards:
+            # Parse the whole listing once (selectors: scrape_sites.SITES["naukri"])
+            doc = as_doc(driver.page_source)
+            cards, card_selector = find_cards("naukri", doc)
+            if not cards:
                 logging.warning("No job cards found on page %d — page HTML may be different or blocked.", page_num)
+                report(domain_of(url), "blocked", elapsed)
+                record_result("naukri", False)
+                if circuit_open("naukri"):
+                    break
                 continue
+            logging.info("Found %d job cards using selector: %s", len(cards), card_selector)
+            report(domain_of(url), "ok", elapsed)
+            record_result("naukri", True)
 
-            for jcard in job_cards:
-                try:
-                    inner_html = jcard.get_attribute("innerHTML")
-                    soup = BeautifulSoup(inner_html, "html.parser")
-                except Exception:
-                    logging.exception("Failed to parse job card; skipping")
-                    continue
-
-                # Title & link (preferred selector: a.title)
-                title_tag = soup.select_one("a.title") or soup.select_one("h2 a") or soup.select_one("a")
-                title = title_tag.get_text(strip=True) if title_tag else None
-                link = title_tag.get("href") if title_tag and title_tag.has_attr("href") else None
-                if link:
-                    link = urljoin("https://www.naukri.com", link)
-
-                # Company
-                comp_tag = soup.select_one("a.comp-name") or soup.select_one("a.subTitle") or soup.select_one(".comp-dtls-wrap a")
-                company = comp_tag.get_text(strip=True) if comp_tag else None
-
-                # Experience
-                exp_tag = soup.select_one(".exp-wrap .expwdth") or soup.select_one(".exp-wrap")
-                experience = exp_tag.get_text(strip=True) if exp_tag else None
-
-                # Salary (search for title attribute inside salary wrapper)
-                salary_tag = soup.select_one(".sal-wrap span[title]") or soup.select_one(".sal-wrap") or soup.select_one(".sal-wrap span")
-                salary = None
-                if salary_tag:
-                    # salary spans that use title attribute with full text
-                    salary = salary_tag.get("title") or salary_tag.get_text(strip=True)
-
-                # Location
-                loc_tag = soup.select_one(".loc-wrap span[title]") or soup.select_one(".loc-wrap .locWdth") or soup.select_one(".loc-wrap")
-                location_text = None
-                if loc_tag:
-                    location_text = loc_tag.get("title") or loc_tag.get_text(strip=True)
-
-                # Short description available on the card (if present)
-                card_desc = soup.select_one(".job-desc") or soup.select_one(".short-desc") or soup.select_one(".description")
-                card_description = card_desc.get_text(strip=True) if card_desc else None
-
-                # Tags (list)
-                tag_nodes = soup.select("ul.tags-gt li.tag-li")
-                tags = [t.get_text(strip=True) for t in tag_nodes] if tag_nodes else []
-
-                # Post date
-                post_date_tag = soup.select_one(".job-post-day") or soup.select_one(".post-date")
-                post_date = post_date_tag.get_text(strip=True) if post_date_tag else None
-
-                # Fetch full description from job page (open new tab)
-                full_description = None
-                if link:
-                    full_description = scrape_naukri_description(driver, link)
-
-                # results.append({
-                #     "title": title,
-                #     "company": company,
-                #     "experience": experience,
-                #     "salary": salary,
-                #     "location": location_text,
-                #     "card_description": card_description,
-                #     "description": full_description,
-                #     "tags": tags,
-                #     "post_date": post_date,
-                #     "link": link
-                # })
-                results.append({
-                    "title": title or "N/A",
-                    "company": company or "N/A",
-                    "location": location_text or "N/A",
-                    "salary": salary or "N/A",
-
-                    # Prefer full description, fallback to card description
-                    "description": full_description or card_description or "N/A",
-
-                    "link": link or "N/A",
-                    "source": "naukri",
-
-                    
-                    "extra": {
-                        "experience": experience,
-                        "tags": tags,
-                        "post_date": post_date,
-                        "card_description": card_description
-                    }
-                })
-
-
-            # pause between pages
-            time.sleep(1.2)
+            for item in parse_cards("naukri", doc):
+                # Fetch full description from job page (open new tab);
+                # fall back to the card description
+                if item["link"] != "N/A":
+                    item["description"] = scrape_naukri_description(driver, item["link"]) or item["description"]
+                yield item
 
     except WebDriverException:
         logging.exception("WebDriver failed unexpectedly.")
@@ -182,7 +135,11 @@ def scrape_naukri(job, location="", max_pages=1, headless=False):
         except Exception:
             pass
 
-    return results
+
+def scrape_naukri(job, location="", max_pages=1, headless=False, mode=None):
+    """Same as iter_naukri, collected into a list."""
+    return list(iter_naukri(job, location, max_pages=max_pages, headless=headless, mode=mode))
+
 
 def scrape_naukri_description(driver, link):
     """
@@ -192,42 +149,28 @@ def scrape_naukri_description(driver, link):
     if not link:
         return None
 
+    cached = detail_cache.get(link)
+    if cached is not None:
+        return cached
+
     try:
         # open new tab
         driver.execute_script("window.open('');")
         driver.switch_to.window(driver.window_handles[-1])
+        acquire(domain_of(link))
         driver.get(link)
-        time.sleep(2.0)  # let page load
 
-        # attempt to scroll a bit to trigger lazy description load
+        # attempt to scroll a bit to trigger lazy description load,
+        # then wait for the JD block (falls through to the body text on timeout)
         try:
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight/4);")
-            time.sleep(0.8)
+            WebDriverWait(driver, DETAIL_WAIT_SECONDS).until(EC.presence_of_element_located(
+                (By.CSS_SELECTOR, ", ".join(SITES["naukri"]["description"]))))
         except Exception:
             pass
 
-        # try multiple selectors for the JD block
-        desc_selectors = [
-            "div.jd-container",
-            "div.job-desc",
-            "section.job-desc",
-            "#jobDescriptionText",
-            "div.description",
-            "div#jobDescription"
-        ]
-
-        desc_text = None
-        for sel in desc_selectors:
-            try:
-                elems = driver.find_elements(By.CSS_SELECTOR, sel)
-                if elems and len(elems) > 0:
-                    # join visible text blocks
-                    texts = [e.text.strip() for e in elems if e.text.strip()]
-                    if texts:
-                        desc_text = "\n\n".join(texts)
-                        break
-            except Exception:
-                continue
+        # JD block via the configured selectors, parsed from one page_source read
+        desc_text = parse_description("naukri", driver.page_source)
 
         # fallback: first sizable block of body text (avoid nav/footer noise)
         if not desc_text:
@@ -248,6 +191,7 @@ def scrape_naukri_description(driver, link):
             desc_text = desc_text.replace("\r", "\n").strip()
             if len(desc_text) > 8000:
                 desc_text = desc_text[:8000]
+        detail_cache.put(link, desc_text)
         return desc_text
 
     except Exception:
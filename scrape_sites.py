@@ -0,0 +1,230 @@
+"""
+Per-site selector config + lxml parsing shared by the browser
+(driver.page_source) and plain HTTP scrapers.
+
+Every field lists CSS selectors in fallback order; the first one that
+matches inside a card wins. "attr" reads an attribute (falling back to
+the element text when the attribute is missing), "many" collects the
+text of every match. Selectors are compiled once at import.
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from urllib.parse import urljoin
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+MAX_DESCRIPTION_CHARS = 8000
+
+# job detail pages rarely change; re-scrapes within the TTL reuse them
+DETAIL_CACHE_SIZE = int(os.getenv("SCRAPE_DETAIL_CACHE_SIZE", "2000"))
+DETAIL_CACHE_TTL = float(os.getenv("SCRAPE_DETAIL_CACHE_TTL", str(6 * 3600)))
+
+# ======================================================
+# SITE CONFIG
+# ======================================================
+SITES = {
+    "naukri": {
+        "base_url": "https://www.naukri.com",
+        "cards": ["div.cust-job-tuple", "article.jobTuple", "div.listingTuple", "div.jobTuple", "a.title"],
+        "fields": {
+            "title": {"css": ["a.title", "h2 a", "a"]},
+            "link": {"css": ["a.title", "h2 a", "a"], "attr": "href", "url": True},
+            "company": {"css": ["a.comp-name", "a.subTitle", ".comp-dtls-wrap a"]},
+            "location": {"css": [".loc-wrap span[title]", ".loc-wrap .locWdth", ".loc-wrap"], "attr": "title"},
+            "salary": {"css": [".sal-wrap span[title]", ".sal-wrap", ".sal-wrap span"], "attr": "title"},
+            "card_description": {"css": [".job-desc", ".short-desc", ".description"]},
+            "experience": {"css": [".exp-wrap .expwdth", ".exp-wrap"]},
+            "tags": {"css": ["ul.tags-gt li.tag-li"], "many": True},
+            "post_date": {"css": [".job-post-day", ".post-date"]},
+        },
+        "extra": ["experience", "tags", "post_date", "card_description"],
+        "description": ["div.jd-container", "div.job-desc", "section.job-desc",
+                        "#jobDescriptionText", "div.description", "div#jobDescription"],
+    },
+    "indeed": {
+        "base_url": "https://in.indeed.com",
+        "cards": ["a.tapItem"],
+        "fields": {
+            "title": {"css": ["h2.jobTitle span"]},
+            "link": {"css": ["a.tapItem"], "attr": "href", "url": True},
+            "company": {"css": ["span.companyName"]},
+            "location": {"css": ["div.companyLocation"]},
+            "salary": {"css": ["div.salary-snippet"]},
+        },
+        "extra": [],
+        "description": ["#jobDescriptionText"],
+    },
+}
+
+
+def _compile(selectors):
+    return [(sel, CSSSelector(sel)) for sel in selectors]
+
+
+_COMPILED = {
+    name: {
+        "cards": _compile(site["cards"]),
+        "fields": {field: dict(spec, css=_compile(spec["css"])) for field, spec in site["fields"].items()},
+        "description": _compile(site["description"]),
+    }
+    for name, site in SITES.items()
+}
+
+
+# ======================================================
+# TEXT HELPERS
+# ======================================================
+_BLOCK_TAGS = ("br", "p", "li", "div", "tr", "h1", "h2", "h3", "h4", "h5", "h6")
+
+
+def clean(text):
+    return " ".join(text.split()) if text else None
+
+
+def html_to_text(fragment):
+    """Plain text of an HTML fragment (string or element), one line per block element."""
+    if isinstance(fragment, str):
+        if not fragment.strip():
+            return None
+        fragment = lxml_html.fragment_fromstring(fragment, create_parent="div")
+    for el in fragment.iter(*_BLOCK_TAGS):
+        el.tail = "\n" + (el.tail or "")
+    lines = (" ".join(line.split()) for line in fragment.text_content().splitlines())
+    text = "\n".join(line for line in lines if line)
+    return text[:MAX_DESCRIPTION_CHARS] or None
+
+
+def make_job(source, title=None, company=None, location=None, salary=None,
+             description=None, link=None, extra=None):
+    """The job dict shape every scraper yields."""
+    return {
+        "title": title or "N/A",
+        "company": company or "N/A",
+        "location": location or "N/A",
+        "salary": salary or "N/A",
+        "description": description or "N/A",
+        "link": link or "N/A",
+        "source": source,
+        "extra": extra or {},
+    }
+
+
+def as_doc(page):
+    return lxml_html.fromstring(page) if isinstance(page, (str, bytes)) else page
+
+
+# ======================================================
+# PARSING
+# ======================================================
+def _field(card, spec, base_url):
+    if spec.get("many"):
+        for _, sel in spec["css"]:
+            found = sel(card)
+            if found:
+                return [clean(el.text_content()) for el in found]
+        return []
+
+    attr = spec.get("attr")
+    for _, sel in spec["css"]:
+        found = sel(card)
+        if not found:
+            continue
+        el = found[0]
+        if attr and el.get(attr):
+            value = el.get(attr).strip()
+            return urljoin(base_url, value) if spec.get("url") else clean(value)
+        # first matching element decides, as in the old per-card parsers:
+        # a link element without the attribute means no link, not a text fallback
+        return None if spec.get("url") else clean(el.text_content())
+    return None
+
+
+def find_cards(site, page):
+    """(cards, selector used) for the first card selector that matches."""
+    doc = as_doc(page)
+    for raw, sel in _COMPILED[site]["cards"]:
+        cards = sel(doc)
+        if cards:
+            return cards, raw
+    return [], None
+
+
+def parse_cards(site, page, base_url=None):
+    """
+    Extracts every job card on a listing page in one pass.
+    Returns job dicts (description = card description when the site has one).
+    """
+    base_url = base_url or SITES[site]["base_url"]
+    fields = _COMPILED[site]["fields"]
+    extra_fields = SITES[site]["extra"]
+
+    cards, _ = find_cards(site, page)
+    jobs = []
+    for card in cards:
+        values = {name: _field(card, spec, base_url) for name, spec in fields.items()}
+        jobs.append(make_job(
+            site,
+            title=values.get("title"),
+            company=values.get("company"),
+            location=values.get("location"),
+            salary=values.get("salary"),
+            description=values.get("card_description"),
+            link=values.get("link"),
+            extra={name: values.get(name) for name in extra_fields},
+        ))
+    return jobs
+
+
+def parse_description(site, page):
+    """Text of the first description selector that matches a detail page."""
+    doc = as_doc(page)
+    for _, sel in _COMPILED[site]["description"]:
+        blocks = [html_to_text(el) for el in sel(doc)]
+        blocks = [b for b in blocks if b]
+        if blocks:
+            return "\n\n".join(blocks)[:MAX_DESCRIPTION_CHARS]
+    return None
+
+
+# ======================================================
+# DETAIL CACHE
+# ======================================================
+class DetailCache:
+    """Small thread-safe LRU (with TTL) of job link -> description text."""
+
+    def __init__(self, max_size=DETAIL_CACHE_SIZE, ttl=DETAIL_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, link):
+        with self._lock:
+            entry = self._items.get(link)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self.misses += 1
+                return None
+            self._items.move_to_end(link)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, link, description):
+        if not link or link == "N/A" or not description:
+            return
+        with self._lock:
+            self._items[link] = (time.monotonic(), description)
+            self._items.move_to_end(link)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+detail_cache = DetailCache()
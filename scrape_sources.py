@@ -0,0 +1,270 @@
+"""
+Job source plugin registry.
+
+A source turns (query, location, max_pages) into job dicts in the shared
+schema: title, company, location, salary, description, link, source, extra.
+New sites subclass JobSource and implement three small pieces:
+
+    @register_source
+    class ExampleSource(JobSource):
+        name = "example"
+
+        def search_pages(self, query, location, max_pages, start_page=0):
+            ...  # yield one list of raw listings per result page
+
+        def fetch_detail(self, listing):
+            ...  # full description text (cached per link by the base class)
+
+        def normalize(self, listing, description):
+            return make_job(self.name, title=..., link=..., description=description)
+
+Naukri and Indeed implement them for their plain-HTTP path (scrape_http)
+and override iter_jobs only to hand over to their Selenium scrapers from
+the page where HTTP got blocked.
+
+iter_sources() runs several sources in parallel and yields jobs as they
+arrive, with a per-source concurrency limit and timing stats.
+"""
+import os
+import time
+import queue
+import logging
+import threading
+
+from scrape_sites import detail_cache, make_job
+
+# ======================================================
+# CONFIG
+# ======================================================
+# sources used by /api/scrape and by the scheduled Celery task
+SCRAPE_SOURCES = os.getenv("SCRAPE_SOURCES", "naukri,indeed")
+SCHEDULED_SCRAPE_SOURCES = os.getenv("SCHEDULED_SCRAPE_SOURCES", "naukri")
+
+
+def parse_source_names(value):
+    return [name.strip().lower() for name in (value or "").split(",") if name.strip()]
+
+
+# ======================================================
+# INTERFACE
+# ======================================================
+class JobSource:
+    name = None
+    # scrapes of this source allowed at once in this process
+    # (Selenium sources default to 1: each run holds a Chrome instance)
+    max_concurrency = 1
+
+    def search_pages(self, query, location, max_pages, start_page=0):
+        raise NotImplementedError
+
+    def fetch_detail(self, listing):
+        return None
+
+    def link_of(self, listing):
+        link = listing.get("link") if isinstance(listing, dict) else None
+        return link if link and link != "N/A" else None
+
+    def normalize(self, listing, description):
+        raise NotImplementedError
+
+    def pipeline(self, query, location, max_pages, start_page=0, fetch_details=True):
+        """Listing pages -> cached detail fetch -> normalized job dicts."""
+        for page in self.search_pages(query, location, max_pages, start_page):
+            for listing in page:
+                link = self.link_of(listing)
+                description = None
+                if fetch_details and link:
+                    description = detail_cache.get(link)
+                    if description is None:
+                        description = self.fetch_detail(listing)
+                        detail_cache.put(link, description)
+                yield self.normalize(listing, description)
+
+    def iter_jobs(self, query, location, max_pages):
+        return self.pipeline(query, location, max_pages)
+
+
+# ======================================================
+# REGISTRY
+# ======================================================
+_sources = {}
+_semaphores = {}
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def register_source(cls):
+    """Class decorator adding a JobSource to the registry under cls.name."""
+    source = cls()
+    if not source.name:
+        raise ValueError(f"{cls.__name__} has no name")
+
+    limit = int(os.getenv(f"SCRAPE_CONCURRENCY_{source.name.upper()}", source.max_concurrency))
+    _sources[source.name] = source
+    _semaphores[source.name] = threading.BoundedSemaphore(max(1, limit))
+    _stats[source.name] = {"runs": 0, "jobs": 0, "errors": 0, "seconds": 0.0,
+                           "last_run_seconds": None, "last_first_job_seconds": None}
+    return cls
+
+
+def get_source(name):
+    try:
+        return _sources[name]
+    except KeyError:
+        raise ValueError(f"Unknown job source {name!r}; available: {', '.join(sorted(_sources))}")
+
+
+def available_sources():
+    return sorted(_sources)
+
+
+def source_stats():
+    """Per-source run counts and timings (this process)."""
+    with _stats_lock:
+        return {name: dict(s) for name, s in _stats.items()}
+
+
+def _record(name, jobs, seconds, first_job_seconds, failed):
+    with _stats_lock:
+        s = _stats[name]
+        s["runs"] += 1
+        s["jobs"] += jobs
+        s["errors"] += int(failed)
+        s["seconds"] += seconds
+        s["last_run_seconds"] = round(seconds, 3)
+        s["last_first_job_seconds"] = None if first_job_seconds is None else round(first_job_seconds, 3)
+
+
+# ======================================================
+# RUNNING SOURCES
+# ======================================================
+_DONE = object()
+
+
+def run_source(name, query, location, max_pages=1, stop=None):
+    """Jobs from one source, honouring its concurrency limit and recording stats."""
+    source = get_source(name)
+    started = time.monotonic()
+    first_job = None
+    count = 0
+    failed = False
+
+    with _semaphores[name]:
+        jobs = source.iter_jobs(query, location, max_pages)
+        try:
+            for job in jobs:
+                if first_job is None:
+                    first_job = time.monotonic() - started
+                count += 1
+                yield job
+                if stop is not None and stop.is_set():
+                    break
+        except Exception:
+            failed = True
+            logging.exception("Job source %s failed after %d jobs", name, count)
+        finally:
+            # quits the source's browser right away when stopped early
+            if hasattr(jobs, "close"):
+                jobs.close()
+            _record(name, count, time.monotonic() - started, first_job, failed)
+
+
+def iter_sources(names, query, location, max_pages=1):
+    """
+    Runs the named sources in parallel threads and yields their jobs as they
+    arrive. A failing source is logged and skipped; closing the generator
+    stops the others after their current job.
+    """
+    names = [get_source(n).name for n in names]
+    if len(names) == 1:
+        yield from run_source(names[0], query, location, max_pages)
+        return
+
+    out = queue.Queue(maxsize=100)
+    stop = threading.Event()
+
+    def produce(name):
+        try:
+            for job in run_source(name, query, location, max_pages, stop=stop):
+                while not stop.is_set():
+                    try:
+                        out.put(job, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    break
+        finally:
+            out.put(_DONE)
+
+    threads = [threading.Thread(target=produce, args=(n,), name=f"scrape-{n}", daemon=True) for n in names]
+    for t in threads:
+        t.start()
+
+    try:
+        remaining = len(threads)
+        while remaining:
+            item = out.get()
+            if item is _DONE:
+                remaining -= 1
+            else:
+                yield item
+    finally:
+        stop.set()
+        # unblock producers waiting on a full queue
+        while any(t.is_alive() for t in threads):
+            try:
+                out.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
+# ======================================================
+# BUILT-IN SOURCES
+# ======================================================
+class _HttpListingSource(JobSource):
+    """Card-level listings from scrape_http, completed by the detail page when it loads."""
+
+    def fetch_detail(self, listing):
+        from scrape_http import _fetch_description
+        return _fetch_description(self.link_of(listing), self.name)
+
+    def normalize(self, listing, description):
+        return make_job(
+            self.name,
+            title=listing.get("title"),
+            company=listing.get("company"),
+            location=listing.get("location"),
+            salary=listing.get("salary"),
+            # keep the card text when the detail page didn't load
+            description=description or listing.get("description"),
+            link=self.link_of(listing),
+            extra=listing.get("extra"),
+        )
+
+
+@register_source
+class NaukriSource(_HttpListingSource):
+    name = "naukri"
+
+    def search_pages(self, query, location, max_pages, start_page=0):
+        from scrape_http import naukri_pages
+        return naukri_pages(query, location, max_pages=max_pages, start_page=start_page)
+
+    def iter_jobs(self, query, location, max_pages):
+        # pipeline over HTTP first, Selenium from the blocked page on
+        from scrape_naukri import iter_naukri
+        return iter_naukri(query, location, max_pages=max_pages)
+
+
+@register_source
+class IndeedSource(_HttpListingSource):
+    name = "indeed"
+
+    def search_pages(self, query, location, max_pages, start_page=0):
+        from scrape_http import indeed_pages
+        return indeed_pages(query, location, max_pages=max_pages, start_page=start_page)
+
+    def iter_jobs(self, query, location, max_pages):
+        from scrape import iter_indeed
+        return iter_indeed(query, location, max_pages=max_pages)
@@ -1,11 +1,18 @@
+import io
 import os
+import re
 import json
+import textwrap
+import asyncio
+import threading
 import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from pypdf import PdfReader
+import hashlib
 import requests
-from io import BytesIO
+from resume_extract import extract_pdf_text
+from chunking import split_text, split_many
 
 # ======================================================
 # CONFIG
@@ -19,8 +26,20 @@ JOBS_EMB = DATA_DIR / "jobs_embs.npy"
 RESUME_JSON = DATA_DIR / "resume_docs.json"
 RESUME_EMB = DATA_DIR / "resume_embs.npy"
 
+# compact resume representation for worker_similarity's profile mode
+RESUME_PROFILE_JSON = DATA_DIR / "resume_profile.json"
+RESUME_PROFILE_EMB = DATA_DIR / "resume_profile.npy"
+PROFILE_SKILL_VECTORS = int(os.getenv("PROFILE_SKILL_VECTORS", "3"))
+PROFILE_CLUSTERS = int(os.getenv("PROFILE_CLUSTERS", "4"))
+
+
+# "torch": sentence-transformers | "onnx": onnxruntime, no torch (embedding_onnx.py)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+# CPU threads for encoding; 0 keeps the library default (all cores)
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))
 
 _embedding_model = None
+_model_lock = threading.Lock()
 
 def get_embedding_model():
     """
@@ -29,18 +48,35 @@ def get_embedding_model():
     """
     global _embedding_model
     if _embedding_model is None:
-        from sentence_transformers import SentenceTransformer
-        _embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+        with _model_lock:
+            if _embedding_model is None:
+                if EMBEDDING_BACKEND == "onnx":
+                    from embedding_onnx import load_onnx_embedder
+                    _embedding_model = load_onnx_embedder(threads=EMBEDDING_THREADS)
+                else:
+                    from sentence_transformers import SentenceTransformer
+                    if EMBEDDING_THREADS:
+                        import torch
+                        torch.set_num_threads(EMBEDDING_THREADS)
+                    _embedding_model = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
     return _embedding_model
 
 
-# ======================================================
-# TEXT SPLITTER
-# ======================================================
-text_splitter = RecursiveCharacterTextSplitter(
-    chunk_size=800,
-    chunk_overlap=150
-)
+def warm_up():
+    """
+    Load the model and run one dummy encode so the first real
+    request doesn't pay for model load + first-inference setup.
+    Opt-in via WARMUP_EMBEDDING_MODEL=1 (embedding_config.warmup_enabled).
+    """
+    model = get_embedding_model()
+    model.encode(["warm up"], show_progress_bar=False)
+    print("Embedding model warmed up.")
+
+
+def is_model_loaded():
+    return _embedding_model is not None
+
+
 
 # ======================================================
 # SAVE / LOAD HELPERS
@@ -58,169 +94,560 @@ def load_json(path: Path):
 # ======================================================
 # USE LAZY MODEL IN EMBEDDING
 # ======================================================
-def embed_texts(texts, batch_size=64):
-    model = get_embedding_model()   #  lazy load here
-    embs = []
+# padded tokens (batch size x longest text) per encode call
+EMBED_TOKEN_BUDGET = int(os.getenv("EMBED_TOKEN_BUDGET", "16384"))
+EMBED_MAX_BATCH = int(os.getenv("EMBED_MAX_BATCH", "128"))
+
+
+def _token_lengths(model, texts):
+    """Word-piece count per text as the model will see it (truncated)."""
+    if hasattr(model, "token_lengths"):
+        return model.token_lengths(texts)
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is None:
+        return [len(t) // 4 + 2 for t in texts]
+    ids = tokenizer(list(texts), truncation=True, max_length=model.max_seq_length)["input_ids"]
+    return [len(x) for x in ids]
+
 
-    for i in range(0, len(texts), batch_size):
-        batch = texts[i:i+batch_size]
-        arr = model.encode(batch, show_progress_bar=False)
-        for e in arr:
-            embs.append(e.tolist())
+def _length_buckets(lengths, max_batch, token_budget):
+    """
+    Index batches over texts sorted by token length: each batch grows until
+    max_batch texts or until padding everything to its longest text would
+    exceed token_budget.
+    """
+    order = np.argsort(lengths, kind="stable")
+    batches, current = [], []
+    for i in order:
+        # sorted ascending, so the newest text is the longest in the batch
+        if current and (len(current) >= max_batch or (len(current) + 1) * lengths[i] > token_budget):
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def embed_texts(texts, batch_size=None, token_budget=None):
+    """
+    Encodes texts straight into one preallocated float32 (len(texts), dim)
+    array. Texts are batched by token length (short chunks together, long
+    ones together) so little compute goes to padding; rows come back in
+    input order.
+    """
+    model = get_embedding_model()   #  lazy load here
+    out = np.empty((len(texts), model.get_sentence_embedding_dimension()), dtype=np.float32)
+    if not texts:
+        return out
+
+    if hasattr(model, "encode_tokenized"):
+        # ONNX backend: one tokenizer pass serves both the bucketing and the encode
+        encodings = model.tokenize(texts)
+        lengths = [len(e.ids) for e in encodings]
+    else:
+        encodings = None
+        lengths = _token_lengths(model, texts)
+
+    for idx in _length_buckets(lengths, batch_size or EMBED_MAX_BATCH, token_budget or EMBED_TOKEN_BUDGET):
+        if encodings is not None:
+            out[idx] = model.encode_tokenized([encodings[i] for i in idx], batch_size=len(idx))
+        else:
+            batch = [texts[i] for i in idx]
+            out[idx] = model.encode(batch, batch_size=len(batch), show_progress_bar=False, convert_to_numpy=True)
 
-    return embs
+    return out
 
 # ======================================================
 # STORE SCRAPED JOBS
 # ======================================================
-def store_jobs(scraped_jobs, user_id: str):
-    docs = []
-    metas = []
+def _job_content(job):
+    return (
+        f"Job Title: {job.get('title','')}\n"
+        f"Company: {job.get('company','')}\n"
+        f"Location: {job.get('location','')}\n"
+        f"Salary: {job.get('salary','')}\n"
+        f"Description: {job.get('description','')}\n"
+        f"Apply Link: {job.get('link','')}\n"
+    )
 
-    for idx, job in enumerate(scraped_jobs):
-        content = (
-            f"Job Title: {job.get('title','')}\n"
-            f"Company: {job.get('company','')}\n"
-            f"Location: {job.get('location','')}\n"
-            f"Salary: {job.get('salary','')}\n"
-            f"Description: {job.get('description','')}\n"
-            f"Apply Link: {job.get('link','')}\n"
-        )
-
-        chunks = text_splitter.split_text(content)
-        for c in chunks:
-            docs.append(c)
-            metas.append({
-                "type": "job",
-                "job_index": idx,
-                "source": job.get("link", ""),
-                "user_id": user_id
-            })
+
+def store_jobs(scraped_jobs, user_id: str, append: bool = False, job_index_offset: int = 0):
+    """
+    Chunks + embeds scraped jobs and writes the job store.
+
+    append=True adds to the existing store in place instead of replacing it
+    (used by ingest.py for micro-batches, so each batch only writes its own
+    rows); job_index_offset is then the position of
+    scraped_jobs[0] in the whole scrape so job_index stays scrape-global.
+    """
+    # chunk every posting in one pass, then embed all chunks together
+    docs, owners = split_many([_job_content(job) for job in scraped_jobs])
+
+    metas = []
+    chunk_index = 0
+    for i, idx in enumerate(owners):
+        chunk_index = chunk_index + 1 if i and owners[i - 1] == idx else 0
+        metas.append({
+            "type": "job",
+            "job_index": job_index_offset + idx,
+            "chunk_index": chunk_index,
+            "source": scraped_jobs[idx].get("link", ""),
+            "user_id": user_id
+        })
 
     if not docs:
         print("WARNING: No job chunks to store.")
         return
 
     embs = embed_texts(docs)
+    items = [{"doc": d, "meta": m} for d, m in zip(docs, metas)]
 
-    save_json(JOBS_JSON, [{"doc": d, "meta": m} for d, m in zip(docs, metas)])
-    np.save(JOBS_EMB, np.array(embs, dtype=np.float32))
+    if not (append and _append_store(JOBS_JSON, JOBS_EMB, items, embs)):
+        save_json(JOBS_JSON, items)
+        np.save(JOBS_EMB, embs)
+    _bump_store_version(user_id)
 
     print(f"Stored {len(docs)} job chunks.")
 
+def _json_list_end(f):
+    """Offset of the closing "]" of the non-empty JSON list in f, else None."""
+    f.seek(0, os.SEEK_END)
+    start = max(0, f.tell() - 64)
+    f.seek(start)
+    tail = f.read().rstrip()
+    if not tail.endswith(b"]") or tail[:-1].rstrip().endswith(b"["):
+        return None
+    return start + len(tail) - 1
+
+
+def _append_store(json_path, emb_path, items, embs):
+    """
+    Adds rows to the end of a store in place, so a scrape's micro-batches
+    cost I/O for the new rows only: the embedding rows go after the old ones
+    and the .npy header gets the new row count (np.save leaves room for it),
+    the items go before the JSON list's closing bracket. Returns False,
+    having written nothing, when the files can't be extended that way
+    (missing, empty, other dtype or width); the caller then writes the store.
+    """
+    if not Path(json_path).exists() or not Path(emb_path).exists():
+        return False
+
+    fmt = np.lib.format
+    with open(emb_path, "r+b") as ef, open(json_path, "r+b") as jf:
+        version = fmt.read_magic(ef)
+        if version not in ((1, 0), (2, 0)):
+            return False
+        read_header = fmt.read_array_header_1_0 if version == (1, 0) else fmt.read_array_header_2_0
+        write_header = fmt.write_array_header_1_0 if version == (1, 0) else fmt.write_array_header_2_0
+        shape, fortran_order, dtype = read_header(ef)
+        data_start = ef.tell()
+        if fortran_order or dtype != np.float32 or len(shape) != 2 or shape[1] != embs.shape[1]:
+            return False
+        data_end = data_start + shape[0] * shape[1] * dtype.itemsize
+        if os.fstat(ef.fileno()).st_size != data_end:
+            return False
+
+        header = io.BytesIO()
+        write_header(header, {"shape": (shape[0] + len(embs), shape[1]), "fortran_order": False,
+                              "descr": fmt.dtype_to_descr(dtype)})
+        list_end = _json_list_end(jf)
+        if header.tell() != data_start or list_end is None:
+            return False
+
+        ef.seek(data_end)
+        ef.write(np.ascontiguousarray(embs, dtype=np.float32).tobytes())
+        ef.seek(0)
+        ef.write(header.getvalue())
+
+        new_items = ",\n".join(textwrap.indent(json.dumps(it, ensure_ascii=False, indent=2), "  ")
+                               for it in items)
+        jf.seek(list_end)
+        jf.write(f",\n{new_items}\n]".encode("utf-8"))
+        jf.truncate()
+    return True
+
 # ======================================================
 # STORE RESUME
 # ======================================================
-def store_resume(pdf_source: str, user_id: str):
+RESUME_CACHE_DIR = DATA_DIR / "resume_cache"
+
+
+def resume_content_hash(pdf_bytes: bytes) -> str:
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def _read_pdf_bytes(pdf_source):
+    if isinstance(pdf_source, (bytes, bytearray)):
+        return bytes(pdf_source)
+    if pdf_source.startswith("http"):
+        resp = requests.get(pdf_source, timeout=10)
+        resp.raise_for_status()
+        return resp.content
+    if not os.path.isfile(pdf_source):
+        print("Resume not found:", pdf_source)
+        return None
+    with open(pdf_source, "rb") as f:
+        return f.read()
+
+
+def _load_resume_cache(content_hash: str):
+    """Returns (text, chunks, embeddings) cached for this PDF, or None."""
+    meta_path = RESUME_CACHE_DIR / f"{content_hash}.json"
+    emb_path = RESUME_CACHE_DIR / f"{content_hash}.npy"
+    if not meta_path.exists() or not emb_path.exists():
+        return None
     try:
-        if pdf_source.startswith("http"):
-            resp = requests.get(pdf_source, timeout=10)
-            resp.raise_for_status()
-            reader = PdfReader(BytesIO(resp.content))
-        else:
-            if not os.path.isfile(pdf_source):
-                print("Resume not found:", pdf_source)
-                return
-            reader = PdfReader(pdf_source)
+        with open(meta_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        return cached["text"], cached["chunks"], np.load(emb_path)
     except Exception as e:
-        print("Failed to read PDF:", e)
+        print("Ignoring broken resume cache entry:", e)
+        return None
+
+
+def _save_resume_cache(content_hash: str, text, chunks, embeddings):
+    RESUME_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    np.save(RESUME_CACHE_DIR / f"{content_hash}.npy", embeddings)
+    save_json(RESUME_CACHE_DIR / f"{content_hash}.json", {"text": text, "chunks": chunks})
+
+
+_SKILL_HEADING = re.compile(
+    r"\b(technical skills|skills|technologies|tech stack|tools|frameworks|languages)\b", re.I)
+_LIST_SEPARATORS = re.compile(r"[,|;/\u2022\u00b7]")
+
+
+def _skill_score(chunk: str):
+    """High for chunks that read like a skills section: a heading, dense comma/bullet lists."""
+    heading = 10 if _SKILL_HEADING.search(chunk) else 0
+    return heading + 100 * len(_LIST_SEPARATORS.findall(chunk)) / max(len(chunk), 1)
+
+
+def _spherical_kmeans(unit, k, iters=10):
+    """k unit centers for unit rows; farthest-point init, so results are deterministic."""
+    centroid = unit.mean(axis=0)
+    chosen = [int(np.argmax(unit @ centroid))]
+    while len(chosen) < k:
+        chosen.append(int(np.argmin((unit @ unit[chosen].T).max(axis=1))))
+    centers = unit[chosen].copy()
+
+    for _ in range(iters):
+        assign = (unit @ centers.T).argmax(axis=1)
+        for c in range(k):
+            members = unit[assign == c]
+            if len(members):
+                centers[c] = members.mean(axis=0)
+        centers = _normalize_rows(centers)
+    return centers
+
+
+def build_resume_profile(chunks, embeddings, k=None, clusters=None):
+    """
+    Compact stand-in for a resume's chunks: the unit centroid, `clusters`
+    topic centers (so a resume spanning several areas stays covered) and
+    the k chunk vectors that read most like skill lists. Short resumes
+    keep all their chunks. Returns (unit vectors, labels).
+    """
+    k = PROFILE_SKILL_VECTORS if k is None else k
+    clusters = PROFILE_CLUSTERS if clusters is None else clusters
+    unit = _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+    if len(chunks) <= 1 + clusters + k:
+        return unit, [f"chunk:{i}" for i in range(len(chunks))]
+
+    centroid = unit.mean(axis=0)
+    centroid /= np.linalg.norm(centroid)
+    centers = _spherical_kmeans(unit, clusters) if clusters else np.zeros((0, unit.shape[1]), np.float32)
+    top = sorted(sorted(range(len(chunks)), key=lambda i: _skill_score(chunks[i]), reverse=True)[:k])
+
+    vectors = np.vstack([centroid, centers, unit[top]]).astype(np.float32)
+    labels = ["centroid"] + [f"cluster:{c}" for c in range(len(centers))] + [f"chunk:{i}" for i in top]
+    return vectors, labels
+
+
+def _store_resume_profile(user_id: str, content_hash: str, chunks, embeddings):
+    profile, labels = build_resume_profile(chunks, embeddings)
+    np.save(RESUME_PROFILE_EMB, profile)
+    save_json(RESUME_PROFILE_JSON, {"user_id": user_id, "resume_hash": content_hash, "vectors": labels})
+
+
+def _ensure_resume_profile(user_id: str, content_hash: str):
+    """Builds the profile for a resume stored before profiles existed."""
+    meta = load_json(RESUME_PROFILE_JSON)
+    if meta and RESUME_PROFILE_EMB.exists() and \
+            (meta.get("user_id"), meta.get("resume_hash")) == (user_id, content_hash):
         return
+    items = load_json(RESUME_JSON)
+    _store_resume_profile(user_id, content_hash, [it["doc"] for it in items], np.load(RESUME_EMB))
+
+
+def _resume_store_holds(user_id: str, content_hash: str):
+    items = load_json(RESUME_JSON)
+    return bool(items) and RESUME_EMB.exists() and all(
+        it["meta"].get("user_id") == user_id and it["meta"].get("resume_hash") == content_hash
+        for it in items
+    )
+
+
+def store_resume(pdf_source, user_id: str, content_hash: str = None):
+    """
+    pdf_source: raw PDF bytes (preferred, e.g. straight from an upload),
+    an http(s) URL or a local file path.
+
+    Extraction, chunking and embedding are cached by PDF content hash,
+    so a resume is processed once per upload. When the caller already
+    knows the hash (users.resume_hash) a cache hit skips the download too.
+
+    Returns the content hash when the resume is stored, else None.
+    """
+    if content_hash and _resume_store_holds(user_id, content_hash):
+        _ensure_resume_profile(user_id, content_hash)
+        return content_hash
+
+    cached = _load_resume_cache(content_hash) if content_hash else None
 
-    pages_text = []
-    for page in reader.pages:
+    if cached is None:
         try:
-            pages_text.append(page.extract_text() or "")
-        except Exception:
-            pages_text.append("")
+            pdf_bytes = _read_pdf_bytes(pdf_source)
+        except Exception as e:
+            print("Failed to read PDF:", e)
+            return None
+        if not pdf_bytes:
+            return None
+
+        content_hash = resume_content_hash(pdf_bytes)
+        if _resume_store_holds(user_id, content_hash):
+            _ensure_resume_profile(user_id, content_hash)
+            return content_hash
+        cached = _load_resume_cache(content_hash)
+
+    if cached is not None:
+        full_text, chunks, embeddings = cached
+    else:
+        try:
+            full_text = extract_pdf_text(pdf_bytes)
+        except Exception as e:
+            print("Failed to read PDF:", e)
+            return None
 
-    full_text = "\n".join(pages_text).strip()
-    if not full_text:
-        print("No text extracted from resume.")
-        return
+        if not full_text:
+            print("No text extracted from resume.")
+            return None
 
-    chunks = text_splitter.split_text(full_text)
-    embeddings = embed_texts(chunks)
+        chunks = split_text(full_text)
+        embeddings = embed_texts(chunks)
+        _save_resume_cache(content_hash, full_text, chunks, embeddings)
 
     save_json(
         RESUME_JSON,
-        [{"doc": c, "meta": {"type": "resume", "chunk_index": i, "user_id": user_id}}
+        [{"doc": c, "meta": {"type": "resume", "chunk_index": i, "user_id": user_id,
+                             "resume_hash": content_hash}}
          for i, c in enumerate(chunks)]
     )
 
-    np.save(RESUME_EMB, np.array(embeddings, dtype=np.float32))
+    np.save(RESUME_EMB, np.asarray(embeddings, dtype=np.float32))
+    _store_resume_profile(user_id, content_hash, chunks, embeddings)
+    _bump_store_version(user_id)
     print(f"Stored {len(chunks)} resume chunks.")
+    return content_hash
 
 # ======================================================
 # SAFE LOAD STORE (NO MODEL AT IMPORT)
 # ======================================================
+# Stores are kept in memory and only re-read from disk when the
+# files change (store_jobs / store_resume may run in another process).
+_store_cache = {}
+_store_lock = threading.Lock()
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return None
+
+
 def _load_store(json_path, emb_path):
-    items = load_json(json_path)
+    """
+    Returns (docs, embs, metas, unit_embs) where unit_embs are
+    the row-normalized embeddings used for cosine search.
+    """
+    stamp = (_file_stamp(json_path), _file_stamp(emb_path))
+    cached = _store_cache.get(json_path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    with _store_lock:
+        cached = _store_cache.get(json_path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        items = load_json(json_path)
+
+        if not items or not Path(emb_path).exists():
+            model = get_embedding_model()
+            empty = np.zeros(
+                (0, model.get_sentence_embedding_dimension()),
+                dtype=np.float32
+            )
+            return [], empty, [], empty
+
+        embs = np.load(emb_path)
+        docs = [it["doc"] for it in items]
+        metas = [it["meta"] for it in items]
+        unit_embs = _normalize_rows(embs)
+
+        store = (docs, embs, metas, unit_embs)
+        if len(docs) == embs.shape[0]:
+            # a concurrent writer may have replaced only one of the two files
+            _store_cache[json_path] = (stamp, store)
+        return store
 
-    if not items or not Path(emb_path).exists():
-        model = get_embedding_model() 
-        return [], np.zeros(
-            (0, model.get_sentence_embedding_dimension()),
-            dtype=np.float32
-        ), []
+# ======================================================
+# STORE VERSIONING
+# ======================================================
+_store_versions = {}
 
-    embs = np.load(emb_path)
-    docs = [it["doc"] for it in items]
-    metas = [it["meta"] for it in items]
 
-    return docs, embs, metas
+def _bump_store_version(user_id: str):
+    _store_versions[user_id] = _store_versions.get(user_id, 0) + 1
+
+
+def store_fingerprint(user_id: str):
+    """
+    Changes whenever this user's job / resume data is rewritten,
+    in this process (version counter) or another one (file stamps).
+    Used to invalidate cached chat answers.
+    """
+    return (
+        _store_versions.get(user_id, 0),
+        _file_stamp(JOBS_JSON), _file_stamp(JOBS_EMB),
+        _file_stamp(RESUME_JSON), _file_stamp(RESUME_EMB),
+    )
 
 # ======================================================
 # COSINE SIMILARITY
 # ======================================================
-def _cosine_similarities(query_emb, emb_matrix):
+def _normalize_rows(emb_matrix):
     if emb_matrix.size == 0:
+        return emb_matrix.astype(np.float32)
+    norms = np.linalg.norm(emb_matrix, axis=1, keepdims=True)
+    return (emb_matrix / norms).astype(np.float32)
+
+
+def _cosine_similarities(query_emb, unit_matrix):
+    if unit_matrix.size == 0:
         return np.array([])
 
     q = query_emb / np.linalg.norm(query_emb)
-    M = emb_matrix / np.linalg.norm(emb_matrix, axis=1, keepdims=True)
-    return (M @ q).astype(np.float32)
+    return (unit_matrix @ q).astype(np.float32)
 
 # ======================================================
-# LAZY MODEL IN RETRIEVAL
+# QUERY EMBEDDING
 # ======================================================
-def retrieve_top_k(query, user_id: str, k_jobs=5, k_resume=5):
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "2"))
+QUERY_EMB_CACHE_SIZE = int(os.getenv("QUERY_EMB_CACHE_SIZE", "1024"))
+_embed_executor = None
+
+# query string -> embedding, LRU ordered
+_query_emb_cache = OrderedDict()
+_query_cache_lock = threading.Lock()
+_query_cache_stats = {"hits": 0, "misses": 0}
+
+
+def embed_query(query: str):
+    with _query_cache_lock:
+        emb = _query_emb_cache.get(query)
+        if emb is not None:
+            _query_emb_cache.move_to_end(query)
+            _query_cache_stats["hits"] += 1
+            return emb
+        _query_cache_stats["misses"] += 1
+
     model = get_embedding_model()   #  lazy load here
-    q_emb = model.encode([query])[0].astype(np.float32)
+    emb = model.encode([query])[0].astype(np.float32)
+    emb.setflags(write=False)   # shared between callers
 
-    job_docs, job_embs, job_meta = _load_store(JOBS_JSON, JOBS_EMB)
-    job_sims = _cosine_similarities(q_emb, job_embs)
+    with _query_cache_lock:
+        _query_emb_cache[query] = emb
+        while len(_query_emb_cache) > QUERY_EMB_CACHE_SIZE:
+            _query_emb_cache.popitem(last=False)
+    return emb
 
-    job_results = []
-    if job_sims.size:
-        for i in np.argsort(-job_sims):
-            if job_meta[i].get("user_id") != user_id:
-                continue
-            job_results.append({
-                "text": job_docs[i],
-                "score": float(job_sims[i]),
-                "meta": job_meta[i]
-            })
-            if len(job_results) == k_jobs:
-                break
+
+def query_cache_stats():
+    with _query_cache_lock:
+        total = _query_cache_stats["hits"] + _query_cache_stats["misses"]
+        return {
+            **_query_cache_stats,
+            "size": len(_query_emb_cache),
+            "hit_rate": _query_cache_stats["hits"] / total if total else 0.0,
+        }
 
 
-    resume_docs, resume_embs, resume_meta = _load_store(RESUME_JSON, RESUME_EMB)
-    resume_sims = _cosine_similarities(q_emb, resume_embs)
+def _get_embed_executor():
+    """
+    Dedicated pool for query encodes so chat traffic can't exhaust
+    the default threadpool. Created lazily (after any fork).
+    """
+    global _embed_executor
+    if _embed_executor is None:
+        with _store_lock:
+            if _embed_executor is None:
+                _embed_executor = ThreadPoolExecutor(
+                    max_workers=EMBED_WORKERS,
+                    thread_name_prefix="embed"
+                )
+    return _embed_executor
+
+
+async def run_on_embed_pool(fn, *args):
+    """Await fn(*args) on the embed pool, off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_embed_executor(), fn, *args)
 
-    resume_results = []
-    if resume_sims.size:
-        for i in np.argsort(-resume_sims):
-            if resume_meta[i].get("user_id") != user_id:
+
+async def aembed_query(query: str):
+    return await run_on_embed_pool(embed_query, query)
+
+# ======================================================
+# LAZY MODEL IN RETRIEVAL
+# ======================================================
+def _top_k_for_user(q_emb, store, user_id, k):
+    docs, embs, metas, unit_embs = store
+    sims = _cosine_similarities(q_emb, unit_embs)
+
+    results = []
+    if sims.size:
+        for i in np.argsort(-sims):
+            if metas[i].get("user_id") != user_id:
                 continue
-            resume_results.append({
-                "text": resume_docs[i],
-                "score": float(resume_sims[i]),
-                "meta": resume_meta[i]
+            results.append({
+                "text": docs[i],
+                "score": float(sims[i]),
+                "meta": metas[i],
+                "emb": embs[i]
             })
-            if len(resume_results) == k_resume:
+            if len(results) == k:
                 break
+    return results
 
 
+def search_top_k(q_emb, user_id: str, k_jobs=5, k_resume=5):
+    """Pure in-memory search for an already-embedded query."""
+    job_results = _top_k_for_user(q_emb, _load_store(JOBS_JSON, JOBS_EMB), user_id, k_jobs)
+    resume_results = _top_k_for_user(q_emb, _load_store(RESUME_JSON, RESUME_EMB), user_id, k_resume)
     return job_results, resume_results
 
 
+def retrieve_top_k(query, user_id: str, k_jobs=5, k_resume=5):
+    q_emb = embed_query(query)
+    return search_top_k(q_emb, user_id, k_jobs=k_jobs, k_resume=k_resume)
+
+
+async def aretrieve_top_k(query, user_id: str, k_jobs=5, k_resume=5):
+    """
+    Async retrieval: encode and search both run on the embed pool, since
+    a store (re)load and the similarity sort block as much as the encode.
+    """
+    return await run_on_embed_pool(retrieve_top_k, query, user_id, k_jobs, k_resume)
@@ -4,6 +4,7 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_ready
 
 
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
@@ -17,29 +18,43 @@ app.conf.redbeat_redis_url = f"redis://{REDIS_HOST}:6379/0"
 # Windows Compatibility fix
 app.conf.worker_pool_restarts = True
 
-@app.task
-def scheduled_job_process(user_id, job_title, location):
 
-    from api.db import users_col, jobs_col
-    import bson
-    # 1. Scrape jobs
-    from scrape_naukri import scrape_naukri
-    from vector import store_jobs, store_resume
+@worker_process_init.connect
+def warm_embedding_model(**kwargs):
+    """Optionally load the embedding model in each pool process at start."""
+    from embedding_config import warmup_enabled
+    if warmup_enabled():
+        from vector import warm_up
+        warm_up()
+
 
-    scraped = scrape_naukri(job_title.replace(" ", "+"), location, max_pages=1)
+@worker_ready.connect
+def warm_embedding_model_inprocess(sender=None, **kwargs):
+    """--pool=solo / threads run tasks in the main process, which never gets worker_process_init."""
+    pool_module = type(getattr(sender, "pool", None)).__module__
+    if pool_module.endswith((".solo", ".thread")):
+        warm_embedding_model()
 
-    for s in scraped:
-        s["owner"] = user_id
+@app.task
+def scheduled_job_process(user_id, job_title, location):
 
-    if scraped:
-        jobs_col.delete_many({"owner": user_id})
-        jobs_col.insert_many(scraped)
-        store_jobs(scraped, user_id)
+    from api.db import users_col
+    import bson
+    # 1. Scrape jobs (stored in micro-batches as they arrive)
+    from scrape_sources import SCHEDULED_SCRAPE_SOURCES, iter_sources, parse_source_names
+    from ingest import ingest_jobs
+    from vector import store_resume
+
+    scraped, _ = ingest_jobs(
+        iter_sources(parse_source_names(SCHEDULED_SCRAPE_SOURCES),
+                     job_title.replace(" ", "+"), location, max_pages=1),
+        user_id
+    )
 
     user = users_col.find_one({"_id": bson.ObjectId(user_id)})
 
     if user.get("resume_url"):
-        store_resume(user["resume_url"], user_id)
+        store_resume(user["resume_url"], user_id, content_hash=user.get("resume_hash"))
 
 
 
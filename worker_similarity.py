@@ -1,4 +1,6 @@
+import os
 import json
+import hashlib
 import numpy as np
 from pathlib import Path
 
@@ -13,6 +15,15 @@ JOBS_EMB = DATA_DIR / "jobs_embs.npy"
 RESUME_JSON = DATA_DIR / "resume_docs.json"
 RESUME_EMB = DATA_DIR / "resume_embs.npy"
 
+RESUME_PROFILE_JSON = DATA_DIR / "resume_profile.json"
+RESUME_PROFILE_EMB = DATA_DIR / "resume_profile.npy"
+
+# "exact": every resume chunk x every job chunk
+# "profile": resume profile vectors x every job chunk first, exact scoring on survivors only
+MATCH_MODE = os.getenv("MATCH_MODE", "exact").lower()
+# job chunks scoring within this margin below the threshold against the profile survive
+PROFILE_MARGIN = float(os.getenv("PROFILE_MARGIN", "0.1"))
+
 
 # ======================================================
 # LOAD HELPERS
@@ -39,10 +50,31 @@ def _cosine_sim_matrix(A: np.ndarray, B: np.ndarray):
     return (A_norm @ B_norm.T).astype(np.float32)
 
 
+def _load_profile(user_id: str, resume_hash):
+    """The user's profile vectors, or None when missing / built from another resume."""
+    meta = _load_json(RESUME_PROFILE_JSON)
+    if not meta or not RESUME_PROFILE_EMB.exists():
+        return None
+    if meta.get("user_id") != user_id or meta.get("resume_hash") != resume_hash:
+        return None
+    return np.load(RESUME_PROFILE_EMB)
+
+
+def _profile_survivors(profile_vecs: np.ndarray, job_vecs: np.ndarray, threshold: float, margin: float):
+    """Local indices of job chunks whose best profile similarity is >= threshold - margin."""
+    if job_vecs.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    # profile vectors are unit length: one small matmul, then divide by the
+    # job norms instead of writing out a normalized copy of every job row
+    job_norms = np.sqrt(np.einsum("ij,ij->i", job_vecs, job_vecs))
+    best = (job_vecs @ profile_vecs.T).max(axis=1) / np.maximum(job_norms, 1e-12)
+    return np.flatnonzero(best >= threshold - margin)
+
+
 # ======================================================
 # MAIN SIMILARITY FUNCTION
 # ======================================================
-def compute_job_resume_matches(user_id: str, threshold: float = 0.6):
+def compute_job_resume_matches(user_id: str, threshold: float = 0.6, rerank: bool = None, mode: str = None):
     """
     Returns:
         List of dicts:
@@ -52,7 +84,20 @@ def compute_job_resume_matches(user_id: str, threshold: float = 0.6):
                 "score": float
             }
         ]
+
+    rerank (default RERANK_ENABLED): re-score the top RERANK_TOP_N jobs
+    above threshold with the cross-encoder in rerank.py; "score" is then
+    the cross-encoder score and "vector_score" the cosine.
+
+    mode (default MATCH_MODE): "profile" compares the few resume profile
+    vectors (vector.build_resume_profile) with every job chunk first and
+    only scores chunks within PROFILE_MARGIN of the threshold exactly.
+    Falls back to "exact" when the user has no current profile.
     """
+    from rerank import RERANK_ENABLED
+    if rerank is None:
+        rerank = RERANK_ENABLED
+    mode = (mode or MATCH_MODE).lower()
 
     # -------- Load stored data --------
     if not JOBS_EMB.exists() or not RESUME_EMB.exists():
@@ -81,15 +126,28 @@ def compute_job_resume_matches(user_id: str, threshold: float = 0.6):
     job_vecs = job_embs[job_indices]
     resume_vecs = resume_embs[resume_indices]
 
+    # -------- Profile first pass --------
+    if mode == "profile":
+        profile_vecs = _load_profile(user_id, resume_items[resume_indices[0]]["meta"].get("resume_hash"))
+        if profile_vecs is None:
+            print("No current resume profile; matching in exact mode.")
+        else:
+            keep = _profile_survivors(profile_vecs, job_vecs, threshold, PROFILE_MARGIN)
+            job_indices = [job_indices[i] for i in keep]
+            job_vecs = job_vecs[keep]
+            if not job_indices:
+                return []
+
     # -------- Similarity matrix --------
     sim_matrix = _cosine_sim_matrix(resume_vecs, job_vecs)
 
 
     # -------- Aggregate per job -------
-    # max resume chunk similarity per job chunk
-    job_chunk_scores = sim_matrix.max(axis=0)
+    # max resume chunk similarity per job chunk (and which resume chunk)
+    best_resume_chunk = sim_matrix.argmax(axis=0)
+    job_chunk_scores = sim_matrix[best_resume_chunk, np.arange(sim_matrix.shape[1])]
 
-    job_chunk_map = {}  # job_index -> best_score
+    job_chunk_map = {}  # job_index -> (best_score, job chunk global idx, resume chunk local idx)
 
     for local_idx, score in enumerate(job_chunk_scores):
         if score < threshold:
@@ -105,15 +163,42 @@ def compute_job_resume_matches(user_id: str, threshold: float = 0.6):
         job_idx = job_meta["job_index"]
 
         # keep max score per job
-        job_chunk_map[job_idx] = max(
-            job_chunk_map.get(job_idx, 0),
-            float(score)
-        )
+        if float(score) > job_chunk_map.get(job_idx, (0,))[0]:
+            job_chunk_map[job_idx] = (float(score), global_idx, int(best_resume_chunk[local_idx]))
+
+    if rerank:
+        return _rerank(job_chunk_map, jobs_items, resume_items, resume_indices)
 
     # convert to result list
     results = [
-        {"job_index": job_idx, "score": score}
-        for job_idx, score in job_chunk_map.items()
+        {"job_index": job_idx, "score": best[0]}
+        for job_idx, best in job_chunk_map.items()
     ]
 
     return results
+
+
+def _rerank(job_chunk_map, jobs_items, resume_items, resume_indices):
+    """Cross-encoder pass over the best (resume chunk, job chunk) pair of each candidate."""
+    from rerank import rerank_matches
+
+    resume_hash = resume_items[resume_indices[0]]["meta"].get("resume_hash") or "unversioned"
+
+    candidates = []
+    for job_idx, (score, job_global, resume_local) in job_chunk_map.items():
+        job_item = jobs_items[job_global]
+        resume_item = resume_items[resume_indices[resume_local]]
+        # resume hash + chunk position identify the resume chunk; link + chunk position the job chunk
+        job_link = job_item["meta"].get("source")
+        if not job_link or job_link == "N/A":
+            job_link = hashlib.sha1(job_item["doc"].encode("utf-8")).hexdigest()
+        candidates.append({
+            "job_index": job_idx,
+            "score": score,
+            "resume_text": resume_item["doc"],
+            "job_text": job_item["doc"],
+            "cache_key": (resume_hash, resume_item["meta"].get("chunk_index"),
+                          job_link, job_item["meta"].get("chunk_index")),
+        })
+
+    return rerank_matches(candidates)